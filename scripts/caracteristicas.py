@@ -0,0 +1,20 @@
+# src/scripts/caracteristicas.py
+from src.configuraciones.config_params import conf, logger
+from src.datos.caracteristicas import GeneraCaracteristicas
+from src.utils import almacenamiento
+
+def main():
+
+    transformed_file = conf["data"]["interim_stage_transformed"]
+
+    if not almacenamiento.existe_dataset(transformed_file):
+        logger.error(f"No se encontró el dataset transformado: {transformed_file}")
+        return
+
+    logger.info(f"Cargando datos desde {transformed_file}...")
+    df = almacenamiento.leer_dataframe(transformed_file)
+
+    GeneraCaracteristicas(df).run()
+
+if __name__ == "__main__":
+    main()
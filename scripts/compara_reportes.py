@@ -0,0 +1,28 @@
+# src/scripts/compara_reportes.py
+from src.configuraciones.config_params import conf, logger
+from src.utils.generador_reportes import SECCIONES_REPORTE, ruta_paquete
+from src.utils.paquete_reporte import compara_paquetes
+
+
+def main():
+
+    for seccion in SECCIONES_REPORTE:
+        actual = ruta_paquete(conf.get(seccion))
+        anterior = actual.with_name(actual.name + ".anterior")
+
+        if not (actual / "manifest.json").is_file() or not (anterior / "manifest.json").is_file():
+            logger.warning(f"Se requieren el paquete actual y el anterior para comparar '{seccion}': {actual}")
+            continue
+
+        logger.info(f"Comparando paquetes de '{seccion}': {anterior.name} -> {actual.name}")
+        cambios = compara_paquetes(anterior, actual)
+
+        for nombre, tabla in cambios.items():
+            if tabla.empty:
+                logger.info(f"[{seccion}] {nombre}: sin cambios")
+            else:
+                logger.info(f"[{seccion}] {nombre}: {len(tabla)} cambio(s)\n{tabla.to_string()}")
+
+
+if __name__ == "__main__":
+    main()
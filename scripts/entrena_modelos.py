@@ -0,0 +1,20 @@
+# src/scripts/entrena_modelos.py
+from src.configuraciones.config_params import conf, logger
+from src.modelos.pronostico import EntrenaPronosticos
+from src.utils import almacenamiento
+
+def main():
+
+    transformed_file = conf["data"]["interim_stage_transformed"]
+
+    if not almacenamiento.existe_dataset(transformed_file):
+        logger.error(f"No se encontró el dataset transformado: {transformed_file}")
+        return
+
+    logger.info(f"Cargando series desde {transformed_file}...")
+    df = almacenamiento.leer_dataframe(transformed_file)
+
+    EntrenaPronosticos().run(df)
+
+if __name__ == "__main__":
+    main()
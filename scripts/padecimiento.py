@@ -2,10 +2,10 @@
 import pandas as pd
 
 from src.configuraciones.config_params import conf, logger
-from src.datos.EDA import EDAReportBuilder
-from src.datos.filtrar_padecimiento import FiltraPadecimiento
-from src.utils import directory_manager
-from src.utils.reporte_PDF import PDFReportGenerator
+from src.datos.EDA import EDAReportBuilder, EDAReportBuilderPorBloques
+from src.datos.filtrar_padecimiento import FiltraPadecimiento, FiltraPadecimientoPorBloques
+from src.utils import almacenamiento, directory_manager
+from src.utils.generador_reportes import genera_reporte
 
 
 
@@ -15,8 +15,8 @@ def filtrar() -> tuple[bool, pd.DataFrame | None]:
     raw_data_filter = conf.get("data", {}).get("raw_data_filter")
     fuerza_filtrado = padecimiento["force"]
 
-    existe_archivo = directory_manager.existe_archivo(raw_file)
-    existe_filtrado = directory_manager.existe_archivo(raw_data_filter)
+    existe_archivo = almacenamiento.existe_dataset(raw_file)
+    existe_filtrado = almacenamiento.existe_dataset(raw_data_filter)
 
     if not existe_archivo:
         logger.error(f"No se pudo localizar el archivo RAW: {raw_file}")
@@ -30,14 +30,36 @@ def filtrar() -> tuple[bool, pd.DataFrame | None]:
 
     if existe_filtrado and not fuerza_filtrado:
         logger.warning(f"Archivo filtrado localizado: {raw_data_filter}")
-        return True, pd.read_csv(raw_data_filter)
+        if conf.get("eda_por_bloques", {}).get("habilitado"):
+            return True, None
+        return True, almacenamiento.leer_dataframe(raw_data_filter)
 
-    dataframe = pd.read_csv(raw_file)
+    streaming = padecimiento.get("streaming", {})
+
+    if streaming.get("habilitado"):
+        conteos = FiltraPadecimientoPorBloques(
+            raw_file,
+            padecimiento["columna"],
+            {padecimiento["tipo"]: raw_data_filter},
+            streaming["tamano_bloque"],
+        ).run()
+
+        if not conteos[padecimiento["tipo"]]:
+            return False, None
+
+        # Con el reporte por bloques no es necesario cargar el subconjunto filtrado
+        if conf.get("eda_por_bloques", {}).get("habilitado"):
+            return True, None
+
+        # El subconjunto filtrado es pequeño respecto al RAW; se carga para el reporte
+        return True, almacenamiento.leer_dataframe(raw_data_filter)
+
+    dataframe = almacenamiento.leer_dataframe(raw_file)
     df_filtrado = FiltraPadecimiento(dataframe, padecimiento).run()
 
     if df_filtrado is not None:
-        logger.success(f"Guardando archivo filtrado en: {raw_data_filter}")
-        df_filtrado.to_csv(raw_data_filter, index=False)
+        ruta_filtrado = almacenamiento.guardar_dataframe(df_filtrado, raw_data_filter)
+        logger.success(f"Archivo filtrado guardado en: {ruta_filtrado}")
         return True, df_filtrado
 
     return False, None
@@ -45,26 +67,36 @@ def filtrar() -> tuple[bool, pd.DataFrame | None]:
 def main():
     
     resultado, df_filtrado = filtrar()
+    por_bloques = conf.get("eda_por_bloques", {})
 
-    if resultado and df_filtrado is not None:
+    if resultado and (df_filtrado is not None or por_bloques.get("habilitado")):
 
         padecimiento = conf.get("padecimiento")
 
         if padecimiento.get("reporte"):
 
             opciones_reporte = conf.get('reporte_EDA')
-            ruta_df = conf.get("data", {}).get("raw_data_filter")
+            raw_data_filter = conf.get("data", {}).get("raw_data_filter")
+            ruta_df = str(almacenamiento.localizar_dataset(raw_data_filter))
 
             directory_manager.asegurar_ruta(opciones_reporte.get('carpeta'))
 
-            datos_reporte = EDAReportBuilder(
-                df = df_filtrado,
-                fuente_datos = ruta_df,
-                opciones = opciones_reporte
-            ).run()
-
-            PDFReportGenerator(datos_reporte, archivo_salida=opciones_reporte.get('ruta'), ancho_figura_cm=16).build()
-            logger.debug(f"Reporte generado en: {opciones_reporte.get('ruta')}")
+            if por_bloques.get("habilitado"):
+                builder = EDAReportBuilderPorBloques(
+                    bloques = almacenamiento.leer_por_bloques(raw_data_filter, por_bloques["tamano_bloque"]),
+                    fuente_datos = ruta_df,
+                    opciones = opciones_reporte
+                )
+            else:
+                builder = EDAReportBuilder(
+                    df = df_filtrado,
+                    fuente_datos = ruta_df,
+                    opciones = opciones_reporte
+                )
+
+            datos_reporte = builder.run()
+
+            genera_reporte(datos_reporte, opciones_reporte, ancho_figura_cm=16)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,60 @@
+# src/scripts/padecimiento_lote.py
+from concurrent.futures import ThreadPoolExecutor
+
+from src.configuraciones.config_params import conf, logger
+from src.datos.filtrar_padecimiento import FiltraPadecimiento, FiltraPadecimientoPorBloques
+from src.utils import almacenamiento
+
+
+def filtrar_lote() -> bool:
+    padecimiento = conf.get("padecimiento")
+    lote = padecimiento.get("lote", {})
+    tipos = lote.get("tipos") or []
+    raw_file = conf.get("data", {}).get("raw_data_file")
+    plantilla = conf.get("data", {}).get("raw_data_filter_lote")
+
+    if not tipos:
+        logger.error("No se especificaron padecimientos en 'padecimiento.lote.tipos'.")
+        return False
+
+    if not almacenamiento.existe_dataset(raw_file):
+        logger.error(f"No se pudo localizar el archivo RAW: {raw_file}")
+        return False
+
+    streaming = padecimiento.get("streaming", {})
+
+    if streaming.get("habilitado"):
+        conteos = FiltraPadecimientoPorBloques(
+            raw_file,
+            padecimiento["columna"],
+            {tipo: plantilla.format(tipo=tipo) for tipo in tipos},
+            streaming["tamano_bloque"],
+        ).run()
+        return any(conteos.values())
+
+    logger.info(f"Lectura única del archivo RAW: {almacenamiento.localizar_dataset(raw_file)}")
+    dataframe = almacenamiento.leer_dataframe(raw_file)
+
+    particiones = FiltraPadecimiento.filtrar_lote(dataframe, padecimiento["columna"], tipos)
+
+    if not particiones:
+        return False
+
+    with ThreadPoolExecutor(max_workers=lote.get("hilos") or len(particiones)) as executor:
+        futuros = {
+            tipo: executor.submit(almacenamiento.guardar_dataframe, df, plantilla.format(tipo=tipo))
+            for tipo, df in particiones.items()
+        }
+
+        for tipo, futuro in futuros.items():
+            logger.success(f"Archivo filtrado de '{tipo}' guardado en: {futuro.result()}")
+
+    return True
+
+
+def main():
+    filtrar_lote()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# src/scripts/pipeline.py
+from typing import List
+
+import pandas as pd
+
+from src.configuraciones.config_params import conf, logger
+from src.datos.caracteristicas import GeneraCaracteristicas
+from src.datos.clean_dataset import CleanDataset
+from src.datos.cubo import CuboIncrementos
+from src.datos.EDA import EDAReportBuilder
+from src.datos.filtrar_padecimiento import FiltraPadecimiento
+from src.datos.pipeline import Etapa, PipelineRunner
+from src.datos.preparacion import agrupamiento_configurado, dataTransformation, opcion_FE
+from src.utils import almacenamiento, directory_manager
+from src.utils.cache_etapas import CacheEtapas
+from src.utils.generador_reportes import genera_reporte
+
+
+def _persiste(etapa: str) -> bool:
+    return conf.get("pipeline", {}).get("persistir", {}).get(etapa, False)
+
+
+def _fuente(etapa: str, ruta: str) -> str:
+    """Describe el origen de los datos de un reporte según si la etapa se persiste o no."""
+    if _persiste(etapa):
+        return str(almacenamiento.ruta_artefacto(ruta))
+    return f"En memoria (etapa '{etapa}')"
+
+
+def _genera_reporte(df: pd.DataFrame, opciones: dict, fuente: str) -> None:
+
+    directory_manager.asegurar_ruta(opciones.get('carpeta'))
+
+    datos_reporte = EDAReportBuilder(
+        df = df,
+        fuente_datos = fuente,
+        opciones = opciones
+    ).run()
+
+    genera_reporte(datos_reporte, opciones, ancho_figura_cm=16)
+
+
+def filtra() -> pd.DataFrame | None:
+    raw_file = conf["data"]["raw_data_file"]
+
+    if not almacenamiento.existe_dataset(raw_file):
+        logger.error(f"No se pudo localizar el archivo RAW: {raw_file}")
+        return None
+
+    dataframe = almacenamiento.leer_dataframe(raw_file)
+    return FiltraPadecimiento(dataframe, conf.get("padecimiento")).run()
+
+
+def limpia(filtra: pd.DataFrame) -> pd.DataFrame:
+    return CleanDataset(filtra).run()
+
+
+def cubo(limpia: pd.DataFrame) -> pd.DataFrame:
+    return dataTransformation(limpia).construye_cubo().cubo
+
+
+def transforma(cubo: pd.DataFrame) -> pd.DataFrame | None:
+    df_agrupado = CuboIncrementos(cubo).agrupa(agrupamiento_configurado())
+    return None if df_agrupado.empty else df_agrupado
+
+
+def caracteristicas(transforma: pd.DataFrame) -> pd.DataFrame:
+    return GeneraCaracteristicas(transforma).run(guardar=False)
+
+
+def huellas_caracteristicas(caracteristicas: pd.DataFrame, transforma: pd.DataFrame) -> None:
+    # Las huellas deben corresponder al archivo persistido para que la actualización incremental sea válida
+    GeneraCaracteristicas(transforma).guarda_huellas()
+
+
+def reporte_filtrado(filtra: pd.DataFrame) -> None:
+    _genera_reporte(filtra, conf.get('reporte_EDA'), _fuente("filtra", conf["data"]["raw_data_filter"]))
+
+
+def reporte_limpieza(limpia: pd.DataFrame) -> None:
+    _genera_reporte(limpia, conf.get('reporte_clean_dataset'), _fuente("limpia", conf["data"]["interim_data_file"]))
+
+
+def construye_etapas() -> List[Etapa]:
+
+    padecimiento = conf.get("padecimiento")
+    datos = conf.get("data")
+
+    etapas = [
+        Etapa("filtra", filtra,
+              salida=datos["raw_data_filter"],
+              config={k: padecimiento.get(k) for k in ("columna", "tipo")},
+              archivos=[datos["raw_data_file"]]),
+        Etapa("limpia", limpia, dependencias=["filtra"],
+              salida=datos["interim_data_file"],
+              config={k: conf.get(k) for k in ("columnas_eliminar", "valores_sustituir", "registros_eliminar")}),
+        Etapa("cubo", cubo, dependencias=["limpia"],
+              salida=datos["processed_cube"],
+              config={"regiones": conf.get("regiones"),
+                      "tratamiento_outliers": opcion_FE("tratamiento_outliers"),
+                      "padecimiento": padecimiento.get("tipo")}),
+        Etapa("transforma", transforma, dependencias=["cubo"],
+              salida=datos["interim_stage_transformed"],
+              config=opcion_FE("agrupa")),
+        Etapa("caracteristicas", caracteristicas, dependencias=["transforma"],
+              salida=datos["processed_features"],
+              config=conf.get("caracteristicas"),
+              al_persistir=huellas_caracteristicas),
+    ]
+
+    if padecimiento.get("reporte"):
+        etapas.append(Etapa("reporte_filtrado", reporte_filtrado, dependencias=["filtra"],
+                            config=conf.get('reporte_EDA'),
+                            artefactos=[conf['reporte_EDA']['ruta']]))
+
+    if padecimiento.get("reporte_clean"):
+        etapas.append(Etapa("reporte_limpieza", reporte_limpieza, dependencias=["limpia"],
+                            config=conf.get('reporte_clean_dataset'),
+                            artefactos=[conf['reporte_clean_dataset']['ruta']]))
+
+    return etapas
+
+
+def main():
+
+    opciones = conf.get("pipeline", {})
+    persistir = opciones.get("persistir", {})
+    opciones_cache = opciones.get("cache", {})
+    logger.info(f"Iniciando pipeline en un solo proceso | persistencia = {persistir}")
+
+    cache = None
+    if opciones_cache.get("habilitada"):
+        cache = CacheEtapas(opciones_cache["carpeta"])
+        logger.info(f"Caché de etapas habilitada en: {opciones_cache['carpeta']} | forzar = {opciones_cache.get('forzar') or []}")
+
+    PipelineRunner(
+        construye_etapas(),
+        persistir=persistir,
+        cache=cache,
+        forzar=opciones_cache.get("forzar") or [],
+    ).run()
+
+    logger.success("Pipeline completado.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+# src/scripts/predicciones.py
+from src.configuraciones.config_params import logger
+from src.modelos.servicio import ServicioPredicciones
+from src.utils import almacenamiento
+
+def main():
+
+    servicio = ServicioPredicciones({"precarga": False})
+    if not servicio.registro.manifest:
+        return
+
+    consultas = servicio.consultas_configuradas()
+    logger.info(f"Pronosticando {len(consultas):,} consulta(s)...")
+    respuestas = servicio.predice(consultas)
+
+    errores = [r for r in respuestas if "error" in r]
+    for respuesta in errores:
+        logger.warning(f"{respuesta['consulta']}: {respuesta['error']}")
+
+    tabla = ServicioPredicciones.tabla(respuestas)
+    if tabla.empty:
+        logger.error("Ninguna consulta produjo pronósticos.")
+        return
+
+    ruta = almacenamiento.guardar_dataframe(tabla, servicio.opciones["salida"])
+    latencia = servicio.estado()["latencia"]
+    logger.success(f"{len(respuestas) - len(errores):,} pronóstico(s) guardado(s) en {ruta} | "
+                   f"errores = {len(errores):,} | lote en {latencia['p50_ms']} ms")
+
+if __name__ == "__main__":
+    main()
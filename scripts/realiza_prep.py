@@ -1,15 +1,14 @@
 # src/scripts/realiza_prep.py
-import pandas as pd
-
 from src.configuraciones.config_params import conf, logger
 from src.datos.preparacion import dataTransformation
+from src.utils import almacenamiento
 
 def main():
 
     interim_file = conf["data"]["interim_data_file"]
 
     logger.info(f"Cargando datos desde {interim_file}...")
-    df = pd.read_csv(interim_file)
+    df = almacenamiento.leer_dataframe(interim_file)
 
     dataTransformation(df).run()
 
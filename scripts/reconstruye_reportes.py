@@ -0,0 +1,28 @@
+# src/scripts/reconstruye_reportes.py
+from dataclasses import replace
+
+from src.configuraciones.config_params import conf, logger
+from src.utils.generador_reportes import SECCIONES_REPORTE, genera_reporte, ruta_paquete
+from src.utils.paquete_reporte import carga_paquete
+
+
+def main():
+
+    for seccion in SECCIONES_REPORTE:
+        opciones = conf.get(seccion)
+        carpeta = ruta_paquete(opciones)
+
+        if not (carpeta / "manifest.json").is_file():
+            logger.warning(f"No existe paquete para '{seccion}' en: {carpeta}")
+            continue
+
+        # Título y subtítulo se toman de la configuración actual; estadísticas y figuras del paquete
+        datos_reporte = replace(carga_paquete(carpeta),
+                                titulo=opciones['titulo_reporte'],
+                                subtitulo=opciones['subtitulo_reporte'])
+
+        genera_reporte(datos_reporte, opciones, ancho_figura_cm=16, guarda=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+# src/scripts/servicio_predicciones.py
+from src.configuraciones.config_params import logger
+from src.modelos.servicio import ServicioPredicciones, crea_servidor
+
+def main():
+
+    servicio = ServicioPredicciones()
+    servidor = crea_servidor(servicio)
+    host, puerto = servidor.server_address[:2]
+
+    logger.success(f"Servicio de predicciones en http://{host}:{puerto} | rutas: /prediccion, /estado")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Deteniendo el servicio de predicciones...")
+    finally:
+        servidor.server_close()
+        latencia = servicio.estado()["latencia"]
+        logger.info(f"Solicitudes atendidas: {latencia['solicitudes']:,} | "
+                    f"p50 = {latencia['p50_ms']} ms | p99 = {latencia['p99_ms']} ms")
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+import pandas as pd
 from loguru import logger
 from omegaconf import OmegaConf
 
@@ -14,14 +15,20 @@ try:
     conf_reportes = OmegaConf.load("config/reportes.yaml")
     conf_limpieza = OmegaConf.load("config/limpieza.yaml")
     conf_FE = OmegaConf.load("config/FE.yaml")
+    conf_esquema = OmegaConf.load("config/esquema.yaml")
+    conf_modelos = OmegaConf.load("config/modelos.yaml")
 except FileNotFoundError as e:
     logger.error(f"Archivo de configuración no encontrado: {e}")
     sys.exit(1)
 
 
-conf = OmegaConf.merge(conf_params, conf_logging, conf_reportes, conf_limpieza, conf_FE)
+conf = OmegaConf.merge(conf_params, conf_logging, conf_reportes, conf_limpieza, conf_FE, conf_esquema, conf_modelos)
 conf = OmegaConf.to_container(conf, resolve=True)
 
+# Copy-on-write: las copias e índices son vistas perezosas que se materializan al modificarse
+if conf.get("rendimiento", {}).get("copy_on_write", False):
+    pd.set_option("mode.copy_on_write", True)
+
 # Configurar logger según YAML
 if "logging" in conf:
     sinks = conf["logging"].get("sinks", [])
@@ -1,14 +1,18 @@
 # src/datos/EDA.py
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
 from src.configuraciones.config_params import conf
+from src.datos.perfilado import PerfilDatos, PerfiladorAproximado, PerfiladorDatos, PerfiladorIncremental
 from src.utils import directory_manager
-from src.utils.graficos import GraficosHelper
+from src.utils.cache_figuras import CacheFiguras
+from src.utils.datos import OperacionesDatos
+from src.utils.graficos import GraficosHelper, Tarea
 
 
 
@@ -36,8 +40,16 @@ class EDAReportBuilder:
                  opciones: dict):
         
         
-        self.df = df.copy()
-        self.df_raw = df.copy()
+        self.df = OperacionesDatos.copia_trabajo(df)
+
+        # Las categorías sin registros (p. ej. tras filtrar o limpiar) no forman parte del reporte
+        for col in self.df.select_dtypes(include='category').columns:
+            self.df[col] = self.df[col].cat.remove_unused_categories()
+
+        self._configura(fuente_datos, opciones)
+
+    def _configura(self, fuente_datos: str, opciones: dict) -> None:
+        """Opciones del reporte, carpeta de figuras y helper de gráficas."""
         self.carpeta_salida = conf["paths"]["figures"]
         self.titulo = opciones['titulo_reporte']
         self.subtitulo = opciones['subtitulo_reporte']
@@ -46,11 +58,28 @@ class EDAReportBuilder:
         self.genera_boxplot = opciones['boxplot']
         self.genera_violin = opciones['violin']
         self.campo_comparativa = opciones['bp_comparativa'] 
-        self.graficos_helper = GraficosHelper(self.carpeta_salida, self.numero_top_columnas)
-        self.notas = None
+        opciones_graficos = conf.get("graficos", {})
+        opciones_cache = opciones_graficos.get("cache", {})
+        self.procesos = opciones_graficos.get("procesos", 1)
 
         directory_manager.asegurar_ruta(self.carpeta_salida)
-        directory_manager.limpia_carpeta(self.carpeta_salida)
+
+        cache = None
+        if opciones_cache.get("habilitada"):
+            cache = CacheFiguras(self.carpeta_salida, opciones_cache.get("tamano_max_mb", 100))
+        else:
+            directory_manager.limpia_carpeta(self.carpeta_salida)
+
+        self.graficos_helper = GraficosHelper(
+            self.carpeta_salida,
+            self.numero_top_columnas,
+            cache=cache,
+            histograma=opciones_graficos.get("histograma"),
+        )
+        self.notas = None
+        self.opciones_aproximado = conf.get("eda_aproximado", {}) or {}
+        self._perfil: Optional[PerfilDatos] = None
+
 
         logger.debug(f"El reporte se generará con título: {self.titulo}")
         logger.debug(f"El subtítulo del reporte es: {self.subtitulo}")
@@ -58,19 +87,49 @@ class EDAReportBuilder:
         logger.debug(f"Número máximo de columnas a mostrar: {self.numero_top_columnas}")
         logger.debug(f"Las imágenes se guardarán en: {self.carpeta_salida}")
 
+    # ------------------ Perfil ------------------
+    @property
+    def perfil(self) -> PerfilDatos:
+        """Perfil de una sola pasada por columna; se calcula la primera vez que se consulta."""
+        if self._perfil is None:
+            if self.opciones_aproximado.get("habilitado", False):
+                self._perfil = self._perfil_aproximado()
+            else:
+                self._perfil = PerfiladorDatos(self.df).run()
+        return self._perfil
+
+    def _perfil_aproximado(self) -> PerfilDatos:
+        """Perfil con bocetos combinables; las cotas de error usadas se agregan a las notas."""
+        opciones = self.opciones_aproximado
+        logger.info(f"Perfil en modo aproximado | opciones = {opciones}")
+
+        perfilador = PerfiladorAproximado(
+            k_cuantiles=opciones.get("k_cuantiles", 200),
+            precision_hll=opciones.get("precision_hll", 14),
+            k_frecuentes=opciones.get("k_frecuentes", 100),
+            semilla=opciones.get("semilla", 0),
+        )
+        perfil = perfilador.run(self.df, opciones.get("tamano_bloque", 500_000))
+        self.notas = perfilador.notas() if not self.notas else f"{self.notas}<br/>{perfilador.notas()}"
+        return perfil
+
     # ------------------ Resúmenes ------------------
     def resumen_general(self) -> Dict[str, str]:
 
         logger.debug("Generando resumen general de los datos...")
 
+        perfil = self.perfil
+        columnas_perfil = perfil.columnas.values()
+
         fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M")
         fuente = self.fuente_datos if self.fuente_datos else "Desconocida"
-        filas = f"{len(self.df):,}"
-        columnas = f"{self.df.shape[1]:,}"
-        porcentaje_nulos = f"{self.df.isna().mean().mean() * 100:.2f}%"
-        columnas_numericas = self.df.select_dtypes(include='number').shape[1]
-        columnas_categoricas = self.df.select_dtypes(include=['object', 'category']).shape[1]
-        otros_columnas = self.df.shape[1] - (columnas_numericas + columnas_categoricas)
+        filas = f"{perfil.filas:,}"
+        columnas = f"{len(perfil.columnas):,}"
+        proporcion_nulos = np.mean([c.nulos / perfil.filas for c in columnas_perfil]) if perfil.filas and perfil.columnas else np.nan
+        porcentaje_nulos = f"{proporcion_nulos * 100:.2f}%"
+        columnas_numericas = len(perfil.numericas)
+        columnas_categoricas = len(perfil.categoricas)
+        otros_columnas = len(perfil.columnas) - (columnas_numericas + columnas_categoricas)
 
 
         logger.debug(
@@ -99,10 +158,12 @@ class EDAReportBuilder:
 
         logger.debug("Generando resumen de valores únicos por columna...")
 
-        df_unicos = self.df.nunique(dropna=True).to_frame("Valores únicos") \
-                .assign(Tipo=self.df.dtypes.astype(str)) \
-                .query("`Valores únicos` > 0") \
-                .sort_values("Valores únicos", ascending=False)
+        df_unicos = pd.DataFrame(
+            {"Valores únicos": [c.unicos for c in self.perfil.columnas.values()],
+             "Tipo": [c.tipo for c in self.perfil.columnas.values()]},
+            index=list(self.perfil.columnas)
+        ).query("`Valores únicos` > 0") \
+         .sort_values("Valores únicos", ascending=False)
 
         logger.debug( f"Dataframe de valores únicos generado | filas = {len(df_unicos):,} | columnas = {df_unicos.shape[1]:,} | formato de salida = {type(df_unicos)}")
         return df_unicos
@@ -113,10 +174,12 @@ class EDAReportBuilder:
 
         logger.debug("Generando resumen de valores nulos por columna...")
 
-        df_nulos = self.df.isna().sum().to_frame("Nulos") \
-                .assign(Tipo=self.df.dtypes.astype(str)) \
-                .query("Nulos > 0") \
-                .sort_values("Nulos", ascending=False)
+        df_nulos = pd.DataFrame(
+            {"Nulos": [c.nulos for c in self.perfil.columnas.values()],
+             "Tipo": [c.tipo for c in self.perfil.columnas.values()]},
+            index=list(self.perfil.columnas)
+        ).query("Nulos > 0") \
+         .sort_values("Nulos", ascending=False)
 
         logger.debug(f"Dataframe de valores nulos generado | filas = {len(df_nulos):,} | columnas = {df_nulos.shape[1]:,} | formato de salida = {type(df_nulos)}")
         return df_nulos if not df_nulos.empty else None
@@ -128,13 +191,12 @@ class EDAReportBuilder:
         logger.debug("Generando estadísticas de columnas numéricas...")
 
         # Seleccionar solo columnas numéricas
-        num = self.df.select_dtypes(include='number')
+        num = self.perfil.de_clase("numerica")
         
-        if num.empty: return None
+        if not num: return None
 
         estadisticas_numericas = (
-        num.describe()
-           .T
+        pd.DataFrame([c.estadisticas for c in num], index=[c.nombre for c in num])
            .rename(columns={
                "count": "conteo", "mean": "media", "std": "desv_est",
                "min": "mín", "25%": "p25", "50%": "p50",
@@ -143,7 +205,7 @@ class EDAReportBuilder:
         )   
 
         logger.debug( f"Dataframe de estadísticas numéricas generado | filas = {len(estadisticas_numericas):,} | columnas = {estadisticas_numericas.shape[1]:,}"
-                      f" | columnas consideradas = {num.shape[1]} de {self.df.shape[1]} | formato de salida = {type(estadisticas_numericas)}")
+                      f" | columnas consideradas = {len(num)} de {len(self.perfil.columnas)} | formato de salida = {type(estadisticas_numericas)}")
         return (estadisticas_numericas)
     
 
@@ -153,22 +215,24 @@ class EDAReportBuilder:
         logger.debug("Generando estadísticas de columnas categóricas...")
         
         # Seleccionar solo columnas categóricas de tipo object o category
-        cat = self.df.select_dtypes(include=['object', 'category'])
+        cat = self.perfil.de_clase("categorica")
 
-        if cat.empty: return None
+        if not cat: return None
 
-        # Crear el resumen de estadísticas categóricas
+        # Crear el resumen de estadísticas categóricas a partir de las frecuencias del perfil
         resumen = [{
-            "columna": col,
-            "conteo": serie.size,
-            "valores_únicos": serie.nunique(),
-            "moda": serie.mode().iloc[0] if not serie.mode().empty else "N/A",
-            "freq_moda": serie.value_counts().iloc[0],
-            "%_moda": round(serie.value_counts().iloc[0] / serie.size * 100, 2)
-        } for col, serie in cat.items() if not serie.empty]
+            "columna": c.nombre,
+            "conteo": c.registros,
+            "valores_únicos": c.unicos,
+            "moda": c.moda() if c.unicos else "N/A",
+            "freq_moda": int(c.frecuencias.iloc[0]) if c.unicos else 0,
+            "%_moda": round(c.frecuencias.iloc[0] / c.registros * 100, 2) if c.unicos else 0.0
+        } for c in cat if c.registros]
+
+        if not resumen: return None
 
         logger.debug( f"Dataframe de estadísticas categóricas generado | filas = {len(resumen):,} | columnas = {len(resumen[0].keys())} "
-                      f" | columnas consideradas = {cat.shape[1]} de {self.df.shape[1]} | formato de salida = {type(resumen)}")
+                      f" | columnas consideradas = {len(cat)} de {len(self.perfil.columnas)} | formato de salida = {type(resumen)}")
         return pd.DataFrame(resumen).set_index("columna")
 
 
@@ -176,12 +240,11 @@ class EDAReportBuilder:
     def tablas_categoricas(self) -> Dict[str, pd.DataFrame]:
 
         logger.debug("Generando tablas de frecuencias para columnas categóricas...")
-        cat = self.df.select_dtypes(include=['object', 'category'])
         resultados: Dict[str, pd.DataFrame] = {}
 
-        for col in cat.columns:
-            serie = cat[col]
-            vc = serie.fillna("N/A").value_counts(dropna=False)
+        for perfil_col in self.perfil.de_clase("categorica"):
+            col = perfil_col.nombre
+            vc = perfil_col.frecuencias_con_nulos("N/A")
             n = int(self.numero_top_columnas) if hasattr(self, "numero_top_columnas") else 10
 
             logger.debug(f"Generando tabla de frecuencias top para la columna: {col}, Número de categorías a mostrar: {n}")
@@ -190,7 +253,12 @@ class EDAReportBuilder:
                 resultados[col] = pd.DataFrame(columns=["frecuencia", "Observaciones"])
                 continue
 
-            if len(vc) <= n:
+            if perfil_col.aproximado:
+                # Los bocetos solo conservan los valores más frecuentes
+                df_out = vc.head(n).to_frame("frecuencia")
+                df_out["Observaciones"] = "Valores más frecuentes (aprox.)"
+
+            elif len(vc) <= n:
                 df_out = vc.to_frame("frecuencia")
 
             else:
@@ -200,9 +268,10 @@ class EDAReportBuilder:
                 if half == 0:
                     half = 1
 
-                top_max = vc.sort_values(ascending=False).head(half)
+                # vc ya está ordenada de mayor a menor frecuencia
+                top_max = vc.head(half)
 
-                restantes = vc.drop(top_max.index, errors='ignore')
+                restantes = vc.iloc[half:]
                 top_min = restantes.sort_values(ascending=True).head(n - half)
 
                 df_max = top_max.to_frame("frecuencia")
@@ -229,7 +298,9 @@ class EDAReportBuilder:
         return self.graficos_helper.plot_histograma(self.df[col], col)
 
     def plot_categorica_barras(self, col: str) -> Optional[str]:
-        return self.graficos_helper.plot_categorica_barras(self.df[col], col)
+        perfil_col = self.perfil.columnas.get(col)
+        frecuencias = perfil_col.frecuencias if perfil_col is not None else None
+        return self.graficos_helper.plot_categorica_barras(self.df[col], col, frecuencias=frecuencias)
     
     def plot_violin(self, col: str) -> Optional[str]:
         return self.graficos_helper.plot_violin(self.df[col], col)
@@ -242,37 +313,47 @@ class EDAReportBuilder:
 
 
     # ------------------ Ejecución ------------------
-    def run(self) -> ReportData:
-        figuras = []
-        padecimiento = conf["reporte_EDA"]["filtro_padecimiento"]
+    def tareas_graficos(self) -> List[Tarea]:
+        """
+        Lista ordenada de figuras del reporte; cada tarea lleva solo las columnas que usa.
 
-        #self._filtrar_padecimiento(padecimiento)
+        El orden de la lista define el orden de ReportData.figuras.
+        """
+        tareas: List[Tarea] = []
 
-        for col in self.df.select_dtypes(include='number').columns:
+        for col in self.perfil.numericas:
             logger.debug(f"Generando histograma para la columna numérica: '{col}'")
-            ruta = self.plot_histograma(col)
-            if ruta: figuras.append(ruta)
+            tareas.append(("plot_histograma", (self.df[col], col)))
 
-        for col in self.df.select_dtypes(include=['object', 'category']).columns:
+        for col in self.perfil.categoricas:
             logger.debug(f"Generando gráfico de barras para la columna categórica: '{col}'")
-            ruta = self.plot_categorica_barras(col)
-            if ruta: figuras.append(ruta)
+            tareas.append(("plot_categorica_barras", (None, col, self.perfil.columnas[col].frecuencias)))
 
         if self.genera_violin:
             for col in self.df.columns:
                 logger.debug(f"Generando gráfico de violín para la columna numérica: '{col}'")
-                ruta = self.plot_violin(col)
-                if ruta: figuras.append(ruta)
+                tareas.append(("plot_violin", (self.df[col], col)))
         
         if self.genera_boxplot:
             for col in self.df.columns:
+                if col == self.campo_comparativa:
+                    continue
                 logger.debug(f"Creando gráfico de caja para la columna '{col}' con referencia en '{self.campo_comparativa}'")
-                ruta = self.plot_box(col,self.campo_comparativa)
-                if ruta: figuras.append(ruta)
+                tareas.append(("plot_box", (self.df[[col, self.campo_comparativa]], col, self.campo_comparativa)))
 
-        corr = self.plot_correlacion()
         logger.debug("Generando matriz de correlación para columnas numéricas.")
-        if corr: figuras.append(corr)
+        tareas.append(("plot_correlacion", (self.df[self.perfil.numericas],)))
+
+        return tareas
+
+    def run(self) -> ReportData:
+        padecimiento = conf["reporte_EDA"]["filtro_padecimiento"]
+
+        #self._filtrar_padecimiento(padecimiento)
+
+        tareas = self.tareas_graficos()
+        logger.info(f"Generando {len(tareas)} figura(s) | procesos = {self.procesos}")
+        figuras = [ruta for ruta in self.graficos_helper.renderiza(tareas, self.procesos) if ruta]
 
         return ReportData(
             titulo=self.titulo,
@@ -286,4 +367,77 @@ class EDAReportBuilder:
             tablas_categoricas=self.tablas_categoricas(),
             figuras=figuras,
             notas=self.notas
-        )
\ No newline at end of file
+        )
+
+
+class EDAReportBuilderPorBloques(EDAReportBuilder):
+    """
+    Genera el mismo ReportData a partir de un iterador de bloques (p. ej. almacenamiento.leer_por_bloques).
+
+    Los bloques se recorren una sola vez y solo uno se mantiene en memoria: nulos, momentos,
+    conteos por valor, histogramas y sumas de correlación se acumulan en un
+    PerfiladorIncremental. Las gráficas de violín y de caja requieren los registros completos
+    y se omiten.
+    """
+
+    def __init__(self,
+                 bloques: Iterable[pd.DataFrame],
+                 fuente_datos: str,
+                 opciones: dict):
+
+        self.bloques = bloques
+        self.df = None
+        self._configura(fuente_datos, opciones)
+        self.opciones_bloques = conf.get("eda_por_bloques", {}) or {}
+        self._perfilador: Optional[PerfiladorIncremental] = None
+
+    def _agrega_nota(self, nota: str) -> None:
+        self.notas = nota if not self.notas else f"{self.notas}<br/>{nota}"
+
+    @property
+    def perfil(self) -> PerfilDatos:
+        """Consume los bloques la primera vez que se consulta."""
+        if self._perfil is None:
+            aproximado = self.opciones_aproximado
+            # En modo aproximado todas las columnas usan bocetos desde el primer bloque
+            max_distintos = 0 if aproximado.get("habilitado", False) else self.opciones_bloques.get("max_distintos", 100_000)
+
+            self._perfilador = PerfiladorIncremental(
+                max_distintos=max_distintos,
+                bins_histograma=self.opciones_bloques.get("bins_histograma", 1000),
+                k_cuantiles=aproximado.get("k_cuantiles", 200),
+                precision_hll=aproximado.get("precision_hll", 14),
+                k_frecuentes=aproximado.get("k_frecuentes", 100),
+                semilla=aproximado.get("semilla", 0),
+            )
+            for bloque in self.bloques:
+                self._perfilador.actualiza(bloque)
+
+            logger.info(f"Perfil por bloques | bloques = {self._perfilador.bloques:,} | filas = {self._perfilador.filas:,}")
+            self._perfil = self._perfilador.resultado()
+            self._agrega_nota(self._perfilador.notas())
+        return self._perfil
+
+    def tareas_graficos(self) -> List[Tarea]:
+        """Figuras a partir de lo acumulado: histogramas por bins, barras por frecuencias y correlación."""
+        tareas: List[Tarea] = []
+        perfil = self.perfil
+
+        for col in perfil.numericas:
+            logger.debug(f"Generando histograma por bins para la columna numérica: '{col}'")
+            bordes, conteos = self._perfilador.histograma(col)
+            desviacion = perfil.columnas[col].estadisticas["std"]
+            tareas.append(("plot_histograma_bins", (bordes, conteos, desviacion, col)))
+
+        for col in perfil.categoricas:
+            logger.debug(f"Generando gráfico de barras para la columna categórica: '{col}'")
+            tareas.append(("plot_categorica_barras", (None, col, perfil.columnas[col].frecuencias)))
+
+        if self.genera_violin or self.genera_boxplot:
+            logger.warning("Los gráficos de violín y de caja no están disponibles en el reporte por bloques")
+            self._agrega_nota("Los gráficos de violín y de caja requieren los registros completos y se omiten en el reporte por bloques.")
+
+        logger.debug("Generando matriz de correlación para columnas numéricas.")
+        tareas.append(("plot_matriz_correlacion", (self._perfilador.matriz_correlacion(),)))
+
+        return tareas
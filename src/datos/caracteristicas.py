@@ -0,0 +1,349 @@
+# src/datos/caracteristicas.py
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.configuraciones.config_params import conf
+from src.utils import almacenamiento
+
+# Atributo de Fecha que genera cada característica de calendario
+CALENDARIO = {
+    "anio": "Anio",
+    "semana": "Semana",
+    "mes": "Mes",
+    "trimestre": "Trimestre",
+}
+
+
+class GeneraCaracteristicas:
+    """
+    Genera las características de series de tiempo a partir del resultado de dataTransformation.
+
+    Cada serie se identifica por las columnas 'llaves' presentes en los datos (Entidad,
+    Region, ...; sin llaves hay una única serie nacional). Los datos se ordenan una sola vez
+    por llaves y fecha, y los lags, las ventanas móviles (media y desviación estándar) y el
+    calendario se calculan sobre ese orden con arreglos de NumPy: los lags desplazan los
+    arreglos completos y las ventanas restan sumas acumuladas, anulando los registros sin
+    historia suficiente dentro de su serie. Los lags y ventanas cuentan registros (semanas
+    presentes), igual que groupby().shift() y rolling().
+
+    Con 'incremental', si el resultado previo sigue vigente solo se calculan las semanas
+    nuevas de cada serie, usando como contexto las últimas semanas ya conocidas. Junto al
+    resultado se guardan las huellas de la entrada de cada serie hasta su última semana
+    calculada (incluidas las semanas de contexto que no se guardan con 'elimina_incompletos');
+    si alguna semana anterior cambió, se agregó o se eliminó, se recalcula completo.
+    """
+
+    def __init__(self, df: pd.DataFrame, opciones: Optional[Dict] = None):
+        self.opciones = opciones or conf.get("caracteristicas", {})
+        self.salida = conf.get("data", {}).get("processed_features")
+
+        self.fecha = self.opciones.get("fecha", "Fecha")
+        self.llaves = [c for c in self.opciones.get("llaves", []) if c in df.columns]
+        self.objetivos = [c for c in self.opciones.get("objetivos", []) if c in df.columns]
+        self.lags = sorted({int(lag) for lag in self.opciones.get("lags", [])})
+        self.ventanas = sorted({int(ventana) for ventana in self.opciones.get("ventanas", [])})
+        self.calendario = [c for c in self.opciones.get("calendario", []) if c in CALENDARIO]
+        self.one_hot = [c for c in self.opciones.get("one_hot", []) if c in df.columns]
+
+        faltantes = set(self.opciones.get("objetivos", [])) - set(self.objetivos)
+        if faltantes:
+            logger.warning(f"Columnas objetivo no encontradas en los datos: {sorted(faltantes)}")
+        if not self.objetivos:
+            raise ValueError("Ninguna de las columnas objetivo configuradas está en los datos.")
+
+        self.df = df[[*self.llaves, self.fecha, *self.objetivos]].copy()
+        if not pd.api.types.is_datetime64_any_dtype(self.df[self.fecha]):
+            self.df[self.fecha] = pd.to_datetime(self.df[self.fecha])
+
+        # Semanas previas necesarias para calcular las características de una semana
+        self.contexto = max([*self.lags, *(v - 1 for v in self.ventanas), 0])
+
+    # ------------------------------------------------------------------
+    # Cálculo
+    # ------------------------------------------------------------------
+
+    def _ordena(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.sort_values([*self.llaves, self.fecha], kind="stable").reset_index(drop=True)
+
+    def _posiciones(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """Serie (0..k-1) y posición dentro de su serie de cada registro de un DataFrame ordenado."""
+        n = len(df)
+        inicio = np.zeros(n, dtype=bool)
+        if n:
+            inicio[0] = True
+        for llave in self.llaves:
+            # Los códigos de las categóricas comparan también los nulos (Region sin asignar)
+            columna = df[llave]
+            valores = columna.cat.codes.to_numpy() if isinstance(columna.dtype, pd.CategoricalDtype) else columna.to_numpy()
+            inicio[1:] |= valores[1:] != valores[:-1]
+
+        serie = np.cumsum(inicio) - 1
+        primera = np.flatnonzero(inicio)
+        return serie, np.arange(n) - primera[serie]
+
+    def _columnas_caracteristicas(self) -> List[str]:
+        columnas = []
+        for objetivo in self.objetivos:
+            columnas += [f"{objetivo}_Lag_{lag}" for lag in self.lags]
+            for ventana in self.ventanas:
+                columnas += [f"{objetivo}_Media_Movil_{ventana}", f"{objetivo}_Std_Movil_{ventana}"]
+        return columnas
+
+    def _calcula(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Características de un DataFrame ordenado por llaves y fecha."""
+
+        _, posicion = self._posiciones(df)
+        valores = df[self.objetivos].to_numpy(dtype="float64")
+        n, k = valores.shape
+        columnas: Dict[str, np.ndarray] = {}
+
+        lags = {}
+        for lag in self.lags:
+            desplazado = np.full((n, k), np.nan)
+            desplazado[lag:] = valores[:n - lag]
+            desplazado[posicion < lag] = np.nan
+            lags[lag] = desplazado
+
+        # Sumas acumuladas (valores, cuadrados y conteo de no nulos) con un cero inicial
+        validos = ~np.isnan(valores)
+        ceros = np.where(validos, valores, 0.0)
+        inicial = np.zeros((1, k))
+        suma = np.vstack([inicial, np.cumsum(ceros, axis=0)])
+        cuadrados = np.vstack([inicial, np.cumsum(ceros ** 2, axis=0)])
+        conteo = np.vstack([inicial, np.cumsum(validos, axis=0)])
+
+        ventanas = {}
+        for ventana in self.ventanas:
+            fin, ini = np.arange(1, n + 1), np.maximum(np.arange(1, n + 1) - ventana, 0)
+            s = suma[fin] - suma[ini]
+            s2 = cuadrados[fin] - cuadrados[ini]
+            completa = ((posicion >= ventana - 1)[:, None]) & (conteo[fin] - conteo[ini] == ventana)
+
+            media = np.where(completa, s / ventana, np.nan)
+            varianza = np.maximum(s2 - s * s / ventana, 0.0) / (ventana - 1) if ventana > 1 else np.full((n, k), np.nan)
+            ventanas[ventana] = (media, np.where(completa, np.sqrt(varianza), np.nan))
+
+        for j, objetivo in enumerate(self.objetivos):
+            for lag in self.lags:
+                columnas[f"{objetivo}_Lag_{lag}"] = lags[lag][:, j]
+            for ventana in self.ventanas:
+                columnas[f"{objetivo}_Media_Movil_{ventana}"] = ventanas[ventana][0][:, j]
+                columnas[f"{objetivo}_Std_Movil_{ventana}"] = ventanas[ventana][1][:, j]
+
+        fechas = df[self.fecha]
+        if {"anio", "semana"} & set(self.calendario):
+            iso = fechas.dt.isocalendar()
+        for nombre in self.calendario:
+            if nombre == "anio":
+                columnas[CALENDARIO[nombre]] = iso["year"].to_numpy(dtype="int16")
+            elif nombre == "semana":
+                columnas[CALENDARIO[nombre]] = iso["week"].to_numpy(dtype="int8")
+            elif nombre == "mes":
+                columnas[CALENDARIO[nombre]] = fechas.dt.month.to_numpy(dtype="int8")
+            elif nombre == "trimestre":
+                columnas[CALENDARIO[nombre]] = fechas.dt.quarter.to_numpy(dtype="int8")
+
+        resultado = pd.concat([df, pd.DataFrame(columnas, index=df.index)], axis=1)
+
+        if self.one_hot:
+            resultado = pd.concat(
+                [resultado, pd.get_dummies(df[self.one_hot], prefix=self.one_hot, dtype="int8")], axis=1
+            )
+
+        if self.opciones.get("elimina_incompletos", True):
+            resultado = resultado.dropna(subset=self._columnas_caracteristicas())
+
+        return resultado
+
+    # ------------------------------------------------------------------
+    # Actualización incremental
+    # ------------------------------------------------------------------
+
+    def _huella_opciones(self) -> str:
+        opciones = {"version": 1, "llaves": self.llaves, "fecha": self.fecha, "objetivos": self.objetivos,
+                    "lags": self.lags, "ventanas": self.ventanas, "calendario": self.calendario,
+                    "one_hot": self.one_hot, "elimina_incompletos": self.opciones.get("elimina_incompletos", True)}
+        return hashlib.sha256(json.dumps(opciones, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def huellas(self, ordenado: pd.DataFrame, hasta: Optional[pd.Series] = None) -> Dict[str, Dict[str, str]]:
+        """
+        Huella SHA-256 de la entrada de cada serie (llaves, fecha y objetivos) de un DataFrame ordenado.
+
+        :param hasta: Última fecha de cada registro a considerar (alineada con 'ordenado');
+                      sin ella se toman todas las semanas.
+        """
+        serie, _ = self._posiciones(ordenado)
+        incluido = np.ones(len(ordenado), dtype=bool) if hasta is None else (ordenado[self.fecha] <= hasta).to_numpy()
+
+        # Hash de cada registro con tipos fijos: no depende de cómo se leyó la entrada (CSV,
+        # Parquet, categóricas o enteros reducidos). Las semanas incluidas son un prefijo de su serie.
+        entrada = pd.DataFrame({
+            **{c: ordenado[c].astype(str) for c in self.llaves},
+            self.fecha: ordenado[self.fecha].astype("datetime64[ns]"),
+            **{c: ordenado[c].astype("float64") for c in self.objetivos},
+        })
+        filas = pd.util.hash_pandas_object(entrada, index=False).to_numpy()
+        inicio = np.searchsorted(serie, np.arange(serie.max() + 1 if len(serie) else 0))
+        incluidas = np.bincount(serie, weights=incluido, minlength=len(inicio)).astype(int)
+
+        resultado = {}
+        for ini, cuantas in zip(inicio, incluidas):
+            if not cuantas:
+                continue
+            llave = "|".join(str(ordenado[c].iat[ini]) for c in self.llaves)
+            ultima = ordenado[self.fecha].iat[ini + cuantas - 1]
+            resultado[llave] = {"ultima": ultima.isoformat(),
+                                "sha256": hashlib.sha256(filas[ini:ini + cuantas].tobytes()).hexdigest()}
+        return resultado
+
+    @property
+    def ruta_huellas(self) -> Optional[Path]:
+        if not self.salida:
+            return None
+        ruta = almacenamiento.ruta_artefacto(self.salida)
+        return ruta.with_name(f"{ruta.stem}.huellas.json")
+
+    def lee_huellas(self) -> Optional[Dict[str, Any]]:
+        ruta = self.ruta_huellas
+        if ruta is None or not ruta.is_file():
+            return None
+        try:
+            with open(ruta, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"No se pudieron leer las huellas de las características ({e}).")
+            return None
+
+    def guarda_huellas(self) -> None:
+        """Guarda las huellas de la entrada junto al resultado; se llama cada vez que se persiste 'salida'."""
+        if self.ruta_huellas is None:
+            return
+        huellas = self.huellas(self._ordena(self.df))
+        temporal = self.ruta_huellas.with_suffix(".tmp")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump({"opciones": self._huella_opciones(), "series": huellas}, f, indent=2, ensure_ascii=False)
+        temporal.replace(self.ruta_huellas)
+
+    def _ultimas(self, ordenado: pd.DataFrame, previas: Dict[str, Dict[str, str]]) -> pd.Series:
+        """Última semana ya calculada de la serie de cada registro (NaT en series nuevas)."""
+        if not self.llaves:
+            return pd.Series(pd.Timestamp(previas[""]["ultima"]) if "" in previas else pd.NaT, index=ordenado.index)
+
+        ultimas = pd.DataFrame(
+            [(*llave.split("|"), pd.Timestamp(h["ultima"])) for llave, h in previas.items()],
+            columns=[*self.llaves, "_ultima"],
+        )
+        ultima = ordenado[self.llaves].astype(str).merge(ultimas, on=self.llaves, how="left")["_ultima"]
+        return ultima.set_axis(ordenado.index)
+
+    def _ultimas_previo(self, previo: pd.DataFrame) -> Dict[str, pd.Timestamp]:
+        """Última semana de cada serie en el resultado previo, con las llaves de 'huellas'."""
+        if not self.llaves:
+            return {"": previo[self.fecha].max()} if len(previo) else {}
+
+        ultimas = previo.groupby(self.llaves, observed=True, dropna=False, sort=False)[self.fecha].max()
+        return {"|".join(str(v) for v in (llave if isinstance(llave, tuple) else (llave,))): fecha
+                for llave, fecha in ultimas.items()}
+
+    def _previo_vigente(self, previo: pd.DataFrame, huellas: Optional[Dict[str, Any]], ordenado: pd.DataFrame) -> bool:
+        """
+        El resultado previo sigue vigente si tiene las mismas columnas y opciones, y la entrada de
+        cada serie hasta su última semana calculada tiene la misma huella.
+        """
+        base = [*self.llaves, self.fecha, *self.objetivos, *self._columnas_caracteristicas(),
+                *(CALENDARIO[c] for c in self.calendario)]
+        sobrantes = {c for c in previo.columns if not any(c.startswith(f"{p}_") for p in self.one_hot)} - set(base)
+        if set(base) - set(previo.columns) or sobrantes:
+            logger.info("Las columnas del resultado previo no coinciden con la configuración; se recalcula completo.")
+            return False
+
+        if not huellas or huellas.get("opciones") != self._huella_opciones():
+            logger.info("No hay huellas del resultado previo para estas opciones; se recalcula completo.")
+            return False
+
+        previas = huellas.get("series", {})
+
+        # Un resultado guardado sin actualizar sus huellas tiene semanas que estas no cubren
+        adelantadas = sorted(llave for llave, fecha in self._ultimas_previo(previo).items()
+                             if llave not in previas or fecha > pd.Timestamp(previas[llave]["ultima"]))
+        if adelantadas:
+            logger.info(f"{len(adelantadas):,} serie(s) del resultado previo tienen semanas posteriores a sus "
+                        f"huellas (p. ej. '{adelantadas[0]}'); se recalcula completo.")
+            return False
+
+        actuales = self.huellas(ordenado, self._ultimas(ordenado, previas))
+
+        cambios = sorted(llave for llave in previas if actuales.get(llave) != previas[llave])
+        if cambios:
+            logger.info(f"{len(cambios):,} serie(s) cambiaron en semanas ya calculadas (p. ej. '{cambios[0]}'); "
+                        f"se recalcula completo.")
+            return False
+        return True
+
+    def actualiza(self, previo: pd.DataFrame, huellas: Optional[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Agrega al resultado previo las semanas posteriores a la última semana calculada de cada serie.
+
+        :param huellas: Huellas guardadas junto con 'previo' (lee_huellas); sin ellas se recalcula completo.
+        """
+        if self.fecha in previo and not pd.api.types.is_datetime64_any_dtype(previo[self.fecha]):
+            previo = previo.assign(**{self.fecha: pd.to_datetime(previo[self.fecha])})
+
+        ordenado = self._ordena(self.df)
+        if not self._previo_vigente(previo, huellas, ordenado):
+            return self.calcula()
+
+        serie, posicion = self._posiciones(ordenado)
+
+        ultima = self._ultimas(ordenado, huellas["series"])
+
+        nuevo = (ultima.isna() | (ordenado[self.fecha] > ultima)).to_numpy()
+        if not nuevo.any():
+            logger.info("No hay semanas nuevas; se conserva el resultado previo.")
+            return previo
+
+        # Las semanas nuevas forman el final de cada serie; se calcula desde 'contexto' semanas antes
+        tamano = np.bincount(serie)
+        primera_nueva = tamano - np.bincount(serie, weights=nuevo).astype(int)
+        requerido = posicion >= primera_nueva[serie] - self.contexto
+
+        parcial = self._calcula(ordenado[requerido].reset_index(drop=True))
+        parcial = parcial[nuevo[requerido][parcial.index]]
+
+        logger.info(f"Características incrementales: {int(nuevo.sum()):,} semana(s) nueva(s) | "
+                    f"{int(requerido.sum()):,} registro(s) procesado(s) de {len(ordenado):,}.")
+
+        resultado = pd.concat([previo, parcial], ignore_index=True)
+        resultado = resultado.drop_duplicates([*self.llaves, self.fecha], keep="last")
+        columnas_one_hot = [c for c in resultado.columns if any(c.startswith(f"{p}_") for p in self.one_hot)]
+        if columnas_one_hot:
+            resultado[columnas_one_hot] = resultado[columnas_one_hot].fillna(0).astype("int8")
+
+        return self._ordena(resultado)
+
+    def calcula(self) -> pd.DataFrame:
+        return self._calcula(self._ordena(self.df)).reset_index(drop=True)
+
+    def run(self, guardar: bool = True) -> pd.DataFrame:
+
+        logger.info(f"Generando características | series por {self.llaves or 'total nacional'} | "
+                    f"objetivos = {self.objetivos} | lags = {self.lags} | ventanas = {self.ventanas}")
+
+        previo = None
+        if self.opciones.get("incremental", False) and self.salida and almacenamiento.existe_dataset(self.salida):
+            previo = almacenamiento.leer_dataframe(self.salida)
+
+        resultado = self.actualiza(previo, self.lee_huellas()) if previo is not None else self.calcula()
+        logger.info(f"Se generaron {len(resultado):,} registros con {resultado.shape[1]} columnas.")
+
+        if guardar and self.salida:
+            almacenamiento.guardar_dataframe(resultado, self.salida)
+            self.guarda_huellas()
+
+        return resultado
@@ -1,23 +1,87 @@
 # src/datos/clean_dataset.py
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
 import pandas as pd
 
 from src.configuraciones.config_params import conf, logger
+from src.utils.datos import OperacionesDatos
+
+
+@dataclass
+class PlanLimpieza:
+    """
+    Reglas de limpieza.yaml compiladas para aplicarse en una sola pasada por columna.
+
+    - reemplazos: columna -> {valor original: valor final}; las cadenas de reglas
+      (A -> B seguida de B -> C) se resuelven al compilar.
+    - reglas_por_valor: columna -> {valor original: índices de las reglas que lo afectan},
+      para obtener el conteo por regla a partir de un solo conteo de valores.
+    - eliminaciones: columna -> [(índice de regla, valor)].
+    """
+    reemplazos: Dict[str, Dict[Any, Any]] = field(default_factory=dict)
+    reglas_por_valor: Dict[str, Dict[Any, List[int]]] = field(default_factory=dict)
+    eliminaciones: Dict[str, List[tuple]] = field(default_factory=dict)
+
+    @classmethod
+    def compilar(cls, valores_sustituir: List[dict], registros_eliminar: List[dict]) -> "PlanLimpieza":
+        plan = cls()
+
+        for indice, regla in enumerate(valores_sustituir or []):
+            columna = regla["columna_objetivo"]
+            viejo = regla["texto_a_reemplazar"]
+            nuevo = regla["texto_sustituto"]
+
+            mapa = plan.reemplazos.setdefault(columna, {})
+            reglas = plan.reglas_por_valor.setdefault(columna, {})
+
+            # Valores que, tras las reglas previas, terminan en 'viejo' también son afectados
+            for original, actual in mapa.items():
+                if actual == viejo:
+                    mapa[original] = nuevo
+                    reglas[original].append(indice)
+
+            if viejo not in mapa:
+                mapa[viejo] = nuevo
+                reglas[viejo] = [indice]
+
+        for indice, regla in enumerate(registros_eliminar or []):
+            plan.eliminaciones.setdefault(regla.get("columna_objetivo"), []).append((indice, regla.get("valor")))
+
+        return plan
+
 
 class CleanDataset:
     
     def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
-        self.df_raw = df.copy()
+        self.df = OperacionesDatos.copia_trabajo(df)
 
         #reglas de limpieza especificadas en limpieza.yaml
         self.columas_a_eliminar = conf.get("columnas_eliminar")
         self.valores_a_sustituir = conf.get("valores_sustituir")
         self.registros_a_eliminar = conf.get("registros_eliminar")
+        self.plan = PlanLimpieza.compilar(self.valores_a_sustituir, self.registros_a_eliminar)
+
+        # Conteos de cambios por tipo de regla
+        self.conteos = {
+            "columnas_renombradas": 0,
+            "columnas_eliminadas": 0,
+            "valores_sustituidos": 0,
+            "registros_eliminados": 0,
+        }
+
+    @property
+    def modificado(self) -> bool:
+        """Indica si alguna regla modificó el dataset, según los conteos de cada regla."""
+        return any(self.conteos.values())
 
     def _elimina_columnas(self) -> pd.DataFrame:
         """Elimina las columnas indicadas en la configuración."""
 
-        self.df.columns = [col.strip() for col in self.df.columns]
+        columnas = [col.strip() for col in self.df.columns]
+        self.conteos["columnas_renombradas"] = sum(a != b for a, b in zip(columnas, self.df.columns))
+        self.df.columns = columnas
 
         existentes = set(self.df.columns)
         a_eliminar = set(self.columas_a_eliminar)
@@ -28,6 +92,7 @@ class CleanDataset:
         if encontradas:
             logger.debug(f"Eliminando columnas: {sorted(encontradas)}")
             self.df.drop(columns=encontradas, inplace=True)
+            self.conteos["columnas_eliminadas"] = len(encontradas)
         else:
             logger.info("No se encontraron en el DataFrame las columnas configuradas para eliminar.")
 
@@ -39,62 +104,93 @@ class CleanDataset:
         return self.df
 
     def _sustituir_valores(self) -> pd.DataFrame:
-        """Aplica reglas de sustitución sobre el DataFrame, contando cambios por regla."""
+        """
+        Aplica las reglas de sustitución agrupadas por columna, contando cambios por regla.
 
-        total_cambios = 0
+        Cada columna se recorre una vez: se localizan los valores afectados por cualquier
+        regla y los conteos por regla se obtienen del conteo de ese subconjunto.
+        """
 
-        for regla in self.valores_a_sustituir:
-            columna = regla["columna_objetivo"]
-            viejo = regla["texto_a_reemplazar"]
-            nuevo = regla["texto_sustituto"]
+        total_cambios = 0
 
-            logger.debug(f'Sustituyendo en columna "{columna}": "{viejo}" por "{nuevo}"')
+        for columna, mapa in self.plan.reemplazos.items():
 
             if columna not in self.df.columns:
-                logger.warning(f"Columna no encontrada: {columna} (regla omitida)")
+                logger.warning(f"Columna no encontrada: {columna} (reglas omitidas: {len(mapa)})")
                 continue
 
             serie = self.df[columna]
-            
-            try:
-                coincidencias = (serie == viejo).sum()
-            except Exception:
-                coincidencias = (serie.astype(str) == str(viejo)).sum()
-
+            mascara = serie.isin(list(mapa))
+            conteo_valores = serie[mascara].value_counts()
+
+            conteo_reglas: Dict[int, int] = {}
+            for original, reglas in self.plan.reglas_por_valor[columna].items():
+                for indice in reglas:
+                    conteo_reglas[indice] = conteo_reglas.get(indice, 0) + int(conteo_valores.get(original, 0))
+
+            for indice in sorted(conteo_reglas):
+                regla = self.valores_a_sustituir[indice]
+                logger.debug(
+                    f'Sustituyendo en columna "{columna}": "{regla["texto_a_reemplazar"]}" por '
+                    f'"{regla["texto_sustituto"]}" | coincidencias: {conteo_reglas[indice]}'
+                )
+
+            coincidencias = int(mascara.sum())
             if coincidencias:
-                        self.df[columna] = serie.replace(viejo, nuevo)
-                        total_cambios += int(coincidencias)
-
-            logger.info(f"Se realizaron {total_cambios} actualizaciones.")
+                if isinstance(serie.dtype, pd.CategoricalDtype):
+                    # Los sustitutos pueden no existir como categoría: se reconstruyen las categorías
+                    self.df[columna] = (
+                        serie.astype(object)
+                        .where(~mascara, serie[mascara].astype(object).map(mapa))
+                        .astype("category")
+                    )
+                else:
+                    self.df[columna] = serie.where(~mascara, serie[mascara].map(mapa))
+                total_cambios += coincidencias
+
+        self.conteos["valores_sustituidos"] = total_cambios
+        logger.info(f"Se realizaron {total_cambios} actualizaciones.")
 
         return self.df
 
     def _eliminar_registros(self) -> pd.DataFrame:
 
-        """Elimina registros según las reglas configuradas."""
+        """
+        Elimina registros según las reglas configuradas.
+
+        Las reglas se combinan en una sola máscara booleana que se aplica una vez; los conteos
+        por regla se calculan sobre los registros originales (un registro puede cumplir varias).
+        """
 
         registros_iniciales = len(self.df)
         logger.debug(f"Registros iniciales: {registros_iniciales}")
 
-        for regla in self.registros_a_eliminar:
-            columna = regla.get("columna_objetivo")
-            valor = regla.get("valor")
+        mascara = np.zeros(registros_iniciales, dtype=bool)
+
+        for columna, reglas in self.plan.eliminaciones.items():
 
             if columna not in self.df.columns:
-                logger.warning(f"Columna no encontrada: '{columna}'. Regla omitida.")
+                logger.warning(f"Columna no encontrada: '{columna}'. Regla(s) omitida(s): {len(reglas)}")
                 continue
 
-            coincidencias = (self.df[columna] == valor).sum()
-            logger.debug(
-                f"Regla -> columna: '{columna}' | valor: '{valor}' | "
-                f"Coincidencias encontradas: {coincidencias}"
-            )
+            serie = self.df[columna]
+            mascara_columna = serie.isin([valor for _, valor in reglas]).to_numpy()
+            conteo_valores = serie[mascara_columna].value_counts()
+
+            for _, valor in reglas:
+                logger.debug(
+                    f"Regla -> columna: '{columna}' | valor: '{valor}' | "
+                    f"Coincidencias encontradas: {int(conteo_valores.get(valor, 0))}"
+                )
+
+            mascara |= mascara_columna
 
-            if coincidencias > 0:
-                self.df = self.df[self.df[columna] != valor]
+        if mascara.any():
+            self.df = self.df[~mascara]
 
         registros_finales = len(self.df)
         eliminados = registros_iniciales - registros_finales
+        self.conteos["registros_eliminados"] = eliminados
 
         logger.debug(f"Registros finales: {registros_finales}")
         logger.info(f"Total de registros eliminados: {eliminados}")
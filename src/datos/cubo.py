@@ -0,0 +1,187 @@
+# src/datos/cubo.py
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Niveles de agregación materializados en el cubo
+NIVELES = ("nacional", "region", "entidad")
+
+# Valor de Region / Entidad en los niveles que las agregan
+TOTAL = "Total"
+
+# Medida del cubo para cada sexo
+MEDIDAS = {
+    "hombres": "incrementos_hombres",
+    "mujeres": "incrementos_mujeres",
+    "total": "incrementos_total",
+}
+
+
+def completa_dimensiones(df: pd.DataFrame, padecimiento: Optional[str]) -> pd.DataFrame:
+    """
+    Expresa cualquier vista de agrupar_incrementos (sexo, region o ambos) con las dimensiones del cubo.
+
+    Las dimensiones ausentes toman su valor agregado: la vista 'sexo' es el nivel nacional y la
+    vista 'region' el nivel entidad. Se agrega la medida total si no está presente.
+    """
+    df = df.copy()
+    if "Padecimiento" not in df:
+        df["Padecimiento"] = padecimiento
+    if "Nivel" not in df:
+        df["Nivel"] = "entidad" if "Entidad" in df else "nacional"
+    for dimension in ("Region", "Entidad"):
+        if dimension not in df:
+            df[dimension] = TOTAL
+    if MEDIDAS["total"] not in df:
+        df[MEDIDAS["total"]] = df[MEDIDAS["hombres"]] + df[MEDIDAS["mujeres"]]
+    if not pd.api.types.is_datetime64_any_dtype(df["Fecha"]):
+        df["Fecha"] = pd.to_datetime(df["Fecha"])
+
+    return df[[*CuboIncrementos.DIMENSIONES, "Fecha", *MEDIDAS.values()]]
+
+
+def codigos_region(entidades: pd.Index, regiones: List[Dict]) -> tuple[np.ndarray, List[str]]:
+    """
+    Código de región (posición en 'regiones' de FE.yaml) de cada entidad; -1 si no tiene región.
+
+    Se calcula una sola vez sobre las categorías de Entidad, no sobre cada registro.
+    """
+    nombres = [r["nombre"] for r in regiones]
+    codigo = {estado: i for i, r in enumerate(regiones) for estado in r.get("estados", [])}
+    return np.array([codigo.get(entidad, -1) for entidad in entidades], dtype=np.int8), nombres
+
+
+class CuboIncrementos:
+    """
+    Cubo compacto de incrementos semanales: Padecimiento x Nivel x Region x Entidad x Fecha.
+
+    Contiene en una sola tabla los niveles nacional, regional y por entidad, con las medidas
+    por sexo (hombres, mujeres y total). Cualquier vista nacional, regional, por entidad o
+    por sexo se obtiene filtrando el cubo, sin volver a agrupar el detalle.
+    """
+
+    # Dimensiones del cubo (además de Fecha)
+    DIMENSIONES = ("Padecimiento", "Nivel", "Region", "Entidad")
+
+    def __init__(self, cubo: pd.DataFrame):
+        # Un cubo leído de CSV trae las dimensiones como texto
+        self.cubo = cubo.astype({c: "category" for c in self.DIMENSIONES if cubo[c].dtype != "category"})
+        if not pd.api.types.is_datetime64_any_dtype(self.cubo["Fecha"]):
+            self.cubo["Fecha"] = pd.to_datetime(self.cubo["Fecha"])
+
+    @classmethod
+    def desde_detalle(cls, df: pd.DataFrame, regiones: List[Dict], padecimiento: str) -> "CuboIncrementos":
+        """
+        Construye el cubo a partir del detalle de dataTransformation (Fecha, Entidad, Incremento_*).
+
+        El nivel entidad se agrupa una vez desde el detalle; los niveles región y nacional se
+        agregan desde el nivel entidad, que es mucho más pequeño.
+        """
+        entidad = df["Entidad"].astype("category")
+        detalle = pd.DataFrame({
+            "Fecha": df["Fecha"].to_numpy(),
+            "Entidad": entidad.cat.remove_unused_categories(),
+            "incrementos_hombres": df["Incremento_hombres"].to_numpy(),
+            "incrementos_mujeres": df["Incremento_mujeres"].to_numpy(),
+        })
+
+        por_entidad = (
+            detalle.groupby(["Fecha", "Entidad"], observed=True, sort=True)[[MEDIDAS["hombres"], MEDIDAS["mujeres"]]]
+            .sum()
+            .reset_index()
+        )
+
+        codigos, nombres = codigos_region(por_entidad["Entidad"].cat.categories, regiones)
+        sin_region = por_entidad["Entidad"].cat.categories[codigos < 0].tolist()
+        if sin_region:
+            logger.warning(f"Entidades sin región configurada (solo se incluyen en los niveles nacional y entidad): {sin_region}")
+
+        # El código -1 (sin región) toma el último elemento: nulo
+        nombres_region = np.array([*nombres, None], dtype=object)
+        por_entidad["Region"] = nombres_region[codigos[por_entidad["Entidad"].cat.codes.to_numpy()]]
+
+        por_region = (
+            por_entidad.groupby(["Fecha", "Region"], sort=True)[[MEDIDAS["hombres"], MEDIDAS["mujeres"]]]
+            .sum()
+            .reset_index()
+        )
+        nacional = (
+            por_entidad.groupby("Fecha", sort=True)[[MEDIDAS["hombres"], MEDIDAS["mujeres"]]]
+            .sum()
+            .reset_index()
+        )
+
+        valores_entidad = [*por_entidad["Entidad"].cat.categories, TOTAL]
+        cubo = pd.concat([
+            nacional.assign(Nivel="nacional", Region=TOTAL, Entidad=TOTAL),
+            por_region.assign(Nivel="region", Entidad=TOTAL),
+            por_entidad.assign(Nivel="entidad", Entidad=por_entidad["Entidad"].astype(object)),
+        ], ignore_index=True)
+
+        cubo[MEDIDAS["total"]] = cubo[MEDIDAS["hombres"]] + cubo[MEDIDAS["mujeres"]]
+        cubo.insert(0, "Padecimiento", pd.Categorical([padecimiento] * len(cubo)))
+        cubo["Nivel"] = pd.Categorical(cubo["Nivel"], categories=list(NIVELES))
+        cubo["Region"] = pd.Categorical(cubo["Region"], categories=[*nombres, TOTAL])
+        cubo["Entidad"] = pd.Categorical(cubo["Entidad"], categories=valores_entidad)
+        cubo = cubo[["Padecimiento", "Nivel", "Region", "Entidad", "Fecha", *MEDIDAS.values()]]
+
+        logger.info(f"Cubo de incrementos construido: {len(cubo):,} registros | "
+                    + " | ".join(f"{nivel} = {(cubo['Nivel'] == nivel).sum():,}" for nivel in NIVELES))
+        return cls(cubo)
+
+    def rebanada(self,
+                 nivel: str = "nacional",
+                 region: Optional[str] = None,
+                 entidad: Optional[str] = None,
+                 sexo: Optional[str] = None,
+                 padecimiento: Optional[str] = None) -> pd.DataFrame:
+        """
+        Vista del cubo ordenada por fecha.
+
+        :param nivel: 'nacional', 'region' o 'entidad'.
+        :param region: Filtra una región (niveles región y entidad).
+        :param entidad: Filtra una entidad (nivel entidad).
+        :param sexo: 'hombres', 'mujeres' o 'total'; sin sexo se devuelven las tres medidas.
+        :param padecimiento: Filtra un padecimiento si el cubo contiene varios.
+        """
+        if nivel not in NIVELES:
+            raise ValueError(f"Nivel no soportado: '{nivel}'. Opciones: {NIVELES}")
+        if sexo is not None and sexo not in MEDIDAS:
+            raise ValueError(f"Sexo no soportado: '{sexo}'. Opciones: {tuple(MEDIDAS)}")
+
+        mascara = self.cubo["Nivel"] == nivel
+        if region is not None:
+            mascara &= self.cubo["Region"] == region
+        if entidad is not None:
+            mascara &= self.cubo["Entidad"] == entidad
+        if padecimiento is not None:
+            mascara &= self.cubo["Padecimiento"] == padecimiento
+
+        dimensiones = {"nacional": [], "region": ["Region"], "entidad": ["Region", "Entidad"]}[nivel]
+        medidas = [MEDIDAS[sexo]] if sexo else list(MEDIDAS.values())
+
+        vista = self.cubo.loc[mascara, ["Fecha", *dimensiones, *medidas]]
+        vista = vista.assign(**{columna: vista[columna].cat.remove_unused_categories() for columna in dimensiones})
+        return vista.sort_values(["Fecha", *dimensiones], kind="stable").reset_index(drop=True)
+
+    def agrupa(self, agrupamiento: str) -> pd.DataFrame:
+        """
+        Vista del cubo para la opción 'agrupa' de FE.yaml.
+
+        - 'sexo': serie nacional con los incrementos de hombres y mujeres.
+        - 'region': una serie por entidad (con su región) con los incrementos de hombres y mujeres.
+        - 'ambos': el cubo completo (niveles nacional, región y entidad).
+        """
+        if agrupamiento == "sexo":
+            vista = self.rebanada("nacional")
+        elif agrupamiento == "region":
+            vista = self.rebanada("entidad")
+        elif agrupamiento == "ambos":
+            return self.cubo.copy()
+        else:
+            logger.warning(f"Agrupamiento desconocido: {agrupamiento}. No se generará agrupación.")
+            return pd.DataFrame()
+
+        return vista.drop(columns=MEDIDAS["total"])
@@ -1,24 +1,39 @@
 # src/datos/descarga_dataset.py
+import json
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
-import gdown
 import pandas as pd
 from loguru import logger
 
-from src.utils import directory_manager
+from src.datos.fuentes_descarga import ArchivoRemoto, crear_fuente
+from src.utils import almacenamiento, directory_manager
+from src.utils.directory_manager import sha256_archivo
+from src.utils.esquema import tipos_columnas
 
+# Registros de cada CSV en los que se verifica el tipo de las columnas enteras antes de unirlos
+MUESTRA_VALIDACION = 10_000
 
-# Clase encargada de descargar datasets desde Google Drive a una ruta local
+
+# Clase encargada de descargar datasets desde la fuente configurada (Google Drive, HTTP o
+# carpeta local) a una ruta local
 
 class DatasetDownloader:
 
-    def __init__(self, configuracion: str, output_path: str, archivo_raw: str):
+    def __init__(self, configuracion: dict, output_path: str, archivo_raw: str):
         self.dataset_id = configuracion["dataset_id"]    # ID del dataset en Google Drive
         self.use_cookies = configuracion["cookies"]
         self.output_path = output_path  # Ruta local donde se guardará el archivo descargado
         self.salida_raw = archivo_raw
         self.force = configuracion["force"] 
+        self.hilos = configuracion.get("hilos", 4)  # Descargas y lecturas simultáneas
+        self.fuente = crear_fuente(configuracion)
+        self.ruta_manifest = Path(output_path) / ".manifest_descarga.json"
     
     def prepara_directorio(self) -> bool:
         """
@@ -27,42 +42,142 @@ class DatasetDownloader:
         """
         directory_manager.asegurar_ruta(self.output_path)
         
-        if directory_manager.existe_archivo(self.salida_raw) and not self.force:
+        if almacenamiento.existe_dataset(self.salida_raw) and not self.force:
             logger.info(f"El archivo ya existe: {self.salida_raw}. Se omite la descarga.")
             return False
         
-        if self.force and directory_manager.existe_archivo(self.salida_raw):            
-            logger.warning(f"'force' habilitado; los archivos existentes serán sobrescritos → {self.salida_raw}")
+        if self.force and almacenamiento.existe_dataset(self.salida_raw):            
+            logger.warning(f"'force' habilitado; se sincronizará con la fuente y se regenerará el RAW si hubo cambios → {self.salida_raw}")
         else:
             logger.debug(f"Archivo no encontrado. Se descargará en: {self.salida_raw}")
 
         return True
 
-    def descarga(self) -> None:
-        logger.info(f"Descargando carpeta de Google Drive (ID: {self.dataset_id})...")
-        directory_manager.limpia_carpeta(self.output_path)
-        
-        paths = gdown.download_folder(
-                id=self.dataset_id,
-                output=str(self.output_path),
-                quiet=True,
-                use_cookies=self.use_cookies,
-                remaining_ok=True
-            )
-        
-        if not paths:
-                logger.warning("No se descargó ningún archivo. Verifica permisos o que la carpeta no esté vacía.")
-                return []
-        
+    # ------------------ Manifest de descarga ------------------
+    def _cargar_manifest(self) -> Dict[str, Dict]:
+        if not self.ruta_manifest.is_file():
+            return {}
+
+        try:
+            with open(self.ruta_manifest, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"No se pudo leer el manifest de descarga ({e}); se verificarán todos los archivos.")
+            return {}
+
+    def _guardar_manifest(self, manifest: Dict[str, Dict]) -> None:
+        temporal = self.ruta_manifest.with_suffix(".tmp")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        temporal.replace(self.ruta_manifest)
+
+    def _vigente(self, archivo: ArchivoRemoto, registro: Optional[Dict]) -> bool:
+        """Indica si la copia local coincide con el archivo de la fuente."""
+        local = Path(self.output_path) / archivo.nombre
+
+        if not local.is_file():
+            return False
+
+        tamano_local = local.stat().st_size
+
+        if archivo.tamano is not None and archivo.tamano != tamano_local:
+            return False
+
+        if registro is None:
+            # Sin registro previo solo se confía en un checksum publicado por la fuente
+            return archivo.sha256 is not None and archivo.sha256 == sha256_archivo(local)
+
+        if registro.get("referencia") != archivo.referencia or registro.get("version") != archivo.version:
+            return False
+
+        if registro.get("tamano") != tamano_local:
+            return False
+
+        return archivo.sha256 is None or archivo.sha256 == registro.get("sha256")
+
+    def _descarga_archivo(self, archivo: ArchivoRemoto) -> Dict:
+        destino = Path(self.output_path) / archivo.nombre
+        directory_manager.asegurar_ruta(destino.parent)
+
+        logger.debug(f"Descargando '{archivo.nombre}' -> {destino}")
+        self.fuente.descargar(archivo, destino)
+
+        sha = sha256_archivo(destino)
+        if archivo.sha256 is not None and archivo.sha256 != sha:
+            destino.unlink()
+            raise RuntimeError(f"Checksum inválido para '{archivo.nombre}': se esperaba {archivo.sha256}, se obtuvo {sha}")
+
+        return {
+            "referencia": archivo.referencia,
+            "version": archivo.version,
+            "tamano": destino.stat().st_size,
+            "sha256": sha,
+            "fecha": f"{datetime.now():%Y-%m-%d %H:%M:%S}",
+        }
+
+    def descarga(self) -> List[Path]:
+        """
+        Sincroniza la carpeta local con la fuente.
+
+        Solo se descargan los archivos nuevos o modificados (según el manifest), en paralelo;
+        las descargas interrumpidas se reanudan en la siguiente ejecución.
+        Retorna las rutas de los archivos descargados en esta ejecución.
+        """
+        logger.info(f"Sincronizando con la fuente '{self.fuente.nombre}'...")
+
+        archivos = self.fuente.listar()
+
+        if not archivos:
+            logger.warning("La fuente no publicó ningún archivo. Verifica permisos o que la carpeta no esté vacía.")
+            return []
+
+        manifest = self._cargar_manifest()
+        vigentes = {a.nombre: a for a in archivos if self._vigente(a, manifest.get(a.nombre))}
+        pendientes = [a for a in archivos if a.nombre not in vigentes]
+
+        logger.info(f"Archivos en la fuente: {len(archivos)} | sin cambios: {len(vigentes)} | por descargar: {len(pendientes)}")
+
+        # Se conserva solo el registro de los archivos que siguen publicados en la fuente
+        manifest = {nombre: manifest[nombre] for nombre in vigentes if nombre in manifest}
+        descargados, errores = [], []
+
+        with ThreadPoolExecutor(max_workers=self.hilos) as executor:
+            futuros = {executor.submit(self._descarga_archivo, archivo): archivo for archivo in pendientes}
+
+            for futuro in as_completed(futuros):
+                archivo = futuros[futuro]
+                try:
+                    manifest[archivo.nombre] = futuro.result()
+                    descargados.append(Path(self.output_path) / archivo.nombre)
+                    logger.info(f"Descargado: {archivo.nombre} ({manifest[archivo.nombre]['tamano']:,} bytes)")
+                except Exception as e:
+                    errores.append(archivo.nombre)
+                    logger.error(f"Error al descargar '{archivo.nombre}': {e}")
+
+                # Se guarda tras cada archivo para no perder el avance si el proceso se interrumpe
+                self._guardar_manifest(manifest)
+
+        if errores:
+            raise RuntimeError(f"No se pudieron descargar {len(errores)} archivo(s): {sorted(errores)}")
+
         logger.info(f"Descarga completada. Archivos guardados en: {self.output_path}")
-        return paths
+        return descargados
 
-    def agrupar_archivos(self) -> None:
+    def archivos_descargados(self) -> List[Path]:
+        """CSV registrados en el manifest de descarga (excluye archivos generados localmente)."""
+        manifest = self._cargar_manifest()
+        return sorted(
+            Path(self.output_path) / nombre
+            for nombre in manifest
+            if nombre.endswith(".csv") and (Path(self.output_path) / nombre).is_file()
+        )
+
+    def agrupar_archivos(self, archivos: Optional[List[Path]] = None) -> None:
         ruta = Path(self.output_path)
-        archivos = sorted(ruta.glob("*.csv"))
-        archivo_final = Path(self.salida_raw)
+        archivos = archivos if archivos is not None else sorted(ruta.glob("*.csv"))
+        archivo_final = almacenamiento.localizar_dataset(self.salida_raw)
        
-        if archivo_final.exists():            
+        if archivo_final is not None:            
             creado = datetime.fromtimestamp(archivo_final.stat().st_ctime).strftime("%Y-%m-%d %H:%M:%S")
             modificado = datetime.fromtimestamp(archivo_final.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
 
@@ -76,34 +191,111 @@ class DatasetDownloader:
         
         logger.info(f"Archivos localizados-> {len(archivos)}")
 
-        if len(archivos) == 1:
+        if len(archivos) == 1 and almacenamiento.ruta_artefacto(self.salida_raw).suffix == ".csv":
             archivo_unico = archivos[0]
             logger.info(f"Solo se encontró un archivo: {archivo_unico}")
-            logger.info(f"Renombrando a: {self.salida_raw}")
-        
-            archivo_unico.rename(self.salida_raw)
+            logger.info(f"Copiando a: {self.salida_raw}")
 
-            logger.info("Archivo renombrado correctamente.")
+            # Se copia en lugar de renombrar para conservar el archivo registrado en el manifest
+            shutil.copyfile(archivo_unico, self.salida_raw)
+
+            logger.info("Archivo copiado correctamente.")
             return None
 
 
         logger.info("Unificando archivos CSV...")
+        columnas, tipos = self._esquema_archivos(archivos)
+        lee = partial(self._lee_csv, columnas=columnas, tipos=tipos)
 
-        df_final = pd.read_csv(archivos[0])
-        logger.debug(f"Primer archivo leído: {archivos[0]}")
+        with almacenamiento.EscritorIncremental(self.salida_raw) as escritor, \
+                ThreadPoolExecutor(max_workers=self.hilos) as executor:
 
-        for f in archivos[1:]:
-            logger.debug(f"Concatenando archivo: {f}")
-            df = pd.read_csv(f)
-            df_final = pd.concat([df_final, df], ignore_index=True)
+            # Ventana acotada de lecturas en curso: se conserva el orden y la memoria
+            # solo mantiene 'hilos' archivos a la vez
+            pendientes = deque()
+            siguientes = iter(archivos)
 
-        df_final.to_csv(self.salida_raw, index=False)
-        logger.info(f"Archivo combinado guardado en: {self.salida_raw}")
+            for f in siguientes:
+                pendientes.append((f, executor.submit(lee, f)))
+                if len(pendientes) >= self.hilos:
+                    break
+
+            while pendientes:
+                f, futuro = pendientes.popleft()
+                df = futuro.result()
+
+                logger.debug(f"Agregando archivo: {f} | registros = {len(df):,}")
+                escritor.escribe(df)
+                del df
+
+                siguiente = next(siguientes, None)
+                if siguiente is not None:
+                    pendientes.append((siguiente, executor.submit(lee, siguiente)))
+
+        logger.info(f"Archivo combinado guardado en: {escritor.ruta} | registros = {escritor.registros:,}")
+
+    @staticmethod
+    def _esquema_archivos(archivos: List[Path]) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Valida que todos los CSV tengan las mismas columnas que el primero y devuelve su orden y tipos.
+
+        El orden de las columnas puede variar entre archivos (cada archivo se reordena al leerlo).
+        Los tipos de las columnas declaradas en esquema.yaml se fijan para todos los archivos;
+        en una muestra de cada archivo se verifica que las columnas enteras sean numéricas.
+        """
+        referencia = pd.read_csv(archivos[0], nrows=0).columns.tolist()
+        tipos = tipos_columnas(referencia)
+        numericas = [col for col, tipo in tipos.items() if tipo != "category"]
+        errores, reordenados = [], []
+
+        for f in archivos:
+            columnas = pd.read_csv(f, nrows=0).columns.tolist()
+            if set(columnas) != set(referencia):
+                faltantes = sorted(set(referencia) - set(columnas))
+                adicionales = sorted(set(columnas) - set(referencia))
+                errores.append(f"{f.name}: faltan {faltantes} | sobran {adicionales}")
+                continue
+            if columnas != referencia:
+                reordenados.append(f.name)
+
+            muestra = pd.read_csv(f, usecols=numericas, dtype=str, nrows=MUESTRA_VALIDACION)
+            for col in numericas:
+                valores = muestra[col].dropna()
+                invalidos = valores[pd.to_numeric(valores, errors="coerce").isna()]
+                if not invalidos.empty:
+                    errores.append(f"{f.name}: la columna '{col}' (entera en esquema.yaml) contiene '{invalidos.iloc[0]}'")
+
+        if errores:
+            raise ValueError(
+                f"Los archivos no comparten el esquema de {archivos[0].name}: " + " | ".join(errores)
+            )
+
+        if reordenados:
+            logger.info(f"Columnas en distinto orden (se reordenan al unir): {reordenados}")
+        logger.debug(f"Esquema validado en {len(archivos)} archivos | columnas = {referencia} | tipos = {tipos}")
+        return referencia, tipos
+
+    @staticmethod
+    def _lee_csv(archivo: Path, columnas: List[str], tipos: Dict[str, str]) -> pd.DataFrame:
+        try:
+            return pd.read_csv(archivo, dtype=tipos)[columnas]
+        except ValueError as e:
+            raise ValueError(f"No se pudo leer {archivo.name} con los tipos de esquema.yaml: {e}") from e
+
+    def _elimina_consolidado(self) -> None:
+        for formato in almacenamiento.EXTENSIONES:
+            ruta = almacenamiento.ruta_artefacto(self.salida_raw, formato)
+            if ruta.is_file():
+                logger.warning(f"Los archivos de la fuente cambiaron; se regenerará el RAW → {ruta}")
+                ruta.unlink()
 
-    
     def run(self):
         descargar = self.prepara_directorio()
         if descargar:
-            self.descarga()
-            self.agrupar_archivos()
+            descargados = self.descarga()
+
+            if descargados:
+                self._elimina_consolidado()
+
+            self.agrupar_archivos(self.archivos_descargados())
         
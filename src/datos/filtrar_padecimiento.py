@@ -1,20 +1,73 @@
 # src/datos/filtrar_padecimiento.py
+from contextlib import ExitStack
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
 import pandas as pd
 
 from loguru import logger
 
+from src.utils import almacenamiento
+
 class FiltraPadecimiento:
 
     def __init__(self,
                  df: pd.DataFrame,
                  padecimiento : dict
                  ):
-        
-        self.df_raw = df.copy()
+
+        # El filtrado solo lee el DataFrame de entrada; no requiere copia
+        self.df_raw = df
         self.columna = padecimiento.get("columna")
         self.padecimiento = padecimiento.get("tipo")
         self.df_raw_filtrado = pd.DataFrame
-    
+
+    @staticmethod
+    def coincidencias(serie: pd.Series, tipos: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Obtiene una máscara booleana por tipo de padecimiento.
+
+        La búsqueda de texto se hace solo sobre las categorías distintas de la columna;
+        cada fila se resuelve después con una búsqueda por código de categoría.
+        """
+        categorias = serie if isinstance(serie.dtype, pd.CategoricalDtype) else serie.astype("category")
+        etiquetas = categorias.cat.categories.astype(str)
+        codigos = categorias.cat.codes.to_numpy()
+
+        mascaras = {}
+        for tipo in tipos:
+            # El código -1 (nulo) apunta a la última posición, que siempre es False
+            por_categoria = np.append(etiquetas.str.contains(tipo, case=False, regex=False), False)
+            mascaras[tipo] = por_categoria[codigos]
+
+        return mascaras
+
+    @classmethod
+    def filtrar_lote(cls, df: pd.DataFrame, columna: str, tipos: List[str]) -> Dict[str, pd.DataFrame]:
+        """Particiona el DataFrame en un subconjunto por padecimiento en una sola pasada."""
+
+        if columna not in df.columns:
+            logger.error(f"No se puede filtrar: la columna '{columna}' no existe en el DataFrame.")
+            return {}
+
+        logger.info(f"Filtrando en lote {len(tipos)} padecimiento(s) {tipos} en columna '{columna}'")
+
+        particiones = {}
+        for tipo, mascara in cls.coincidencias(df[columna], tipos).items():
+            filtrados = int(mascara.sum())
+
+            if filtrados == 0:
+                logger.error(f"No se encontraron registros para el padecimiento {tipo}.")
+                continue
+
+            logger.success(
+                f"Padecimiento '{tipo}': {filtrados} de {len(df)} registros "
+                f"({(filtrados/len(df))*100:.2f}% del total)"
+            )
+            particiones[tipo] = df[mascara].reset_index(drop=True)
+
+        return particiones
 
     def _filtrar_padecimiento(self) -> bool:
 
@@ -32,11 +85,8 @@ class FiltraPadecimiento:
 
         logger.info(f"Filtrando datos por padecimiento '{self.padecimiento}' en columna '{self.columna}'")
 
-        self.df_raw_filtrado = self.df_raw[
-            self.df_raw[self.columna]
-            .astype(str)
-            .str.contains(self.padecimiento, case=False, na=False)
-        ]
+        mascara = self.coincidencias(self.df_raw[self.columna], [self.padecimiento])[self.padecimiento]
+        self.df_raw_filtrado = self.df_raw[mascara]
 
         return True
 
@@ -60,3 +110,73 @@ class FiltraPadecimiento:
 
         else:
             return None
+
+
+class FiltraPadecimientoPorBloques:
+    """
+    Filtra el archivo RAW por bloques, sin cargarlo completo en memoria.
+
+    Cada bloque se evalúa con el mismo criterio de FiltraPadecimiento y las coincidencias
+    se agregan al archivo de salida de su padecimiento; la memoria máxima queda acotada
+    por el tamaño del bloque.
+    """
+
+    def __init__(self,
+                 ruta_entrada: str,
+                 columna: str,
+                 salidas: Dict[str, str],
+                 tamano_bloque: int):
+
+        self.ruta_entrada = ruta_entrada
+        self.columna = columna
+        self.salidas = salidas  # tipo de padecimiento -> ruta de salida
+        self.tamano_bloque = int(tamano_bloque)
+
+    def run(self) -> Dict[str, int]:
+        """Devuelve el número de registros escritos por padecimiento."""
+
+        tipos = list(self.salidas)
+        conteos = dict.fromkeys(tipos, 0)
+        total_registros = 0
+        bloques = 0
+        inicio = datetime.now()
+
+        logger.info(
+            f"Filtrado por bloques de '{self.ruta_entrada}' | padecimientos = {tipos} | "
+            f"tamaño de bloque = {self.tamano_bloque:,}"
+        )
+
+        with ExitStack() as pila:
+            escritores = {
+                tipo: pila.enter_context(almacenamiento.EscritorIncremental(ruta))
+                for tipo, ruta in self.salidas.items()
+            }
+
+            for bloque in almacenamiento.leer_por_bloques(self.ruta_entrada, self.tamano_bloque):
+
+                if self.columna not in bloque.columns:
+                    raise KeyError(f"La columna '{self.columna}' no existe en el archivo {self.ruta_entrada}.")
+
+                for tipo, mascara in FiltraPadecimiento.coincidencias(bloque[self.columna], tipos).items():
+                    escritores[tipo].escribe(bloque[mascara])
+                    conteos[tipo] += int(mascara.sum())
+
+                bloques += 1
+                total_registros += len(bloque)
+                segundos = max((datetime.now() - inicio).total_seconds(), 1e-9)
+
+                logger.info(
+                    f"Bloque {bloques} procesado | registros leídos = {total_registros:,} | "
+                    f"coincidencias = {sum(conteos.values()):,} | {total_registros / segundos:,.0f} registros/s"
+                )
+
+        for tipo, filtrados in conteos.items():
+            if filtrados == 0:
+                logger.error(f"No se encontraron registros para el padecimiento {tipo}.")
+            else:
+                logger.success(
+                    f"Padecimiento '{tipo}': {filtrados} de {total_registros} registros "
+                    f"({(filtrados/total_registros)*100:.2f}% del total) -> {almacenamiento.ruta_artefacto(self.salidas[tipo])}"
+                )
+
+        return conteos
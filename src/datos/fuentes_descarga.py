@@ -0,0 +1,208 @@
+# src/datos/fuentes_descarga.py
+import shutil
+import urllib.error
+import urllib.parse
+import urllib.request
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import gdown
+from loguru import logger
+
+TAMANO_BLOQUE = 1 << 20  # 1 MiB por lectura/escritura
+
+
+@dataclass
+class ArchivoRemoto:
+    """
+    Archivo publicado por una fuente de datos.
+
+    - nombre: ruta relativa dentro de la carpeta de destino.
+    - referencia: identificador en la fuente (ID de Drive, URL o ruta local).
+    - version: marca que cambia cuando el archivo cambia en la fuente (ETag, fecha, ...).
+    """
+    nombre: str
+    referencia: str
+    tamano: Optional[int] = None
+    sha256: Optional[str] = None
+    version: Optional[str] = None
+
+
+def ruta_parcial(destino: Path) -> Path:
+    """Archivo temporal donde se construye una descarga antes de publicarla."""
+    return destino.with_name(destino.name + ".part")
+
+
+class FuenteDatos(ABC):
+    """Interfaz común de las fuentes desde las que se obtiene el dataset."""
+
+    nombre = "fuente"
+
+    @abstractmethod
+    def listar(self) -> List[ArchivoRemoto]:
+        """Devuelve los archivos disponibles en la fuente."""
+
+    @abstractmethod
+    def descargar(self, archivo: ArchivoRemoto, destino: Path) -> None:
+        """Descarga un archivo en 'destino'; el archivo solo debe aparecer cuando está completo."""
+
+
+class FuenteGoogleDrive(FuenteDatos):
+
+    nombre = "google_drive"
+
+    def __init__(self, dataset_id: str, use_cookies: bool):
+        self.dataset_id = dataset_id
+        self.use_cookies = use_cookies
+
+    def listar(self) -> List[ArchivoRemoto]:
+        logger.info(f"Consultando carpeta de Google Drive (ID: {self.dataset_id})...")
+
+        archivos = gdown.download_folder(
+            id=self.dataset_id,
+            quiet=True,
+            use_cookies=self.use_cookies,
+            remaining_ok=True,
+            skip_download=True,
+        )
+
+        # Drive no publica tamaño ni checksum en el listado; el ID identifica la versión
+        return [
+            ArchivoRemoto(nombre=archivo.path, referencia=archivo.id, version=archivo.id)
+            for archivo in archivos or []
+        ]
+
+    def descargar(self, archivo: ArchivoRemoto, destino: Path) -> None:
+        parcial = ruta_parcial(destino)
+
+        # resume=True retoma la descarga desde el archivo parcial de una ejecución interrumpida
+        resultado = gdown.download(
+            id=archivo.referencia,
+            output=str(parcial),
+            quiet=True,
+            use_cookies=self.use_cookies,
+            resume=True,
+        )
+
+        if resultado is None:
+            raise RuntimeError(f"No se pudo descargar '{archivo.nombre}' desde Google Drive.")
+
+        parcial.replace(destino)
+
+
+class FuenteHTTP(FuenteDatos):
+    """Descarga archivos publicados bajo una URL base; reanuda descargas con peticiones Range."""
+
+    nombre = "http"
+
+    def __init__(self, url_base: str, archivos: List[str], timeout: float = 60):
+        self.url_base = url_base if url_base.endswith("/") else url_base + "/"
+        self.archivos = archivos
+        self.timeout = timeout
+
+    def _url(self, nombre: str) -> str:
+        return urllib.parse.urljoin(self.url_base, urllib.parse.quote(nombre))
+
+    def listar(self) -> List[ArchivoRemoto]:
+        logger.info(f"Consultando {len(self.archivos)} archivo(s) en {self.url_base}")
+        remotos = []
+
+        for nombre in self.archivos:
+            url = self._url(nombre)
+            tamano, version = None, None
+
+            try:
+                peticion = urllib.request.Request(url, method="HEAD")
+                with urllib.request.urlopen(peticion, timeout=self.timeout) as respuesta:
+                    longitud = respuesta.headers.get("Content-Length")
+                    tamano = int(longitud) if longitud else None
+                    version = respuesta.headers.get("ETag") or respuesta.headers.get("Last-Modified")
+            except urllib.error.HTTPError as e:
+                logger.warning(f"HEAD no disponible para {url} ({e.code}); se descargará sin verificación previa.")
+
+            remotos.append(ArchivoRemoto(nombre=nombre, referencia=url, tamano=tamano, version=version))
+
+        return remotos
+
+    def descargar(self, archivo: ArchivoRemoto, destino: Path) -> None:
+        parcial = ruta_parcial(destino)
+        inicio = parcial.stat().st_size if parcial.exists() else 0
+
+        if archivo.tamano is not None and inicio > archivo.tamano:
+            parcial.unlink()
+            inicio = 0
+
+        peticion = urllib.request.Request(archivo.referencia)
+        if inicio:
+            peticion.add_header("Range", f"bytes={inicio}-")
+            logger.debug(f"Reanudando '{archivo.nombre}' desde el byte {inicio:,}")
+
+        try:
+            with urllib.request.urlopen(peticion, timeout=self.timeout) as respuesta:
+                # 206: el servidor respetó el rango; 200: envía el archivo completo
+                modo = "ab" if inicio and respuesta.status == 206 else "wb"
+                with open(parcial, modo) as f:
+                    shutil.copyfileobj(respuesta, f, TAMANO_BLOQUE)
+        except urllib.error.HTTPError as e:
+            # 416: el archivo parcial ya estaba completo
+            if e.code != 416:
+                raise
+
+        if archivo.tamano is not None and parcial.stat().st_size != archivo.tamano:
+            raise RuntimeError(
+                f"Descarga incompleta de '{archivo.nombre}': {parcial.stat().st_size:,} de {archivo.tamano:,} bytes."
+            )
+
+        parcial.replace(destino)
+
+
+class FuenteDirectorioLocal(FuenteDatos):
+    """Copia los archivos desde una carpeta local o montada (espejo del dataset)."""
+
+    nombre = "local"
+
+    def __init__(self, carpeta: str, patron: str = "*.csv"):
+        self.carpeta = Path(carpeta)
+        self.patron = patron
+
+    def listar(self) -> List[ArchivoRemoto]:
+        if not self.carpeta.is_dir():
+            raise ValueError(f"La carpeta de origen {self.carpeta} no es una carpeta válida.")
+
+        logger.info(f"Consultando carpeta local: {self.carpeta} | patrón = {self.patron}")
+
+        return [
+            ArchivoRemoto(
+                nombre=str(ruta.relative_to(self.carpeta)),
+                referencia=str(ruta),
+                tamano=ruta.stat().st_size,
+                version=str(ruta.stat().st_mtime_ns),
+            )
+            for ruta in sorted(self.carpeta.rglob(self.patron)) if ruta.is_file()
+        ]
+
+    def descargar(self, archivo: ArchivoRemoto, destino: Path) -> None:
+        parcial = ruta_parcial(destino)
+        shutil.copyfile(archivo.referencia, parcial)
+        parcial.replace(destino)
+
+
+def crear_fuente(configuracion: dict) -> FuenteDatos:
+    """Construye la fuente de datos indicada en la sección 'download' de la configuración."""
+
+    tipo = configuracion.get("fuente", "google_drive")
+
+    if tipo == FuenteGoogleDrive.nombre:
+        return FuenteGoogleDrive(configuracion["dataset_id"], configuracion["cookies"])
+
+    if tipo == FuenteHTTP.nombre:
+        http = configuracion.get("http", {})
+        return FuenteHTTP(http["url_base"], http.get("archivos") or [], http.get("timeout", 60))
+
+    if tipo == FuenteDirectorioLocal.nombre:
+        local = configuracion.get("local", {})
+        return FuenteDirectorioLocal(local["carpeta"], local.get("patron", "*.csv"))
+
+    raise ValueError(f"Fuente de descarga no soportada: '{tipo}'")
@@ -0,0 +1,590 @@
+# src/datos/perfilado.py
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.utils.acumuladores import CorrelacionIncremental, HistogramaAdaptativo
+from src.utils.bocetos import BocetoCuantiles, FrecuentesMisraGries, HyperLogLog, Momentos
+
+# Cuantiles reportados por describe()
+CUANTILES = (0.25, 0.50, 0.75)
+
+
+@dataclass
+class PerfilColumna:
+    """
+    Estadísticos de una columna obtenidos en una sola pasada.
+
+    - clase: 'numerica', 'categorica' u 'otra' (mismo criterio que select_dtypes del reporte).
+    - estadisticas: conteo, media, desviación, mínimo, cuantiles y máximo (solo numéricas).
+    - frecuencias: conteo de valores no nulos, de mayor a menor (solo categóricas); se
+      comparte entre el resumen categórico, las tablas de frecuencias y las gráficas de barras.
+    - aproximado: los cuantiles, distintos y frecuencias provienen de bocetos; en ese caso
+      'frecuencias' contiene solo los valores más frecuentes.
+    """
+    nombre: str
+    tipo: str
+    clase: str
+    registros: int
+    nulos: int
+    unicos: int
+    estadisticas: Optional[Dict[str, float]] = None
+    frecuencias: Optional[pd.Series] = None
+    aproximado: bool = False
+
+    def moda(self):
+        """Valor más frecuente; ante empates, el menor (mismo criterio que Series.mode)."""
+        if self.frecuencias is None or self.frecuencias.empty:
+            return None
+
+        empatados = self.frecuencias.index[self.frecuencias == self.frecuencias.iloc[0]]
+        try:
+            return empatados.sort_values()[0]
+        except TypeError:
+            return empatados[0]
+
+    def frecuencias_con_nulos(self, etiqueta: str = "N/A") -> pd.Series:
+        """Frecuencias incluyendo los nulos bajo 'etiqueta', ordenadas de mayor a menor."""
+        frecuencias = self.frecuencias.copy()
+        frecuencias.index = frecuencias.index.astype(object)
+
+        if self.nulos:
+            frecuencias = pd.concat([frecuencias, pd.Series([self.nulos], index=[etiqueta])])
+            # Si 'etiqueta' ya existía como valor, los nulos se suman a él
+            if frecuencias.index.has_duplicates:
+                frecuencias = frecuencias.groupby(level=0, sort=False).sum()
+
+        return frecuencias.sort_values(ascending=False, kind="stable")
+
+
+@dataclass
+class PerfilDatos:
+    """Perfil de un DataFrame: una entrada por columna, en el orden original."""
+    filas: int
+    columnas: Dict[str, PerfilColumna] = field(default_factory=dict)
+
+    def de_clase(self, clase: str) -> List[PerfilColumna]:
+        return [perfil for perfil in self.columnas.values() if perfil.clase == clase]
+
+    @property
+    def numericas(self) -> List[str]:
+        return [perfil.nombre for perfil in self.de_clase("numerica")]
+
+    @property
+    def categoricas(self) -> List[str]:
+        return [perfil.nombre for perfil in self.de_clase("categorica")]
+
+
+class PerfiladorDatos:
+    """
+    Calcula en una sola pasada por columna los estadísticos que usa el reporte EDA.
+
+    - Numéricas: un ordenamiento de los valores no nulos da mínimo, máximo, cuantiles y
+      número de valores distintos; media y desviación se obtienen del mismo arreglo.
+    - Categóricas: un único conteo de valores da nulos, distintos, moda y frecuencias.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+    @staticmethod
+    def clase(serie: pd.Series) -> str:
+        tipo = serie.dtype
+        if pd.api.types.is_numeric_dtype(tipo) and not pd.api.types.is_bool_dtype(tipo):
+            return "numerica"
+        if isinstance(tipo, pd.CategoricalDtype) or pd.api.types.is_object_dtype(tipo):
+            return "categorica"
+        return "otra"
+
+    @staticmethod
+    def _perfil_numerico(nombre: str, serie: pd.Series) -> PerfilColumna:
+        valores = serie.to_numpy(dtype="float64", na_value=np.nan)
+        ordenados = np.sort(valores[~np.isnan(valores)])
+        n = ordenados.size
+
+        estadisticas = dict.fromkeys(["count", "mean", "std", "min", "25%", "50%", "75%", "max"], np.nan)
+        estadisticas["count"] = float(n)
+        unicos = 0
+
+        if n:
+            # Interpolación lineal entre posiciones, igual que Series.quantile
+            posiciones = np.array(CUANTILES) * (n - 1)
+            inferior = np.floor(posiciones).astype(int)
+            superior = np.minimum(inferior + 1, n - 1)
+            peso = posiciones - inferior
+            cuantiles = ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * peso
+
+            estadisticas.update({
+                "mean": float(ordenados.mean()),
+                "std": float(ordenados.std(ddof=1)) if n > 1 else np.nan,
+                "min": float(ordenados[0]),
+                "25%": float(cuantiles[0]),
+                "50%": float(cuantiles[1]),
+                "75%": float(cuantiles[2]),
+                "max": float(ordenados[-1]),
+            })
+            unicos = int(np.count_nonzero(np.diff(ordenados))) + 1
+
+        return PerfilColumna(
+            nombre=nombre,
+            tipo=str(serie.dtype),
+            clase="numerica",
+            registros=len(serie),
+            nulos=len(serie) - n,
+            unicos=unicos,
+            estadisticas=estadisticas,
+        )
+
+    @staticmethod
+    def _perfil_categorico(nombre: str, serie: pd.Series) -> PerfilColumna:
+        conteos = serie.value_counts(dropna=False, sort=False)
+
+        es_nulo = conteos.index.isna()
+        nulos = int(conteos[es_nulo].sum())
+        # Las categorías sin registros no forman parte de las frecuencias
+        frecuencias = conteos[~es_nulo]
+        frecuencias = frecuencias[frecuencias > 0].sort_values(ascending=False, kind="stable")
+
+        return PerfilColumna(
+            nombre=nombre,
+            tipo=str(serie.dtype),
+            clase="categorica",
+            registros=len(serie),
+            nulos=nulos,
+            unicos=len(frecuencias),
+            frecuencias=frecuencias,
+        )
+
+    def run(self) -> PerfilDatos:
+
+        perfil = PerfilDatos(filas=len(self.df))
+
+        for nombre, serie in self.df.items():
+            clase = self.clase(serie)
+
+            if clase == "numerica":
+                perfil.columnas[nombre] = self._perfil_numerico(nombre, serie)
+            elif clase == "categorica":
+                perfil.columnas[nombre] = self._perfil_categorico(nombre, serie)
+            else:
+                perfil.columnas[nombre] = PerfilColumna(
+                    nombre=nombre,
+                    tipo=str(serie.dtype),
+                    clase="otra",
+                    registros=len(serie),
+                    nulos=int(serie.isna().sum()),
+                    unicos=int(serie.nunique(dropna=True)),
+                )
+
+        logger.debug(
+            f"Perfil generado | filas = {perfil.filas:,} | numéricas = {len(perfil.numericas)} | "
+            f"categóricas = {len(perfil.categoricas)} | columnas = {len(perfil.columnas)}"
+        )
+        return perfil
+
+
+@dataclass
+class _AcumuladorColumna:
+    """Resúmenes combinables de una columna para el perfil aproximado."""
+    clase: str
+    tipo: str
+    registros: int = 0
+    nulos: int = 0
+    distintos: Optional[HyperLogLog] = None
+    momentos: Optional[Momentos] = None
+    cuantiles: Optional[BocetoCuantiles] = None
+    frecuentes: Optional[FrecuentesMisraGries] = None
+    conteos: Optional[pd.Series] = None
+    invalidos: int = 0
+
+
+def _notas_bocetos(k_cuantiles: int, precision_hll: int, k_frecuentes: int,
+                   error_frecuencias: int, filas: int) -> List[str]:
+    """Líneas de las notas del reporte con los métodos aproximados y sus cotas de error."""
+    return [
+        f"- Cuantiles (p25, p50, p75): boceto KLL con k={k_cuantiles}; "
+        f"error de rango ≈ ±{BocetoCuantiles.error_rango(k_cuantiles) * 100:.2f}% (99% de confianza).",
+        f"- Valores únicos: HyperLogLog con precisión {precision_hll}; "
+        f"error estándar ≈ {HyperLogLog.error_estandar(precision_hll) * 100:.2f}%.",
+        f"- Frecuencias de variables categóricas: Misra-Gries con {k_frecuentes} contadores; "
+        f"cada frecuencia puede subestimarse hasta en {error_frecuencias:,} registros "
+        f"(cota n/(k+1) = {filas // (k_frecuentes + 1):,}). Solo se reportan los valores más frecuentes.",
+    ]
+
+
+class PerfiladorAproximado:
+    """
+    Perfil aproximado con memoria acotada, calculado bloque por bloque.
+
+    - Nulos, conteo, media, desviación, mínimo y máximo: exactos (momentos combinables).
+    - Cuantiles: boceto tipo KLL con parámetro k.
+    - Valores distintos: HyperLogLog con 2^precision registros.
+    - Frecuencias: valores más frecuentes con Misra-Gries (k contadores).
+
+    Cada bloque se integra con actualiza(); dos perfiladores con los mismos parámetros
+    se combinan con combina().
+    """
+
+    def __init__(self,
+                 k_cuantiles: int = 200,
+                 precision_hll: int = 14,
+                 k_frecuentes: int = 100,
+                 semilla: int = 0):
+        self.k_cuantiles = int(k_cuantiles)
+        self.precision_hll = int(precision_hll)
+        self.k_frecuentes = int(k_frecuentes)
+        self.semilla = semilla
+        self.filas = 0
+        self.columnas: Dict[str, _AcumuladorColumna] = {}
+
+    def _nuevo_acumulador(self, serie: pd.Series) -> _AcumuladorColumna:
+        clase = PerfiladorDatos.clase(serie)
+        acumulador = _AcumuladorColumna(clase=clase, tipo=str(serie.dtype),
+                                        distintos=HyperLogLog(self.precision_hll))
+        if clase == "numerica":
+            acumulador.momentos = Momentos()
+            acumulador.cuantiles = BocetoCuantiles(self.k_cuantiles, self.semilla)
+        elif clase == "categorica":
+            acumulador.frecuentes = FrecuentesMisraGries(self.k_frecuentes)
+        return acumulador
+
+    def actualiza(self, bloque: pd.DataFrame) -> None:
+        self.filas += len(bloque)
+
+        for nombre, serie in bloque.items():
+            acumulador = self.columnas.get(nombre)
+            if acumulador is None:
+                acumulador = self.columnas[nombre] = self._nuevo_acumulador(serie)
+
+            acumulador.registros += len(serie)
+            acumulador.nulos += int(serie.isna().sum())
+            acumulador.distintos.actualiza(serie)
+
+            if acumulador.clase == "numerica":
+                valores = serie.to_numpy(dtype="float64", na_value=np.nan)
+                valores = valores[~np.isnan(valores)]
+                acumulador.momentos.actualiza(valores)
+                acumulador.cuantiles.actualiza(valores)
+            elif acumulador.clase == "categorica":
+                acumulador.frecuentes.actualiza(serie)
+
+    def combina(self, otro: "PerfiladorAproximado") -> None:
+        self.filas += otro.filas
+
+        for nombre, ajeno in otro.columnas.items():
+            propio = self.columnas.get(nombre)
+            if propio is None:
+                self.columnas[nombre] = ajeno
+                continue
+
+            propio.registros += ajeno.registros
+            propio.nulos += ajeno.nulos
+            propio.distintos.combina(ajeno.distintos)
+            if propio.momentos is not None and ajeno.momentos is not None:
+                propio.momentos.combina(ajeno.momentos)
+                propio.cuantiles.combina(ajeno.cuantiles)
+            if propio.frecuentes is not None and ajeno.frecuentes is not None:
+                propio.frecuentes.combina(ajeno.frecuentes)
+
+    def run(self, df: pd.DataFrame, tamano_bloque: int = 500_000) -> PerfilDatos:
+        """Perfil aproximado de un DataFrame en memoria, procesado en bloques de filas."""
+        for inicio in range(0, len(df), max(1, int(tamano_bloque))):
+            self.actualiza(df.iloc[inicio:inicio + tamano_bloque])
+        return self.resultado()
+
+    @staticmethod
+    def _columna_aproximada(nombre: str, acumulador: _AcumuladorColumna) -> PerfilColumna:
+        columna = PerfilColumna(
+            nombre=nombre,
+            tipo=acumulador.tipo,
+            clase=acumulador.clase,
+            registros=acumulador.registros,
+            nulos=acumulador.nulos,
+            unicos=acumulador.distintos.estimacion(),
+            aproximado=True,
+        )
+
+        if acumulador.clase == "numerica":
+            momentos = acumulador.momentos
+            q1, q2, q3 = acumulador.cuantiles.cuantiles(CUANTILES)
+            columna.estadisticas = {
+                "count": float(momentos.n),
+                "mean": momentos.media if momentos.n else np.nan,
+                "std": momentos.desviacion,
+                "min": momentos.minimo if momentos.n else np.nan,
+                "25%": float(q1),
+                "50%": float(q2),
+                "75%": float(q3),
+                "max": momentos.maximo if momentos.n else np.nan,
+            }
+            # Los distintos no pueden exceder los valores no nulos
+            columna.unicos = min(columna.unicos, momentos.n)
+
+        elif acumulador.clase == "categorica":
+            columna.frecuencias = acumulador.frecuentes.frecuencias()
+            columna.unicos = max(columna.unicos, len(columna.frecuencias))
+
+        return columna
+
+    def resultado(self) -> PerfilDatos:
+
+        perfil = PerfilDatos(filas=self.filas)
+
+        for nombre, acumulador in self.columnas.items():
+            perfil.columnas[nombre] = self._columna_aproximada(nombre, acumulador)
+
+        return perfil
+
+    def notas(self) -> str:
+        """Descripción de los métodos aproximados y sus cotas de error para el reporte."""
+
+        error_frecuencias = max(
+            (a.frecuentes.error_maximo for a in self.columnas.values() if a.frecuentes is not None), default=0
+        )
+
+        return "<br/>".join([
+            "Estadísticas calculadas en modo aproximado:",
+            *_notas_bocetos(self.k_cuantiles, self.precision_hll, self.k_frecuentes, error_frecuencias, self.filas),
+            "- Conteos, nulos, media, desviación, mínimo y máximo son exactos.",
+        ])
+
+
+class PerfiladorIncremental:
+    """
+    Perfil calculado bloque por bloque, sin mantener el DataFrame completo en memoria.
+
+    - Nulos, conteo, media, desviación, mínimo y máximo: momentos combinables (exactos).
+    - Valores distintos, cuantiles y frecuencias: conteo exacto por valor mientras la
+      columna tenga a lo más 'max_distintos' valores distintos. Al excederse, la columna
+      continúa con los bocetos del perfil aproximado (KLL, HyperLogLog, Misra-Gries) y se
+      marca como aproximada; con max_distintos = 0 todas las columnas usan bocetos.
+    - Gráficas: un histograma adaptativo por columna numérica y las sumas de la matriz de
+      correlación entre las columnas numéricas del primer bloque.
+    """
+
+    def __init__(self,
+                 max_distintos: int = 100_000,
+                 bins_histograma: int = 1000,
+                 k_cuantiles: int = 200,
+                 precision_hll: int = 14,
+                 k_frecuentes: int = 100,
+                 semilla: int = 0):
+        self.max_distintos = int(max_distintos)
+        self.bins_histograma = int(bins_histograma)
+        self.k_cuantiles = int(k_cuantiles)
+        self.precision_hll = int(precision_hll)
+        self.k_frecuentes = int(k_frecuentes)
+        self.semilla = semilla
+        self.filas = 0
+        self.bloques = 0
+        self.columnas: Dict[str, _AcumuladorColumna] = {}
+        self.histogramas: Dict[str, HistogramaAdaptativo] = {}
+        self.correlacion: Optional[CorrelacionIncremental] = None
+
+    @staticmethod
+    def _tipo_comun(actual: str, tipo) -> str:
+        """Tipo que representa a todos los bloques (p. ej. int64 y float64 -> float64)."""
+        if actual == str(tipo):
+            return actual
+        try:
+            return str(np.result_type(np.dtype(actual), tipo))
+        except TypeError:
+            return "object"
+
+    def _nuevo_acumulador(self, nombre: str, serie: pd.Series) -> _AcumuladorColumna:
+        clase = PerfiladorDatos.clase(serie)
+        acumulador = _AcumuladorColumna(clase=clase, tipo=str(serie.dtype), conteos=pd.Series(dtype="int64"))
+        if clase == "numerica":
+            acumulador.momentos = Momentos()
+            self.histogramas[nombre] = HistogramaAdaptativo(self.bins_histograma)
+        return acumulador
+
+    def _cambia_a_bocetos(self, nombre: str, acumulador: _AcumuladorColumna) -> None:
+        """Traslada el conteo exacto de la columna a los bocetos y libera la tabla."""
+        conteos, acumulador.conteos = acumulador.conteos, None
+        acumulador.distintos = HyperLogLog(self.precision_hll)
+
+        if acumulador.clase == "numerica":
+            valores = conteos.index.to_numpy(dtype="float64")
+            acumulador.distintos.actualiza(pd.Series(valores))
+            acumulador.cuantiles = BocetoCuantiles(self.k_cuantiles, self.semilla)
+            acumulador.cuantiles.actualiza(np.repeat(valores, conteos.to_numpy()))
+        else:
+            acumulador.distintos.actualiza(pd.Series(conteos.index, dtype=object))
+            if acumulador.clase == "categorica":
+                acumulador.frecuentes = FrecuentesMisraGries(self.k_frecuentes)
+                acumulador.frecuentes.agrega_conteos(conteos)
+
+        logger.info(f"Columna '{nombre}': más de {self.max_distintos:,} valores distintos; continúa con bocetos aproximados")
+
+    def _cuenta(self, nombre: str, acumulador: _AcumuladorColumna, conteos: pd.Series) -> None:
+        conteos = conteos[conteos > 0]
+        if acumulador.clase != "numerica":
+            conteos.index = conteos.index.astype(object)
+
+        if acumulador.conteos.empty:
+            acumulador.conteos = conteos.astype("int64")
+        else:
+            acumulador.conteos = acumulador.conteos.add(conteos, fill_value=0).astype("int64")
+
+        if len(acumulador.conteos) > self.max_distintos:
+            self._cambia_a_bocetos(nombre, acumulador)
+
+    def actualiza(self, bloque: pd.DataFrame) -> None:
+        self.filas += len(bloque)
+        self.bloques += 1
+
+        for nombre, serie in bloque.items():
+            acumulador = self.columnas.get(nombre)
+            if acumulador is None:
+                acumulador = self.columnas[nombre] = self._nuevo_acumulador(nombre, serie)
+
+            acumulador.tipo = self._tipo_comun(acumulador.tipo, serie.dtype)
+            acumulador.registros += len(serie)
+            acumulador.nulos += int(serie.isna().sum())
+
+            if acumulador.clase == "numerica":
+                if PerfiladorDatos.clase(serie) != "numerica":
+                    # La clase se fija con el primer bloque; los valores no numéricos se cuentan como nulos
+                    convertida = pd.to_numeric(serie, errors="coerce")
+                    invalidos = int((serie.notna() & convertida.isna()).sum())
+                    if invalidos:
+                        acumulador.nulos += invalidos
+                        acumulador.invalidos += invalidos
+                        logger.warning(f"Columna '{nombre}': {invalidos:,} valor(es) no numérico(s) en el bloque "
+                                       f"{self.bloques:,}; se cuentan como nulos")
+                    serie = convertida
+                valores = serie.to_numpy(dtype="float64", na_value=np.nan)
+                valores = valores[~np.isnan(valores)]
+                acumulador.momentos.actualiza(valores)
+                self.histogramas[nombre].actualiza(valores)
+
+                if acumulador.conteos is not None:
+                    self._cuenta(nombre, acumulador, pd.Series(valores).value_counts(sort=False))
+                else:
+                    acumulador.distintos.actualiza(pd.Series(valores))
+                    acumulador.cuantiles.actualiza(valores)
+
+            elif acumulador.conteos is not None:
+                self._cuenta(nombre, acumulador, serie.value_counts(dropna=True, sort=False))
+
+            else:
+                acumulador.distintos.actualiza(serie)
+                if acumulador.frecuentes is not None:
+                    acumulador.frecuentes.actualiza(serie)
+
+        if self.correlacion is None:
+            numericas = [nombre for nombre, a in self.columnas.items() if a.clase == "numerica"]
+            self.correlacion = CorrelacionIncremental(numericas)
+        self.correlacion.actualiza(bloque)
+
+    @staticmethod
+    def _columna_exacta(nombre: str, acumulador: _AcumuladorColumna) -> PerfilColumna:
+        conteos = acumulador.conteos
+        columna = PerfilColumna(
+            nombre=nombre,
+            tipo=acumulador.tipo,
+            clase=acumulador.clase,
+            registros=acumulador.registros,
+            nulos=acumulador.nulos,
+            unicos=len(conteos),
+        )
+
+        if acumulador.clase == "numerica":
+            momentos = acumulador.momentos
+            estadisticas = dict.fromkeys(["count", "mean", "std", "min", "25%", "50%", "75%", "max"], np.nan)
+            estadisticas["count"] = float(momentos.n)
+
+            if momentos.n:
+                ordenados = conteos.sort_index()
+                valores = ordenados.index.to_numpy(dtype="float64")
+                acumulado = np.cumsum(ordenados.to_numpy())
+
+                # Misma interpolación lineal que PerfiladorDatos; el valor en la posición r
+                # del arreglo ordenado se obtiene del conteo acumulado
+                posiciones = np.array(CUANTILES) * (momentos.n - 1)
+                inferior = np.floor(posiciones)
+                superior = np.minimum(inferior + 1, momentos.n - 1)
+                peso = posiciones - inferior
+                bajo = valores[np.searchsorted(acumulado, inferior, side="right")]
+                alto = valores[np.searchsorted(acumulado, superior, side="right")]
+                cuantiles = bajo + (alto - bajo) * peso
+
+                estadisticas.update({
+                    "mean": momentos.media,
+                    "std": momentos.desviacion,
+                    "min": float(valores[0]),
+                    "25%": float(cuantiles[0]),
+                    "50%": float(cuantiles[1]),
+                    "75%": float(cuantiles[2]),
+                    "max": float(valores[-1]),
+                })
+            columna.estadisticas = estadisticas
+
+        elif acumulador.clase == "categorica":
+            columna.frecuencias = conteos.sort_values(ascending=False, kind="stable")
+
+        return columna
+
+    def resultado(self) -> PerfilDatos:
+
+        perfil = PerfilDatos(filas=self.filas)
+
+        for nombre, acumulador in self.columnas.items():
+            if acumulador.conteos is None:
+                perfil.columnas[nombre] = PerfiladorAproximado._columna_aproximada(nombre, acumulador)
+            else:
+                perfil.columnas[nombre] = self._columna_exacta(nombre, acumulador)
+
+        logger.debug(
+            f"Perfil por bloques generado | filas = {perfil.filas:,} | bloques = {self.bloques:,} | "
+            f"columnas aproximadas = {sum(c.aproximado for c in perfil.columnas.values())} de {len(perfil.columnas)}"
+        )
+        return perfil
+
+    def histograma(self, nombre: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Bordes y conteos de los bins finos de una columna numérica, entre su mínimo y máximo."""
+        momentos = self.columnas[nombre].momentos
+        return self.histogramas[nombre].recorte(momentos.minimo, momentos.maximo)
+
+    def matriz_correlacion(self) -> pd.DataFrame:
+        if self.correlacion is None:
+            return pd.DataFrame()
+        return self.correlacion.resultado()
+
+    def notas(self) -> str:
+        """Descripción del cálculo por bloques para el reporte, con las cotas de las columnas aproximadas."""
+
+        lineas = [
+            f"Estadísticas calculadas por bloques ({self.bloques:,} bloque(s), sin cargar el archivo completo):",
+            "- Conteos, nulos, media, desviación, mínimo y máximo son exactos; los histogramas usan "
+            f"{self.bins_histograma:,} bins finos con rango adaptativo y la matriz de correlación se obtiene de sumas acumuladas.",
+        ]
+
+        no_finitos = {nombre: h.no_finitos for nombre, h in self.histogramas.items() if h.no_finitos}
+        if no_finitos:
+            lineas.append("- Valores infinitos excluidos de los histogramas: "
+                          f"{', '.join(f'{nombre} ({n:,})' for nombre, n in no_finitos.items())}.")
+
+        invalidos = {nombre: a.invalidos for nombre, a in self.columnas.items() if a.invalidos}
+        if invalidos:
+            lineas.append("- Valores no numéricos en columnas numéricas, contados como nulos: "
+                          f"{', '.join(f'{nombre} ({n:,})' for nombre, n in invalidos.items())}.")
+
+        aproximadas = [nombre for nombre, a in self.columnas.items() if a.conteos is None]
+        if not aproximadas:
+            lineas.append("- Valores únicos, cuantiles y frecuencias son exactos.")
+            return "<br/>".join(lineas)
+
+        error_frecuencias = max(
+            (a.frecuentes.error_maximo for a in self.columnas.values() if a.frecuentes is not None), default=0
+        )
+        lineas.append(
+            f"- Columnas con más de {self.max_distintos:,} valores distintos (valores únicos, cuantiles y "
+            f"frecuencias aproximados): {', '.join(aproximadas)}."
+        )
+        lineas.extend(_notas_bocetos(self.k_cuantiles, self.precision_hll, self.k_frecuentes, error_frecuencias, self.filas))
+        return "<br/>".join(lineas)
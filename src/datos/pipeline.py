@@ -0,0 +1,174 @@
+# src/datos/pipeline.py
+from dataclasses import dataclass, field
+from datetime import datetime
+from graphlib import CycleError, TopologicalSorter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+from src.configuraciones.config_params import conf
+from src.utils import almacenamiento
+from src.utils.cache_etapas import CacheEtapas
+from src.utils.esquema import memoria_mb
+
+
+@dataclass
+class Etapa:
+    """
+    Nodo del flujo de preparación.
+
+    - funcion: recibe como argumentos con nombre los resultados de sus dependencias.
+    - salida: ruta (declarada en 'data') donde se persiste el resultado, si aplica.
+    - config: sección de configuración que forma parte de la huella de la etapa.
+    - archivos: archivos de entrada cuyo contenido forma parte de la huella.
+    - artefactos: archivos generados que deben existir para considerar vigente la etapa.
+    - al_persistir: se llama después de persistir 'salida' con el resultado y las entradas de
+      la etapa (p. ej. para guardar metadatos que deben corresponder al archivo persistido).
+    """
+    nombre: str
+    funcion: Callable[..., Optional[pd.DataFrame]]
+    dependencias: List[str] = field(default_factory=list)
+    salida: Optional[str] = None
+    config: Any = None
+    archivos: List[str] = field(default_factory=list)
+    artefactos: List[str] = field(default_factory=list)
+    al_persistir: Optional[Callable[..., None]] = None
+
+
+class PipelineRunner:
+    """Ejecuta las etapas como un DAG en un solo proceso, pasando los DataFrames en memoria."""
+
+    def __init__(self,
+                 etapas: List[Etapa],
+                 persistir: Optional[Dict[str, bool]] = None,
+                 cache: Optional[CacheEtapas] = None,
+                 forzar: Iterable[str] = ()):
+        self.etapas = {etapa.nombre: etapa for etapa in etapas}
+        self.persistir = persistir or {}
+        self.cache = cache
+        self.forzar = set(forzar)
+        self.resultados: Dict[str, Optional[pd.DataFrame]] = {}
+        self.huellas: Dict[str, str] = {}
+        self.omitidas: set = set()
+
+    def _orden(self) -> List[str]:
+        """Obtiene el orden topológico de las etapas."""
+
+        grafo = {nombre: set(etapa.dependencias) for nombre, etapa in self.etapas.items()}
+
+        faltantes = {dep for deps in grafo.values() for dep in deps} - set(grafo)
+        if faltantes:
+            raise ValueError(f"Dependencias no declaradas en el pipeline: {sorted(faltantes)}")
+
+        try:
+            return list(TopologicalSorter(grafo).static_order())
+        except CycleError as e:
+            raise ValueError(f"El pipeline contiene un ciclo: {e.args[1]}") from e
+
+    def _calcula_huellas(self, orden: List[str]) -> None:
+        """La huella de cada etapa encadena las de sus dependencias, archivos y configuración."""
+
+        for nombre in orden:
+            etapa = self.etapas[nombre]
+            entradas = [self.huellas[dep] for dep in etapa.dependencias]
+            entradas += [self.cache.huella_archivo(archivo) for archivo in etapa.archivos]
+            self.huellas[nombre] = CacheEtapas.huella(nombre, entradas, etapa.config)
+            logger.debug(f"Huella de la etapa '{nombre}': {self.huellas[nombre][:12]}")
+
+    def _resultado(self, nombre: str) -> Optional[pd.DataFrame]:
+        """Devuelve el resultado de una etapa; si fue omitida se lee de la caché bajo demanda."""
+
+        if nombre not in self.resultados and nombre in self.omitidas:
+            self.resultados[nombre] = self.cache.cargar(nombre)
+
+        return self.resultados.get(nombre)
+
+    @staticmethod
+    def _memoria(df: pd.DataFrame) -> str:
+        if not (conf.get("esquema", {}) or {}).get("reporte_memoria", False):
+            return ""
+        return f" | memoria = {memoria_mb(df):,.2f} MB"
+
+    def _vigente(self, etapa: Etapa) -> bool:
+        if self.cache is None or etapa.nombre in self.forzar:
+            return False
+        return self.cache.vigente(etapa.nombre, self.huellas[etapa.nombre], etapa.artefactos)
+
+    def _guardar(self, etapa: Etapa, df: pd.DataFrame) -> None:
+        if etapa.salida and self.persistir.get(etapa.nombre, False):
+            ruta = almacenamiento.guardar_dataframe(df, etapa.salida)
+            logger.info(f"Etapa '{etapa.nombre}' persistida en: {ruta}")
+
+            if etapa.al_persistir is not None:
+                etapa.al_persistir(df, **{dep: self._resultado(dep) for dep in etapa.dependencias})
+
+            if self.cache is not None:
+                self.cache.registra_persistido(etapa.nombre, ruta)
+        else:
+            logger.debug(f"Etapa '{etapa.nombre}' se mantiene solo en memoria.")
+
+    def _sincroniza_persistido(self, etapa: Etapa) -> None:
+        """Restaura la copia persistida de una etapa omitida si falta o fue modificada."""
+
+        if not etapa.salida or not self.persistir.get(etapa.nombre, False):
+            return
+
+        if self.cache.persistido_vigente(etapa.nombre, etapa.salida):
+            return
+
+        df = self._resultado(etapa.nombre)
+        if isinstance(df, pd.DataFrame):
+            logger.info(f"Restaurando archivo de la etapa '{etapa.nombre}' desde la caché.")
+            self._guardar(etapa, df)
+
+    def run(self) -> Dict[str, Optional[pd.DataFrame]]:
+
+        orden = self._orden()
+        logger.info(f"Orden de ejecución del pipeline: {' -> '.join(orden)}")
+
+        if self.cache is not None:
+            self._calcula_huellas(orden)
+
+        for nombre in orden:
+            etapa = self.etapas[nombre]
+
+            if self._vigente(etapa):
+                logger.info(f"Etapa '{nombre}' sin cambios (huella {self.huellas[nombre][:12]}); se omite.")
+                self.omitidas.add(nombre)
+                self._sincroniza_persistido(etapa)
+                continue
+
+            entradas = {dep: self._resultado(dep) for dep in etapa.dependencias}
+
+            if any(df is None for df in entradas.values()):
+                logger.warning(f"Etapa '{nombre}' omitida: una de sus dependencias no generó resultado.")
+                self.resultados[nombre] = None
+                continue
+
+            inicio = datetime.now()
+            logger.info(f"Ejecutando etapa '{nombre}'...")
+            resultado = etapa.funcion(**entradas)
+            duracion = (datetime.now() - inicio).total_seconds()
+
+            self.resultados[nombre] = resultado
+
+            if isinstance(resultado, pd.DataFrame):
+                logger.success(
+                    f"Etapa '{nombre}' completada en {duracion:.2f} s | registros = {len(resultado):,}"
+                    f"{self._memoria(resultado)}"
+                )
+            else:
+                logger.success(f"Etapa '{nombre}' completada en {duracion:.2f} s")
+
+            # Las etapas de datos sin resultado no se registran para reintentarlas en la siguiente ejecución
+            if self.cache is not None and (resultado is not None or etapa.salida is None):
+                self.cache.guardar(nombre, self.huellas[nombre], resultado)
+
+            if isinstance(resultado, pd.DataFrame):
+                self._guardar(etapa, resultado)
+
+        if self.cache is not None:
+            self.cache.depura(orden)
+
+        return self.resultados
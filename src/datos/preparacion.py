@@ -5,24 +5,38 @@ import pandas as pd
 from loguru import logger
 
 from src.configuraciones.config_params import conf
+from src.datos.cubo import CuboIncrementos
+from src.utils import almacenamiento
 from src.utils.datos import OperacionesDatos
 
+
+def opcion_FE(nombre: str, opciones: list | None = None):
+    """Busca una opción en la lista 'opciones_FE' de FE.yaml."""
+    for item in opciones if opciones is not None else conf.get("opciones_FE"):
+        if nombre in item:
+            return item[nombre]
+    return None
+
+
+def agrupamiento_configurado() -> str:
+    return str(opcion_FE("agrupa").get("valor", "")).strip().lower()
+
+
 class dataTransformation:
         
     def __init__(self, df: pd.DataFrame):
-            self.df = df.copy()
+            self.df = OperacionesDatos.copia_trabajo(df)
             self.df_agrupado = pd.DataFrame 
             self.opciones = conf.get("opciones_FE")
             self.regiones = conf.get("regiones")
             self.raw_data_filter = conf.get("data", {}).get("interim_stage_transformed")
+            self.ruta_cubo = conf.get("data", {}).get("processed_cube")
+            self.cubo: CuboIncrementos | None = None
             self.agrupamiento = str(self.get_opcion("agrupa").get("valor", "")).strip().lower()
 
     
     def get_opcion(self, nombre: str):
-        for item in self.opciones:
-            if nombre in item:
-                return item[nombre]
-        return None
+        return opcion_FE(nombre, self.opciones)
 
 
 
@@ -55,8 +69,8 @@ class dataTransformation:
 
         logger.info("Inicializando preparación de series temporales.")
 
-        self.df["Prev_hombres"] = self.df.groupby("Entidad")["Acumulado_hombres"].shift()
-        self.df["Prev_mujeres"] = self.df.groupby("Entidad")["Acumulado_mujeres"].shift()
+        self.df["Prev_hombres"] = self.df.groupby("Entidad", observed=True)["Acumulado_hombres"].shift()
+        self.df["Prev_mujeres"] = self.df.groupby("Entidad", observed=True)["Acumulado_mujeres"].shift()
 
         # Calcular incrementos usando el valor anterior
         self.df["Incremento_hombres"] = self.df["Acumulado_hombres"] - self.df["Prev_hombres"]
@@ -68,61 +82,111 @@ class dataTransformation:
         self.df.loc[semana_1, "Incremento_mujeres"] = self.df.loc[semana_1, "Acumulado_mujeres"]
 
         #incluye fecha para poder realizar serie de tiempo
-        self.df["Fecha"] = pd.to_datetime(
-        self.df["Anio"].astype(str) + self.df["Semana"].astype(str).str.zfill(2) + "1",
-        format="%G%V%u"
-        )
+        self.df["Fecha"] = self.fecha_semana_iso(self.df["Anio"].to_numpy(), self.df["Semana"].to_numpy())
 
-        # Ajusta el año a aquellas fechas de la semana 1 que caen en año anterior
-        filas_anio = (self.df['Semana'] == 1) & (self.df['Fecha'].dt.year < self.df['Anio'])
-        self.df.loc[filas_anio, 'Fecha'] = pd.to_datetime(self.df.loc[filas_anio, 'Anio'].astype(str) + '-01-01')
+    @staticmethod
+    def fecha_semana_iso(anios: np.ndarray, semanas: np.ndarray) -> np.ndarray:
+        """
+        Lunes de la semana ISO 'semanas' del año ISO 'anios' (equivalente a format="%G%V%u").
 
+        Las fechas de la semana 1 que caen en el año anterior se ajustan al 1 de enero del
+        año. Se calcula con aritmética de enteros sobre una tabla con el inicio de cada año
+        distinto, sin construir ni interpretar cadenas por registro.
+        """
+        anios_unicos, posicion = np.unique(np.asarray(anios, dtype=np.int64), return_inverse=True)
 
-    def _ajusta_incrementos(self):
+        # Días desde 1970-01-01 (jueves) del 1 de enero y del lunes de la semana ISO 1 de cada año
+        primero_enero = (anios_unicos - 1970).astype("datetime64[Y]").astype("datetime64[D]").astype(np.int64)
+        cuatro_enero = primero_enero + 3
+        lunes_semana_1 = cuatro_enero - (cuatro_enero + 3) % 7
 
-        columnas = ["Incremento_hombres","Incremento_mujeres"]
+        semanas = np.asarray(semanas, dtype=np.int64)
+        dias = lunes_semana_1[posicion] + 7 * (semanas - 1)
+        dias = np.where(semanas == 1, np.maximum(dias, primero_enero[posicion]), dias)
 
-        for columna in columnas:
-            logger.info(f"Iniciando ajuste de incrementos en columna '{columna}'.")
-            
-            mascara_negativos = self.df[columna] < 0
-            num_negativos = mascara_negativos.sum()
-            logger.info(f"Detectados {num_negativos} valores negativos en '{columna}'.")
+        return dias.astype("datetime64[D]").astype("datetime64[ns]")
 
-        
-            anio_prev    = self.df["Anio"].shift(1)
-            semana_prev  = self.df["Semana"].shift(1)
-            entidad_prev = self.df["Entidad"].shift(1)
-            valor_prev   = self.df[columna].shift(1)
-
-            es_consecutivo = (
-                (self.df["Anio"] == anio_prev) &
-                (self.df["Entidad"] == entidad_prev) &
-                (self.df["Semana"] == semana_prev + 1)
-            )
-        
-            mascara_actualizar = mascara_negativos & es_consecutivo
-            num_actualizar = mascara_actualizar.sum()
-            logger.info(f"{num_actualizar} registros consecutivos serán evaluados para ajuste en '{columna}'.")
 
-            suma = valor_prev + self.df[columna]
+    @staticmethod
+    def corrige_negativos(valores: np.ndarray, inicio_segmento: np.ndarray) -> np.ndarray:
+        """
+        Corrige los incrementos negativos de cada segmento de semanas consecutivas.
+
+        'valores' (registros x columnas, sin nulos) está ordenado en el tiempo e
+        'inicio_segmento' marca el primer registro de cada segmento en cada columna.
+
+        1. Si la semana previa absorbe el negativo (suma >= 0), recibe la suma y el negativo
+           queda en cero.
+        2. El déficit de los negativos restantes se arrastra a las semanas siguientes del
+           segmento con la recursión de Lindley  deuda_k = max(0, deuda_{k-1} - valor_k):
+           cada valor se reduce en la deuda que absorbe y los negativos quedan en cero. La
+           deuda que llega al final del segmento se descarta.
+
+        Sumas y mínimos acumulados por segmento resuelven la recursión en O(n), sin importar la
+        longitud de las cadenas de negativos.
+        """
+        n = valores.shape[0]
+        if n == 0:
+            return valores.copy()
+
+        x = valores.astype(np.int64)
+        inicio = inicio_segmento.copy()
+        inicio[0] = True
 
-            # --- Si la suma es positiva ---
-            condicion_positiva = mascara_actualizar & (suma >= 0)
+        # 1. Fusión con la semana previa
+        fusion = np.zeros_like(inicio)
+        fusion[1:] = (x[1:] < 0) & ~inicio[1:] & (x[:-1] + x[1:] >= 0)
+        aporte = np.zeros_like(x)
+        aporte[:-1] = np.where(fusion[1:], x[1:], 0)
+        x = np.where(fusion, 0, x + aporte)
 
-            self.df.loc[condicion_positiva.shift(-1, fill_value=False), columna] = suma[condicion_positiva].values
-            self.df.loc[condicion_positiva, columna] = 0
+        # 2. Arrastre del déficit: U_k = suma de -valor desde el inicio del segmento (U_0 = 0)
+        filas = np.arange(n)[:, None]
+        segmento = np.cumsum(inicio, axis=0)
+        primera = np.maximum.accumulate(np.where(inicio, filas, 0), axis=0)
 
-            # --- Si la suma es negativa o cero ---
-            condicion_negativa = mascara_actualizar & (suma < 0)
-            self.df.loc[condicion_negativa, columna] = 0
+        acumulado = np.cumsum(-x, axis=0)
+        base = np.take_along_axis(acumulado + x, primera, axis=0)
+        suma = acumulado - base
 
-            # --- convierte a cero los valores que no fueron afectados ---
-            restantes = (self.df[columna] < 0).sum()
-            if restantes > 0:
-                logger.info(f"Normalizando {restantes} valor(es) normalizado(s) a cero en '{columna}'.")
-            
-            self.df.loc[self.df[columna] < 0,columna] = 0
+        # Mínimo acumulado por segmento: el desplazamiento garantiza que cada segmento
+        # inicie por debajo de todos los valores de los segmentos anteriores
+        desplazamiento = 2 * int(np.abs(suma).max()) + 1
+        minimo = np.minimum.accumulate(suma - segmento * desplazamiento, axis=0) + segmento * desplazamiento
+
+        deuda = suma - np.minimum(minimo, 0)
+        deuda_previa = np.vstack([np.zeros((1, x.shape[1]), dtype=np.int64), deuda[:-1]])
+        deuda_previa[inicio] = 0
+
+        return x + deuda - deuda_previa
+
+    def _ajusta_incrementos(self):
+
+        columnas = ["Incremento_hombres","Incremento_mujeres"]
+        logger.info(f"Iniciando ajuste de incrementos en columnas {columnas}.")
+
+        # El DataFrame está ordenado por Anio, Entidad y Semana (_ajusta_semanas); un segmento es
+        # un tramo de semanas consecutivas de la misma entidad y año
+        anio = self.df["Anio"].to_numpy()
+        semana = self.df["Semana"].to_numpy()
+        entidad = self.df["Entidad"].to_numpy()
+        valores = self.df[columnas].to_numpy(dtype="float64")
+        nulos = np.isnan(valores)
+
+        consecutivo = np.zeros(len(self.df), dtype=bool)
+        consecutivo[1:] = (anio[1:] == anio[:-1]) & (entidad[1:] == entidad[:-1]) & (semana[1:] == semana[:-1] + 1)
+
+        # Un valor nulo interrumpe el segmento de su columna
+        inicio_segmento = ~consecutivo[:, None] | nulos
+        inicio_segmento[1:] |= nulos[:-1]
+
+        negativos = (valores < 0).sum(axis=0)
+        ajustados = self.corrige_negativos(np.where(nulos, 0, valores), inicio_segmento)
+        modificados = ((ajustados != valores) & ~nulos).sum(axis=0)
+
+        for i, columna in enumerate(columnas):
+            logger.info(f"'{columna}': {negativos[i]} valor(es) negativo(s) | {modificados[i]} registro(s) ajustado(s).")
+            self.df[columna] = np.where(nulos[:, i], np.nan, ajustados[:, i])
 
     def _ajusta_outliers(self,columnas: list):
 
@@ -158,49 +222,19 @@ class dataTransformation:
     def agrupar_incrementos(self):
         
         """
-        Genera agrupaciones dinámicas dependiendo de la opción seleccionada en el YAML.
+        Obtiene del cubo de incrementos la vista de la opción seleccionada en el YAML.
 
         agrupamiento puede ser:
-        - 'Sexo'
-        - 'Entidad'
-        - 'Ambos'
+        - 'Sexo': serie nacional por sexo
+        - 'region': series por entidad (con su región)
+        - 'Ambos': cubo completo (nacional, región y entidad)
         """
         logger.info(f"Aplicando agrupamiento configurado: {self.agrupamiento}")
-      
-        # =====================================
-        # AGRUPACIÓN POR SEXO
-        # =====================================
-        
-        if self.agrupamiento == "sexo":
-            
-            self.df_agrupado = (
-                self.df.groupby("Fecha")
-                .agg(
-                    incrementos_hombres=("Incremento_hombres", "sum"),
-                    incrementos_mujeres=("Incremento_mujeres", "sum")
-                )
-                .reset_index()
-                .sort_values(["Fecha"])
-            )
-            logger.info(f"Se obtuvieron {len(self.df_agrupado)} registros agrupados.")
 
-        elif self.agrupamiento == "region":
-
-            self.df_agrupado = (
-                self.df.groupby(["Fecha", "Entidad"])
-                .agg(
-                    incrementos_hombres=("Incremento_hombres", "sum"),
-                    incrementos_mujeres=("Incremento_mujeres", "sum")
-                )
-                .reset_index()
-                .sort_values(["Fecha", "Entidad"])
-            )
+        self.df_agrupado = self.cubo.agrupa(self.agrupamiento)
+        if not self.df_agrupado.empty:
             logger.info(f"Se obtuvieron {len(self.df_agrupado)} registros agrupados.")
 
-   
-        else:
-            logger.warning(f"Agrupamiento desconocido: {self.agrupamiento}. No se generará agrupación.")
-
 
     def pruebas(self):
 
@@ -217,29 +251,8 @@ class dataTransformation:
         
         elif self.agrupamiento == "region":
 
-            agrupamiento_cfg = self.get_opcion("agrupa")
-            region_objetivo = agrupamiento_cfg["region"]
-                
-            mapa_regiones = {
-                estado: r["nombre"]
-                for r in self.regiones
-                for estado in r.get("estados", [])
-            }
-
-            self.df_agrupado["Region"] = self.df_agrupado["Entidad"].map(mapa_regiones)
-                    
-            df_region_resumen = (
-                self.df_agrupado.dropna(subset=["Region"])
-                .groupby(["Fecha", "Region"])
-                .agg(
-                    incrementos_hombres=("incrementos_hombres", "sum"),
-                    incrementos_mujeres=("incrementos_mujeres", "sum")
-                )
-                .reset_index()
-                .sort_values(["Region", "Fecha"])
-            )
-
-            df_r = (df_region_resumen[df_region_resumen["Region"] == region_objetivo].sort_values("Fecha"))
+            region_objetivo = self.get_opcion("agrupa")["region"]
+            df_r = self.cubo.rebanada("region", region=region_objetivo)
 
             anio_min = df_r['Fecha'].min().year
             anio_max = df_r['Fecha'].max().year
@@ -247,6 +260,18 @@ class dataTransformation:
             plt.plot(df_r["Fecha"], df_r["incrementos_hombres"], label="Hombres", color="steelblue")
             plt.plot(df_r["Fecha"], df_r["incrementos_mujeres"], label="Mujeres", color="darkred")
             plt.title(f'Casos Semanales de {padecimiento["tipo"]} region {region_objetivo} (Evolución {anio_min}-{anio_max})')
+
+        elif self.agrupamiento == "ambos":
+
+            df_n = self.cubo.rebanada("nacional")
+
+            anio_min = df_n['Fecha'].min().year
+            anio_max = df_n['Fecha'].max().year
+
+            plt.plot(df_n["Fecha"], df_n["incrementos_hombres"], label="Hombres", color="steelblue")
+            plt.plot(df_n["Fecha"], df_n["incrementos_mujeres"], label="Mujeres", color="darkred")
+            plt.plot(df_n["Fecha"], df_n["incrementos_total"], label="Total", color="dimgrey", alpha=0.6)
+            plt.title(f'Casos Semanales de {padecimiento["tipo"]} a Nivel Nacional (Evolución {anio_min}-{anio_max})')
   
         plt.xlabel('Año')
         plt.ylabel('Número de Nuevos Casos')
@@ -255,7 +280,8 @@ class dataTransformation:
         plt.show()
 
 
-    def run(self) -> pd.DataFrame:       
+    def construye_cubo(self) -> CuboIncrementos:
+        """Prepara las series de tiempo del detalle y materializa el cubo de incrementos."""
 
         outlier_cfg = self.get_opcion("tratamiento_outliers")
 
@@ -267,9 +293,21 @@ class dataTransformation:
             logger.info(f"Imputación por IQR habilitada ({outlier_cfg['IQR']}) | Columnas: '{outlier_cfg['columnas']}'")
             self._ajusta_outliers(outlier_cfg['columnas'])
 
+        self.cubo = CuboIncrementos.desde_detalle(self.df, self.regiones, conf.get("padecimiento", {}).get("tipo"))
+        return self.cubo
+
+    def run(self, guardar: bool = True, graficar: bool = True) -> pd.DataFrame:       
+
+        self.construye_cubo()
         self.agrupar_incrementos()
 
+        if guardar and self.ruta_cubo:
+            almacenamiento.guardar_dataframe(self.cubo.cubo, self.ruta_cubo)
 
         if not self.df_agrupado.empty:
-            self.df_agrupado.to_csv(self.raw_data_filter, index=False)
-            self.pruebas()
\ No newline at end of file
+            if guardar:
+                almacenamiento.guardar_dataframe(self.df_agrupado, self.raw_data_filter)
+            if graficar:
+                self.pruebas()
+
+        return self.df_agrupado if isinstance(self.df_agrupado, pd.DataFrame) else None
@@ -0,0 +1,242 @@
+# src/modelos/backtesting.py
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.configuraciones.config_params import conf
+from src.datos.cubo import CuboIncrementos
+from src.modelos.pronostico import EntrenaPronosticos, ModeloSerie, Serie, matriz_caracteristicas
+from src.utils import almacenamiento
+
+# Opciones por omisión (sección backtesting de modelos.yaml)
+OPCIONES_BACKTESTING = {
+    "horizonte": 4,
+    "pliegues": 12,
+    "paso": 4,
+    "min_entrenamiento": 52,
+    "pliegues_por_tarea": 6,
+    "n_jobs": 1,
+    "cache_series": 64,
+    "resultados": "./reports/backtesting/resultados.csv",
+}
+
+# Matriz de características y sumas acumuladas por huella de serie, en cada proceso de trabajo
+_CACHE_CARACTERISTICAS: "OrderedDict[str, Tuple[np.ndarray, ...]]" = OrderedDict()
+
+
+class _ModeloLineal(NamedTuple):
+    """Coeficientes de una regresión lineal; es todo lo que ModeloSerie.pronostica usa del estimador."""
+    coef_: np.ndarray
+    intercept_: float
+
+
+def _caracteristicas(serie: Serie, huella: str, parametros: Dict[str, Any], capacidad: int) -> Tuple[np.ndarray, ...]:
+    """
+    Matriz de características de la serie y sus sumas acumuladas, por proceso y reutilizadas en sus pliegues.
+
+    Los conjuntos de entrenamiento de los pliegues son prefijos de la misma serie, por lo
+    que las sumas acumuladas (n, x, x·xᵀ, y, x·y) de las filas válidas dan las ecuaciones
+    normales de cualquier origen sin recorrer de nuevo las semanas. Los pliegues de una
+    serie pueden repartirse en varias tareas; las que llegan al mismo proceso toman las
+    sumas de la caché (LRU de 'capacidad' series).
+    """
+    estadisticas = _CACHE_CARACTERISTICAS.get(huella)
+    if estadisticas is not None:
+        _CACHE_CARACTERISTICAS.move_to_end(huella)
+        return estadisticas
+
+    X = matriz_caracteristicas(serie.valores, serie.fechas, parametros["lags"], parametros["ventana"],
+                               parametros["estacionalidad"])
+    validas = ~np.isnan(X).any(axis=1) & ~np.isnan(serie.valores)
+    Xv = np.where(validas[:, None], X, 0.0)
+    yv = np.where(validas, serie.valores, 0.0)
+
+    estadisticas = (
+        np.cumsum(validas),
+        np.cumsum(Xv, axis=0),
+        np.cumsum(Xv[:, :, None] * Xv[:, None, :], axis=0),
+        np.cumsum(yv),
+        np.cumsum(Xv * yv[:, None], axis=0),
+    )
+    _CACHE_CARACTERISTICAS[huella] = estadisticas
+    while len(_CACHE_CARACTERISTICAS) > capacidad:
+        _CACHE_CARACTERISTICAS.popitem(last=False)
+    return estadisticas
+
+
+def ajusta_prefijo(estadisticas: Tuple[np.ndarray, ...], origen: int, alpha: float) -> Tuple[_ModeloLineal, int]:
+    """
+    Ridge con intercepto ajustado a las semanas anteriores a 'origen' a partir de las sumas acumuladas.
+
+    Resuelve el mismo sistema que sklearn.linear_model.Ridge (datos centrados):
+    (Sxx + alpha·I) w = Sxy, con intercepto = media(y) - media(x)·w.
+    """
+    conteo, suma_x, suma_xx, suma_y, suma_xy = (e[origen - 1] for e in estadisticas)
+    n = int(conteo)
+    media_x, media_y = suma_x / n, suma_y / n
+
+    sxx = suma_xx - n * np.outer(media_x, media_x)
+    sxy = suma_xy - n * media_x * media_y
+    coeficientes = np.linalg.solve(sxx + alpha * np.eye(len(media_x)), sxy)
+    return _ModeloLineal(coeficientes, float(media_y - media_x @ coeficientes)), n
+
+
+def evalua_pliegues(parametros: Dict[str, Any],
+                    horizonte: int,
+                    capacidad: int,
+                    tarea: Tuple[Serie, str, List[int]]) -> Dict[str, Any]:
+    """
+    Punto de entrada de los procesos de trabajo: evalúa los orígenes de una serie.
+
+    Para cada origen se ajusta el modelo con las semanas anteriores y se pronostican de forma
+    recursiva las 'horizonte' semanas siguientes. Se devuelven columnas (listas) en lugar de
+    un registro por pliegue.
+    """
+    serie, huella, origenes = tarea
+    estadisticas = _caracteristicas(serie, huella, parametros, capacidad)
+    contexto = max([*parametros["lags"], parametros["ventana"], 1])
+
+    columnas: Dict[str, list] = {"origen": [], "observaciones": [], "mae": [], "rmse": [], "smape": [],
+                                 "sesgo": [], "mae_ingenuo": []}
+
+    for origen in origenes:
+        estimador, observaciones = ajusta_prefijo(estadisticas, origen, parametros["alpha"])
+
+        modelo = ModeloSerie(
+            identificador=serie.identificador, llave=serie.llave, sexo=serie.sexo, estimador=estimador,
+            parametros=parametros, historia=serie.valores[origen - contexto:origen],
+            ultima_fecha=serie.fechas[origen - 1], huella=huella, n_observaciones=observaciones,
+        )
+        prediccion = modelo.pronostica(horizonte)["prediccion"].to_numpy()
+        real = serie.valores[origen:origen + horizonte]
+        error = prediccion - real
+
+        denominador = np.abs(prediccion) + np.abs(real)
+        smape = np.divide(2 * np.abs(error), denominador, out=np.zeros_like(error), where=denominador > 0)
+
+        columnas["origen"].append(serie.fechas[origen])
+        columnas["observaciones"].append(observaciones)
+        columnas["mae"].append(float(np.abs(error).mean()))
+        columnas["rmse"].append(float(np.sqrt((error ** 2).mean())))
+        columnas["smape"].append(float(smape.mean()))
+        columnas["sesgo"].append(float(error.mean()))
+        # Referencia: repetir la última semana observada
+        columnas["mae_ingenuo"].append(float(np.abs(real - serie.valores[origen - 1]).mean()))
+
+    columnas["identificador"] = [serie.identificador] * len(origenes)
+    return columnas
+
+
+class Backtesting:
+    """
+    Evaluación con origen móvil de los modelos de pronóstico sobre las series de dataTransformation.
+
+    Para cada serie se toman hasta 'pliegues' orígenes, separados 'paso' semanas y terminando
+    'horizonte' semanas antes del final, con al menos 'min_entrenamiento' semanas de
+    entrenamiento. Las tareas (serie x grupo de 'pliegues_por_tarea' orígenes) se reparten
+    entre 'n_jobs' procesos; la matriz de características de cada serie y sus sumas
+    acumuladas se calculan una vez por proceso, y cada pliegue resuelve su ajuste con ellas
+    en lugar de reentrenar sobre todas las semanas previas. Las métricas de todos los pliegues se
+    reúnen en una sola tabla columnar.
+    """
+
+    def __init__(self, opciones: Optional[Dict[str, Any]] = None):
+        self.opciones = {**OPCIONES_BACKTESTING, **(conf.get("backtesting", {}) or {}), **(opciones or {})}
+        self.entrenador = EntrenaPronosticos()
+
+    def origenes(self, n: int) -> List[int]:
+        """Posiciones de los orígenes (primera semana pronosticada) de una serie de 'n' semanas."""
+        horizonte, paso = int(self.opciones["horizonte"]), max(1, int(self.opciones["paso"]))
+        parametros = self.entrenador.parametros
+        # Al menos dos semanas con historia completa para ajustar el modelo
+        contexto = max([*parametros["lags"], parametros["ventana"], 1])
+        ultimo = n - horizonte
+        primero = max(int(self.opciones["min_entrenamiento"]), contexto + 2)
+        if ultimo < primero:
+            return []
+        return list(range(ultimo, primero - 1, -paso))[:int(self.opciones["pliegues"])][::-1]
+
+    def tareas(self, series: List[Serie]) -> List[Tuple[Serie, str, List[int]]]:
+        por_tarea = max(1, int(self.opciones["pliegues_por_tarea"]))
+        tareas = []
+        for serie in series:
+            origenes = self.origenes(len(serie.valores))
+            huella = self.entrenador.huella(serie)
+            tareas.extend((serie, huella, origenes[i:i + por_tarea]) for i in range(0, len(origenes), por_tarea))
+        return tareas
+
+    def _n_jobs(self, tareas: int) -> int:
+        n_jobs = int(self.opciones["n_jobs"] or 1)
+        if n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        return max(1, min(n_jobs, tareas, os.cpu_count() or 1))
+
+    def run(self, df: pd.DataFrame, guardar: bool = True) -> pd.DataFrame:
+
+        series = self.entrenador.series(df)
+        tareas = self.tareas(series)
+        if not tareas:
+            logger.warning("Ninguna serie tiene semanas suficientes para el backtesting.")
+            return pd.DataFrame()
+
+        trabajo = partial(evalua_pliegues, self.entrenador.parametros, int(self.opciones["horizonte"]),
+                          int(self.opciones["cache_series"]))
+        procesos = self._n_jobs(len(tareas))
+
+        inicio = datetime.now()
+        if procesos == 1:
+            parciales = [trabajo(tarea) for tarea in tareas]
+        else:
+            # Tareas contiguas de una misma serie tienden a caer en el mismo proceso (y su caché)
+            tamano = max(1, len(tareas) // (procesos * 4))
+            with ProcessPoolExecutor(max_workers=procesos) as executor:
+                parciales = list(executor.map(trabajo, tareas, chunksize=tamano))
+
+        resultados = self._tabla(series, parciales)
+        logger.success(f"Backtesting: {len(resultados):,} pliegue(s) de {resultados['identificador'].nunique():,} serie(s) "
+                       f"en {(datetime.now() - inicio).total_seconds():.2f} s | procesos = {procesos} | "
+                       f"horizonte = {self.opciones['horizonte']} semana(s)")
+        self._resume(resultados)
+
+        if guardar and self.opciones.get("resultados"):
+            ruta = almacenamiento.guardar_dataframe(resultados, self.opciones["resultados"])
+            logger.info(f"Resultados del backtesting guardados en: {ruta}")
+
+        return resultados
+
+    @staticmethod
+    def _tabla(series: List[Serie], parciales: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Concatena las columnas de todas las tareas y agrega las dimensiones de cada serie."""
+
+        columnas = {nombre: np.concatenate([p[nombre] for p in parciales]) for nombre in parciales[0]}
+        resultados = pd.DataFrame(columnas)
+
+        dimensiones = pd.DataFrame(
+            [{**serie.llave, "Sexo": serie.sexo, "identificador": serie.identificador} for serie in series]
+        ).drop_duplicates("identificador")
+        resultados = resultados.merge(dimensiones, on="identificador", how="left")
+
+        for columna in [*CuboIncrementos.DIMENSIONES, "Sexo"]:
+            resultados[columna] = resultados[columna].astype("category")
+        resultados["origen"] = resultados["origen"].astype("datetime64[ns]")
+        resultados["mase"] = resultados["mae"] / resultados["mae_ingenuo"].where(resultados["mae_ingenuo"] > 0)
+
+        orden = [*CuboIncrementos.DIMENSIONES, "Sexo", "origen"]
+        resto = [c for c in resultados.columns if c not in orden]
+        return resultados[[*orden, *resto]].sort_values(orden).reset_index(drop=True)
+
+    @staticmethod
+    def _resume(resultados: pd.DataFrame) -> None:
+        resumen = (
+            resultados.groupby(["Nivel", "Sexo"], observed=True)[["mae", "rmse", "smape", "mase"]]
+            .mean()
+            .round(3)
+        )
+        logger.info(f"Métricas promedio del backtesting:\n{resumen.to_string()}")
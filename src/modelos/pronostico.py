@@ -0,0 +1,321 @@
+# src/modelos/pronostico.py
+import hashlib
+import json
+import os
+import pickle
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from sklearn.linear_model import Ridge
+
+from src.configuraciones.config_params import conf
+from src.datos.cubo import MEDIDAS, CuboIncrementos, completa_dimensiones
+
+# Cambia si cambia la forma de los modelos persistidos o de sus características
+VERSION_MODELO = 1
+
+# Opciones por omisión (sección pronostico de modelos.yaml)
+OPCIONES_PRONOSTICO = {
+    "carpeta": "./models/pronostico",
+    "sexos": ["hombres", "mujeres", "total"],
+    "lags": [1, 2, 3, 4],
+    "ventana": 4,
+    "estacionalidad": True,
+    "alpha": 1.0,
+    "min_observaciones": 20,
+    "n_jobs": 1,
+    "tamano_lote": 16,
+}
+
+# Semanas por año para las características estacionales
+SEMANAS_ANIO = 365.25 / 7
+
+
+@dataclass
+class Serie:
+    """Serie semanal de una combinación Padecimiento x Nivel x Region x Entidad y un sexo."""
+    llave: Dict[str, str]
+    sexo: str
+    fechas: np.ndarray
+    valores: np.ndarray
+
+    @property
+    def identificador(self) -> str:
+        return identificador_serie(self.llave, self.sexo)
+
+
+def identificador_serie(llave: Dict[str, str], sexo: str) -> str:
+    return "|".join([*(str(llave[d]) for d in CuboIncrementos.DIMENSIONES), sexo])
+
+
+def nombre_archivo(identificador: str) -> str:
+    """Nombre de archivo legible y único para un identificador de serie."""
+    ascii_ = unicodedata.normalize("NFKD", identificador).encode("ascii", "ignore").decode("ascii")
+    legible = re.sub(r"[^0-9A-Za-z]+", "_", ascii_).strip("_")[:80]
+    return f"{legible}-{hashlib.sha1(identificador.encode('utf-8')).hexdigest()[:10]}.pkl"
+
+
+def matriz_caracteristicas(valores: np.ndarray,
+                           fechas: np.ndarray,
+                           lags: List[int],
+                           ventana: int,
+                           estacionalidad: bool) -> np.ndarray:
+    """
+    Características de cada semana t a partir de las semanas anteriores de la serie.
+
+    Columnas: y_{t-lag} por cada lag, media de las 'ventana' semanas previas y, con
+    'estacionalidad', seno y coseno de la semana del año. Las filas sin historia suficiente
+    quedan en NaN. Se calcula una sola vez por serie; los pliegues del backtesting y el
+    ajuste toman subconjuntos de filas de la misma matriz.
+    """
+    n = len(valores)
+    columnas = []
+
+    for lag in lags:
+        desplazado = np.full(n, np.nan)
+        desplazado[lag:] = valores[:n - lag]
+        columnas.append(desplazado)
+
+    if ventana:
+        acumulado = np.concatenate([[0.0], np.cumsum(valores, dtype="float64")])
+        media = np.full(n, np.nan)
+        media[ventana:] = (acumulado[ventana:n] - acumulado[:n - ventana]) / ventana
+        columnas.append(media)
+
+    if estacionalidad:
+        columnas.extend(_estacionalidad(fechas))
+
+    return np.column_stack(columnas) if columnas else np.empty((n, 0))
+
+
+def _estacionalidad(fechas: np.ndarray) -> List[np.ndarray]:
+    dia_anio = pd.DatetimeIndex(fechas).dayofyear.to_numpy()
+    angulo = 2 * np.pi * (dia_anio - 1) / 7 / SEMANAS_ANIO
+    return [np.sin(angulo), np.cos(angulo)]
+
+
+@dataclass
+class ModeloSerie:
+    """Modelo ajustado de una serie y la historia necesaria para pronosticar de forma recursiva."""
+    identificador: str
+    llave: Dict[str, str]
+    sexo: str
+    estimador: Any
+    parametros: Dict[str, Any]
+    historia: np.ndarray
+    ultima_fecha: np.datetime64
+    huella: str
+    n_observaciones: int
+    entrenado: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+
+    def pronostica(self, semanas: int) -> pd.DataFrame:
+        """Pronóstico de las siguientes 'semanas' semanas; cada predicción alimenta los lags de la siguiente."""
+
+        lags = self.parametros["lags"]
+        ventana = self.parametros["ventana"]
+        historia = list(self.historia)
+        fechas = self.ultima_fecha + np.arange(1, semanas + 1) * np.timedelta64(7, "D")
+        estacional = _estacionalidad(fechas) if self.parametros["estacionalidad"] else []
+
+        # Producto directo con los coeficientes: evita la validación de predict() en cada paso
+        coeficientes, intercepto = self.estimador.coef_, float(self.estimador.intercept_)
+        predicciones = np.empty(semanas)
+        for paso in range(semanas):
+            fila = [historia[-lag] for lag in lags]
+            if ventana:
+                fila.append(np.mean(historia[-ventana:]))
+            fila.extend(componente[paso] for componente in estacional)
+
+            prediccion = max(float(np.dot(coeficientes, fila)) + intercepto, 0.0)
+            predicciones[paso] = prediccion
+            historia.append(prediccion)
+
+        return pd.DataFrame({"Fecha": fechas, "prediccion": predicciones})
+
+
+def ajusta_serie(serie: Serie, parametros: Dict[str, Any], huella: str) -> ModeloSerie:
+    """Ajusta una regresión Ridge sobre las características de la serie."""
+
+    X = matriz_caracteristicas(serie.valores, serie.fechas, parametros["lags"], parametros["ventana"],
+                               parametros["estacionalidad"])
+    validas = ~np.isnan(X).any(axis=1) & ~np.isnan(serie.valores)
+    estimador = Ridge(alpha=parametros["alpha"]).fit(X[validas], serie.valores[validas])
+
+    contexto = max([*parametros["lags"], parametros["ventana"], 1])
+    return ModeloSerie(
+        identificador=serie.identificador,
+        llave=serie.llave,
+        sexo=serie.sexo,
+        estimador=estimador,
+        parametros=parametros,
+        historia=serie.valores[-contexto:].astype("float64"),
+        ultima_fecha=serie.fechas[-1],
+        huella=huella,
+        n_observaciones=int(validas.sum()),
+    )
+
+
+def _ajusta_lote(parametros: Dict[str, Any], carpeta: str, lote: List[Tuple[Serie, str]]) -> List[Dict[str, Any]]:
+    """
+    Punto de entrada de los procesos de trabajo: ajusta un lote de series y guarda cada modelo.
+
+    Devuelve la entrada del manifest de cada modelo; los modelos no regresan al proceso
+    principal.
+    """
+    entradas = []
+    for serie, huella in lote:
+        modelo = ajusta_serie(serie, parametros, huella)
+        archivo = nombre_archivo(modelo.identificador)
+        temporal = Path(carpeta) / f".{archivo}.tmp"
+        with open(temporal, "wb") as f:
+            pickle.dump(modelo, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, Path(carpeta) / archivo)
+
+        entradas.append({
+            "identificador": modelo.identificador,
+            "archivo": archivo,
+            "huella": huella,
+            "llave": modelo.llave,
+            "sexo": modelo.sexo,
+            "n_observaciones": modelo.n_observaciones,
+            "ultima_fecha": str(np.datetime_as_string(modelo.ultima_fecha, unit="D")),
+            "entrenado": modelo.entrenado,
+        })
+    return entradas
+
+
+class EntrenaPronosticos:
+    """
+    Ajusta un modelo independiente por serie (padecimiento, nivel, región, entidad y sexo).
+
+    Las series se toman del resultado de dataTransformation en cualquiera de sus vistas. Cada
+    modelo se guarda en 'carpeta' junto con la huella de sus datos y parámetros en
+    manifest.json; las series cuya huella no cambió no se vuelven a ajustar. Las demás se
+    reparten en lotes entre 'n_jobs' procesos.
+    """
+
+    def __init__(self, opciones: Optional[Dict[str, Any]] = None):
+        self.opciones = {**OPCIONES_PRONOSTICO, **(conf.get("pronostico", {}) or {}), **(opciones or {})}
+        self.carpeta = Path(self.opciones["carpeta"])
+        self.parametros = {
+            "lags": sorted({int(lag) for lag in self.opciones["lags"]}),
+            "ventana": int(self.opciones["ventana"] or 0),
+            "estacionalidad": bool(self.opciones["estacionalidad"]),
+            "alpha": float(self.opciones["alpha"]),
+        }
+
+    # ------------------------------------------------------------------
+    # Series y huellas
+    # ------------------------------------------------------------------
+
+    def series(self, df: pd.DataFrame) -> List[Serie]:
+        """Separa las series del resultado de la transformación, ordenadas por fecha."""
+
+        datos = completa_dimensiones(df, conf.get("padecimiento", {}).get("tipo"))
+        datos = datos.sort_values([*CuboIncrementos.DIMENSIONES, "Fecha"], kind="stable")
+
+        series = []
+        for llave, grupo in datos.groupby(list(CuboIncrementos.DIMENSIONES), observed=True, sort=False, dropna=False):
+            llave = {d: ("" if pd.isna(v) else str(v)) for d, v in zip(CuboIncrementos.DIMENSIONES, llave)}
+            fechas = grupo["Fecha"].to_numpy(dtype="datetime64[D]")
+            for sexo in self.opciones["sexos"]:
+                series.append(Serie(llave, sexo, fechas, grupo[MEDIDAS[sexo]].to_numpy(dtype="float64")))
+        return series
+
+    def huella(self, serie: Serie) -> str:
+        h = hashlib.sha256()
+        h.update(json.dumps({"version": VERSION_MODELO, **self.parametros}, sort_keys=True).encode("utf-8"))
+        h.update(serie.fechas.astype("int64").tobytes())
+        h.update(np.ascontiguousarray(serie.valores).tobytes())
+        return h.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    @property
+    def ruta_manifest(self) -> Path:
+        return self.carpeta / "manifest.json"
+
+    def lee_manifest(self) -> Dict[str, Dict[str, Any]]:
+        if not self.ruta_manifest.is_file():
+            return {}
+        with open(self.ruta_manifest, encoding="utf-8") as f:
+            manifest = json.load(f)
+        return manifest.get("modelos", {}) if manifest.get("version") == VERSION_MODELO else {}
+
+    def _guarda_manifest(self, modelos: Dict[str, Dict[str, Any]]) -> None:
+        temporal = self.ruta_manifest.with_suffix(".tmp")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump({"version": VERSION_MODELO, "parametros": self.parametros, "modelos": modelos},
+                      f, indent=2, ensure_ascii=False)
+        os.replace(temporal, self.ruta_manifest)
+
+    # ------------------------------------------------------------------
+    # Entrenamiento
+    # ------------------------------------------------------------------
+
+    def _n_jobs(self, tareas: int) -> int:
+        n_jobs = int(self.opciones["n_jobs"] or 1)
+        if n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        return max(1, min(n_jobs, tareas, os.cpu_count() or 1))
+
+    def run(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+
+        self.carpeta.mkdir(parents=True, exist_ok=True)
+        manifest = self.lee_manifest()
+
+        pendientes: List[Tuple[Serie, str]] = []
+        vigentes = cortas = 0
+        for serie in self.series(df):
+            if np.count_nonzero(~np.isnan(serie.valores)) < int(self.opciones["min_observaciones"]):
+                cortas += 1
+                continue
+
+            huella = self.huella(serie)
+            previo = manifest.get(serie.identificador)
+            if previo and previo["huella"] == huella and (self.carpeta / previo["archivo"]).is_file():
+                vigentes += 1
+            else:
+                pendientes.append((serie, huella))
+
+        logger.info(f"Series a pronosticar: {vigentes + len(pendientes) + cortas:,} | sin cambios = {vigentes:,} | "
+                    f"por ajustar = {len(pendientes):,} | con menos de {self.opciones['min_observaciones']} semanas = {cortas:,}")
+
+        if pendientes:
+            tamano = max(1, int(self.opciones["tamano_lote"] or 1))
+            lotes = [pendientes[i:i + tamano] for i in range(0, len(pendientes), tamano)]
+            trabajo = partial(_ajusta_lote, self.parametros, str(self.carpeta))
+            procesos = self._n_jobs(len(lotes))
+
+            inicio = datetime.now()
+            if procesos == 1:
+                resultados = [trabajo(lote) for lote in lotes]
+            else:
+                with ProcessPoolExecutor(max_workers=procesos) as executor:
+                    resultados = list(executor.map(trabajo, lotes))
+
+            for entradas in resultados:
+                for entrada in entradas:
+                    manifest[entrada["identificador"]] = entrada
+
+            self._guarda_manifest(manifest)
+            logger.success(f"{len(pendientes):,} modelo(s) ajustado(s) en {(datetime.now() - inicio).total_seconds():.2f} s | "
+                           f"procesos = {procesos} | lotes = {len(lotes)} | carpeta = {self.carpeta}")
+
+        return manifest
+
+
+def carga_modelo(carpeta: str | Path, archivo: str) -> ModeloSerie:
+    with open(Path(carpeta) / archivo, "rb") as f:
+        return pickle.load(f)
@@ -0,0 +1,390 @@
+# src/modelos/servicio.py
+import json
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.configuraciones.config_params import conf
+from src.datos.cubo import MEDIDAS, TOTAL, CuboIncrementos
+from src.modelos.pronostico import EntrenaPronosticos, carga_modelo, identificador_serie
+
+# Opciones por omisión (sección servicio de modelos.yaml)
+OPCIONES_SERVICIO = {
+    "host": "127.0.0.1",
+    "puerto": 8050,
+    "cache_modelos": 256,
+    "precarga": True,
+    "semanas": 4,
+    "semanas_max": 52,
+    "max_consultas": 1000,
+    "muestras_latencia": 10000,
+    "consultas": [],
+    "salida": "./data/prediction/predicciones.csv",
+}
+
+
+def _normaliza(texto: Any) -> str:
+    """Texto sin acentos ni mayúsculas para comparar los valores de las consultas."""
+    return unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode("ascii").strip().lower()
+
+
+class RegistroModelos:
+    """
+    Registro de los modelos de pronóstico guardados por EntrenaPronosticos.
+
+    Lee manifest.json de la carpeta de modelos y resuelve cada consulta (padecimiento,
+    entidad o región, sexo) a su serie. Los modelos se cargan bajo demanda en una caché LRU
+    de 'capacidad' modelos; al cargar un modelo se calcula una sola vez su pronóstico de
+    'semanas_max' semanas. El pronóstico es recursivo, así que las primeras N semanas de ese
+    pronóstico son el pronóstico de N semanas: las consultas solo toman un prefijo. La caché
+    guarda junto al pronóstico la entrada del manifest con la que se cargó el modelo.
+
+    Si manifest.json cambia (nuevo entrenamiento), el registro se recarga y la caché se vacía.
+    """
+
+    def __init__(self, capacidad: int, semanas_max: int, carpeta: Optional[str | Path] = None):
+        self.entrenador = EntrenaPronosticos({"carpeta": carpeta} if carpeta else None)
+        self.capacidad = max(1, int(capacidad))
+        self.semanas_max = max(1, int(semanas_max))
+
+        self._bloqueo = threading.Lock()
+        self._cache: "OrderedDict[str, Tuple[Dict[str, Any], np.ndarray, np.ndarray]]" = OrderedDict()
+        self._modificado: Optional[float] = None
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        self._indice: Dict[Tuple[str, ...], str] = {}
+        self._region_entidad: Dict[Tuple[str, str], str] = {}
+        self.aciertos = self.fallos = 0
+
+        self.recarga()
+
+    @property
+    def carpeta(self) -> Path:
+        return self.entrenador.carpeta
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def _modificacion_manifest(self) -> Optional[float]:
+        try:
+            return self.entrenador.ruta_manifest.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def recarga(self) -> None:
+        """Lee manifest.json y construye el índice de consultas; vacía la caché de modelos."""
+
+        modificado = self._modificacion_manifest()
+        manifest = self.entrenador.lee_manifest()
+
+        indice, region_entidad = {}, {}
+        for identificador, entrada in manifest.items():
+            llave = entrada["llave"]
+            clave = (*(_normaliza(llave[d]) for d in CuboIncrementos.DIMENSIONES), entrada["sexo"])
+            indice[clave] = identificador
+            if llave["Nivel"] == "entidad":
+                region_entidad[(_normaliza(llave["Padecimiento"]), _normaliza(llave["Entidad"]))] = llave["Region"]
+
+        with self._bloqueo:
+            self.manifest, self._indice, self._region_entidad = manifest, indice, region_entidad
+            self._cache.clear()
+            self._modificado = modificado
+
+        if manifest:
+            logger.info(f"Registro de modelos: {len(manifest):,} serie(s) en {self.carpeta}")
+        else:
+            logger.warning(f"No hay modelos de pronóstico en {self.carpeta}. Ejecuta 'make entrena'.")
+
+    def verifica(self) -> None:
+        """Recarga el registro si manifest.json cambió desde la última lectura."""
+        if self._modificacion_manifest() != self._modificado:
+            logger.info("manifest.json cambió; se recarga el registro de modelos.")
+            self.recarga()
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def resuelve(self, consulta: Dict[str, Any]) -> str:
+        """
+        Identificador de la serie de una consulta.
+
+        El nivel se deduce de la consulta: con 'entidad' es el nivel entidad (su región se toma
+        del registro), con solo 'region' el nivel región y sin ninguna el nivel nacional. Sin
+        'padecimiento' se usa el de params.yaml y sin 'sexo' el total.
+        """
+        padecimiento = consulta.get("padecimiento") or conf.get("padecimiento", {}).get("tipo", "")
+        sexo = _normaliza(consulta.get("sexo") or "total")
+        if sexo not in MEDIDAS:
+            raise ValueError(f"Sexo no soportado: '{consulta.get('sexo')}'. Opciones: {tuple(MEDIDAS)}")
+
+        with self._bloqueo:
+            indice, regiones = self._indice, self._region_entidad
+
+        entidad, region = consulta.get("entidad"), consulta.get("region")
+        if entidad:
+            region_entidad = regiones.get((_normaliza(padecimiento), _normaliza(entidad)))
+            if region_entidad is None:
+                raise KeyError(f"No hay modelo para la entidad '{entidad}' ({padecimiento}).")
+            if region and _normaliza(region) != _normaliza(region_entidad):
+                raise ValueError(f"La entidad '{entidad}' pertenece a la región '{region_entidad}', no a '{region}'.")
+            llave = ("entidad", region_entidad, entidad)
+        elif region:
+            llave = ("region", region, TOTAL)
+        else:
+            llave = ("nacional", TOTAL, TOTAL)
+
+        clave = (_normaliza(padecimiento), *(_normaliza(v) for v in llave), sexo)
+        identificador = indice.get(clave)
+        if identificador is None:
+            serie = identificador_serie(dict(zip(CuboIncrementos.DIMENSIONES, (padecimiento, *llave))), sexo)
+            raise KeyError(f"No hay modelo para la serie: {serie}")
+        return identificador
+
+    def pronostico(self, identificador: str) -> Tuple[Dict[str, Any], np.ndarray, np.ndarray]:
+        """
+        Entrada del manifest, fechas y predicciones de 'semanas_max' semanas de una serie, desde
+        la caché o cargando su modelo. KeyError si la serie ya no está en el registro.
+        """
+
+        with self._bloqueo:
+            pronostico = self._cache.get(identificador)
+            if pronostico is not None:
+                self._cache.move_to_end(identificador)
+                self.aciertos += 1
+                return pronostico
+            self.fallos += 1
+            entrada = self.manifest.get(identificador)
+        if entrada is None:
+            raise KeyError(f"No hay modelo para la serie: {identificador}")
+
+        # La carga se hace fuera del bloqueo; dos hilos pueden cargar el mismo modelo a la vez
+        modelo = carga_modelo(self.carpeta, entrada["archivo"])
+        resultado = modelo.pronostica(self.semanas_max)
+        pronostico = (entrada, resultado["Fecha"].to_numpy(dtype="datetime64[D]"), resultado["prediccion"].to_numpy())
+
+        with self._bloqueo:
+            # Si el registro se recargó durante la carga, el modelo puede ser de otro entrenamiento
+            if self.manifest.get(identificador) is not entrada:
+                return pronostico
+            self._cache[identificador] = pronostico
+            while len(self._cache) > self.capacidad:
+                self._cache.popitem(last=False)
+        return pronostico
+
+    def precarga(self) -> int:
+        """Carga los primeros 'capacidad' modelos (niveles agregados primero) antes de recibir consultas."""
+
+        orden = {"nacional": 0, "region": 1, "entidad": 2}
+        identificadores = sorted(self.manifest, key=lambda i: (orden.get(self.manifest[i]["llave"]["Nivel"], 3), i))
+        for identificador in identificadores[:self.capacidad]:
+            self.pronostico(identificador)
+        return min(len(identificadores), self.capacidad)
+
+    def estado(self) -> Dict[str, Any]:
+        with self._bloqueo:
+            return {"modelos": len(self.manifest), "en_cache": len(self._cache), "capacidad": self.capacidad,
+                    "aciertos": self.aciertos, "fallos": self.fallos}
+
+
+class Latencias:
+    """Últimas 'muestras' latencias (ms) de las solicitudes y sus percentiles."""
+
+    def __init__(self, muestras: int):
+        self._muestras: deque = deque(maxlen=max(1, int(muestras)))
+        self._bloqueo = threading.Lock()
+        self.total = 0
+
+    def registra(self, milisegundos: float) -> None:
+        with self._bloqueo:
+            self._muestras.append(milisegundos)
+            self.total += 1
+
+    def resumen(self) -> Dict[str, Any]:
+        with self._bloqueo:
+            muestras = np.fromiter(self._muestras, dtype="float64")
+            total = self.total
+        if not len(muestras):
+            return {"solicitudes": total, "p50_ms": None, "p99_ms": None}
+        p50, p99 = np.percentile(muestras, [50, 99])
+        return {"solicitudes": total, "p50_ms": round(float(p50), 3), "p99_ms": round(float(p99), 3),
+                "max_ms": round(float(muestras.max()), 3)}
+
+
+class ServicioPredicciones:
+    """
+    Responde consultas de pronóstico ("siguientes N semanas") individuales o en lote.
+
+    Cada consulta es un diccionario con 'padecimiento', 'entidad', 'region', 'sexo' y
+    'semanas' (todos opcionales). Un lote responde cada consulta por separado: una consulta
+    inválida devuelve su error sin interrumpir las demás. Se registra la latencia de cada
+    solicitud (consulta o lote) para reportar sus percentiles p50 y p99.
+    """
+
+    def __init__(self, opciones: Optional[Dict[str, Any]] = None, carpeta: Optional[str | Path] = None):
+        self.opciones = {**OPCIONES_SERVICIO, **(conf.get("servicio", {}) or {}), **(opciones or {})}
+        self.registro = RegistroModelos(self.opciones["cache_modelos"], self.opciones["semanas_max"], carpeta)
+        self.latencias = Latencias(self.opciones["muestras_latencia"])
+
+        if self.opciones.get("precarga", True) and self.registro.manifest:
+            inicio = time.perf_counter()
+            cargados = self.registro.precarga()
+            logger.info(f"Precarga: {cargados:,} modelo(s) en {time.perf_counter() - inicio:.2f} s")
+
+    def _semanas(self, consulta: Dict[str, Any]) -> int:
+        """Semanas de la consulta (entero, o texto con un entero en las consultas GET); sin ellas, 'semanas'."""
+        valor = consulta.get("semanas")
+        if valor is None:
+            valor = self.opciones["semanas"]
+
+        if isinstance(valor, str) and valor.strip().lstrip("+-").isdigit():
+            semanas = int(valor)
+        elif isinstance(valor, int) and not isinstance(valor, bool):
+            semanas = valor
+        elif isinstance(valor, float) and valor.is_integer():
+            semanas = int(valor)
+        else:
+            raise ValueError(f"'semanas' debe ser un número entero: {valor!r}")
+
+        if not 1 <= semanas <= self.registro.semanas_max:
+            raise ValueError(f"'semanas' debe estar entre 1 y {self.registro.semanas_max}.")
+        return semanas
+
+    def _responde(self, consulta: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            identificador = self.registro.resuelve(consulta)
+            semanas = self._semanas(consulta)
+            entrada, fechas, predicciones = self.registro.pronostico(identificador)
+        except (KeyError, ValueError, TypeError) as e:
+            mensaje = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+            return {"consulta": consulta, "error": str(mensaje)}
+
+        return {
+            "consulta": consulta,
+            "identificador": identificador,
+            **entrada["llave"],
+            "Sexo": entrada["sexo"],
+            "ultima_fecha": entrada["ultima_fecha"],
+            "pronostico": [{"Fecha": str(f), "prediccion": round(float(p), 4)}
+                           for f, p in zip(fechas[:semanas], predicciones[:semanas])],
+        }
+
+    def predice(self, consultas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Responde un lote de consultas y registra su latencia."""
+
+        if len(consultas) > int(self.opciones["max_consultas"]):
+            raise ValueError(f"El lote excede el máximo de {self.opciones['max_consultas']} consultas.")
+
+        inicio = time.perf_counter()
+        self.registro.verifica()
+        respuestas = [self._responde(dict(consulta)) for consulta in consultas]
+        self.latencias.registra((time.perf_counter() - inicio) * 1000)
+        return respuestas
+
+    def estado(self) -> Dict[str, Any]:
+        return {"registro": self.registro.estado(), "latencia": self.latencias.resumen()}
+
+    # ------------------------------------------------------------------
+    # Lote desde la configuración
+    # ------------------------------------------------------------------
+
+    def consultas_configuradas(self) -> List[Dict[str, Any]]:
+        """Consultas de la sección servicio de modelos.yaml; sin consultas, todas las series del registro."""
+
+        consultas = self.opciones.get("consultas") or []
+        if consultas:
+            return [dict(c) for c in consultas]
+
+        consultas = []
+        for entrada in self.registro.manifest.values():
+            llave = entrada["llave"]
+            consulta = {"padecimiento": llave["Padecimiento"], "sexo": entrada["sexo"]}
+            if llave["Nivel"] == "entidad":
+                consulta["entidad"] = llave["Entidad"]
+            elif llave["Nivel"] == "region":
+                consulta["region"] = llave["Region"]
+            consultas.append(consulta)
+        return consultas
+
+    @staticmethod
+    def tabla(respuestas: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Una fila por consulta y semana pronosticada; las consultas con error se omiten."""
+
+        filas = []
+        for respuesta in respuestas:
+            if "error" in respuesta:
+                continue
+            base = {**{d: respuesta[d] for d in CuboIncrementos.DIMENSIONES}, "Sexo": respuesta["Sexo"]}
+            filas.extend({**base, **semana} for semana in respuesta["pronostico"])
+
+        tabla = pd.DataFrame(filas)
+        if not tabla.empty:
+            tabla["Fecha"] = pd.to_datetime(tabla["Fecha"])
+            for columna in [*CuboIncrementos.DIMENSIONES, "Sexo"]:
+                tabla[columna] = tabla[columna].astype("category")
+        return tabla
+
+
+class _ManejadorPredicciones(BaseHTTPRequestHandler):
+    """
+    Rutas del servidor HTTP:
+
+    - GET  /prediccion?entidad=...&region=...&sexo=...&padecimiento=...&semanas=N
+    - POST /prediccion con una consulta, una lista de consultas o {"consultas": [...]}
+    - GET  /estado: modelos en caché y latencias p50 / p99
+    """
+
+    servicio: ServicioPredicciones
+    protocol_version = "HTTP/1.1"
+
+    def _envia(self, codigo: int, contenido: Any) -> None:
+        cuerpo = json.dumps(contenido, ensure_ascii=False).encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/estado":
+            self._envia(200, self.servicio.estado())
+        elif url.path == "/prediccion":
+            consulta = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            self._envia(200, self.servicio.predice([consulta])[0])
+        else:
+            self._envia(404, {"error": f"Ruta no encontrada: {url.path}"})
+
+    def do_POST(self) -> None:
+        if urlparse(self.path).path != "/prediccion":
+            self._envia(404, {"error": f"Ruta no encontrada: {self.path}"})
+            return
+        try:
+            contenido = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"null")
+            if isinstance(contenido, dict):
+                contenido = contenido.get("consultas", [contenido])
+            if not isinstance(contenido, list) or not all(isinstance(c, dict) for c in contenido):
+                raise ValueError("Se espera una consulta, una lista de consultas o {'consultas': [...]}.")
+            self._envia(200, {"respuestas": self.servicio.predice(contenido)})
+        except ValueError as e:
+            self._envia(400, {"error": str(e)})
+
+    def log_message(self, formato: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} - {formato % args}")
+
+
+def crea_servidor(servicio: ServicioPredicciones,
+                  host: Optional[str] = None,
+                  puerto: Optional[int] = None) -> ThreadingHTTPServer:
+    """Servidor HTTP (un hilo por conexión) que comparte el registro y la caché de 'servicio'."""
+    manejador = type("ManejadorPredicciones", (_ManejadorPredicciones,), {"servicio": servicio})
+    return ThreadingHTTPServer((host or servicio.opciones["host"], int(puerto or servicio.opciones["puerto"])), manejador)
@@ -0,0 +1,139 @@
+# src/utils/acumuladores.py
+# Acumuladores exactos que se actualizan bloque por bloque; permiten calcular histogramas y
+# correlaciones de un archivo leído por partes sin mantenerlo completo en memoria.
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class HistogramaAdaptativo:
+    """
+    Histograma de 'bins' bins finos de igual ancho cuyo rango crece con los datos.
+
+    El rango inicial es el del primer bloque. Cuando un bloque cae fuera del rango, el ancho
+    de los bins se duplica (cada par de bins vecinos se suma en uno) y el rango se extiende
+    hacia el lado que lo requiere, hasta cubrir el bloque. Los conteos son exactos para los
+    bins vigentes; solo la resolución disminuye al extender el rango.
+
+    Los valores infinitos no caben en ningún rango: se excluyen y se cuentan en 'no_finitos'.
+    """
+
+    def __init__(self, bins: int = 1000):
+        # Un número par de bins permite sumarlos por pares al duplicar el ancho
+        self.bins = int(bins) + int(bins) % 2
+        self.conteos = np.zeros(self.bins, dtype=np.int64)
+        self.inicio = np.nan
+        self.ancho = np.nan
+        self.no_finitos = 0
+
+    @property
+    def fin(self) -> float:
+        return self.inicio + self.bins * self.ancho
+
+    def _duplica_ancho(self, hacia_derecha: bool) -> None:
+        mitad = self.bins // 2
+        sumados = self.conteos.reshape(mitad, 2).sum(axis=1)
+        self.conteos = np.zeros(self.bins, dtype=np.int64)
+
+        if hacia_derecha:
+            self.conteos[:mitad] = sumados
+        else:
+            self.conteos[mitad:] = sumados
+            self.inicio -= self.bins * self.ancho
+        self.ancho *= 2
+
+    def actualiza(self, valores: np.ndarray) -> None:
+        """'valores' sin nulos."""
+        finitos = np.isfinite(valores)
+        if not finitos.all():
+            self.no_finitos += int(valores.size - finitos.sum())
+            valores = valores[finitos]
+        if valores.size == 0:
+            return
+
+        minimo, maximo = float(valores.min()), float(valores.max())
+
+        if np.isnan(self.inicio):
+            if minimo == maximo:
+                minimo, maximo = minimo - 0.5, maximo + 0.5
+            self.inicio = minimo
+            self.ancho = (maximo - minimo) / self.bins
+
+        while maximo > self.fin:
+            self._duplica_ancho(hacia_derecha=True)
+        while minimo < self.inicio:
+            self._duplica_ancho(hacia_derecha=False)
+
+        conteos, _ = np.histogram(valores, bins=self.bins, range=(self.inicio, self.fin))
+        self.conteos += conteos
+
+    def recorte(self, minimo: float, maximo: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Bordes y conteos de los bins finos entre el mínimo y el máximo observados."""
+        if np.isnan(self.inicio):
+            return np.empty(0), np.empty(0, dtype=np.int64)
+
+        primero = int(np.clip(np.floor((minimo - self.inicio) / self.ancho), 0, self.bins - 1))
+        ultimo = int(np.clip(np.floor((maximo - self.inicio) / self.ancho), primero, self.bins - 1))
+
+        bordes = self.inicio + np.arange(primero, ultimo + 2) * self.ancho
+        return bordes, self.conteos[primero:ultimo + 1].copy()
+
+
+class CorrelacionIncremental:
+    """
+    Correlación de Pearson entre pares de columnas a partir de sumas acumuladas.
+
+    Igual que DataFrame.corr, cada par usa solo los registros donde ambas columnas tienen
+    valor. Las sumas se acumulan sobre los valores desplazados por la media del primer
+    bloque para reducir la pérdida de precisión al restar sumas grandes.
+    """
+
+    def __init__(self, columnas: List[str]):
+        self.columnas = list(columnas)
+        k = len(self.columnas)
+        self.desplazamiento = None
+        self.n = np.zeros((k, k))
+        self.suma = np.zeros((k, k))          # suma[i, j]: Σ x_i donde x_i y x_j tienen valor
+        self.suma_cuadrados = np.zeros((k, k))
+        self.suma_productos = np.zeros((k, k))
+
+    def actualiza(self, bloque: pd.DataFrame) -> None:
+        if not self.columnas or bloque.empty:
+            return
+
+        # Los valores no numéricos de un bloque posterior se tratan como nulos
+        valores = np.column_stack([
+            pd.to_numeric(bloque[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            for col in self.columnas
+        ])
+        presentes = ~np.isnan(valores)
+
+        if self.desplazamiento is None:
+            conteo = presentes.sum(axis=0)
+            sumas = np.where(presentes, valores, 0).sum(axis=0)
+            self.desplazamiento = np.divide(sumas, conteo, out=np.zeros(len(self.columnas)), where=conteo > 0)
+
+        centrados = np.where(presentes, valores - self.desplazamiento, 0)
+        mascara = presentes.astype("float64")
+
+        self.n += mascara.T @ mascara
+        self.suma += centrados.T @ mascara
+        self.suma_cuadrados += (centrados ** 2).T @ mascara
+        self.suma_productos += centrados.T @ centrados
+
+    def resultado(self) -> pd.DataFrame:
+        """Matriz de correlación; las columnas sin valores se omiten."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covarianza = self.suma_productos - self.suma * self.suma.T / self.n
+            varianza = self.suma_cuadrados - self.suma ** 2 / self.n
+            correlacion = covarianza / np.sqrt(varianza * varianza.T)
+
+        correlacion = np.clip(correlacion, -1, 1)
+        correlacion[self.n < 2] = np.nan
+        diagonal = np.diag_indices_from(correlacion)
+        correlacion[diagonal] = np.where(np.isnan(correlacion[diagonal]), np.nan, 1.0)
+        matriz = pd.DataFrame(correlacion, index=self.columnas, columns=self.columnas)
+
+        con_valores = [col for i, col in enumerate(self.columnas) if self.n[i, i] > 0]
+        return matriz.loc[con_valores, con_valores]
@@ -0,0 +1,343 @@
+# src/utils/almacenamiento.py
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+
+from src.configuraciones.config_params import conf
+from src.utils import directory_manager
+from src.utils.esquema import aplicar_esquema, tipos_lectura
+
+# Extensión asociada a cada formato soportado
+EXTENSIONES = {
+    "parquet": ".parquet",
+    "csv": ".csv",
+}
+
+
+def _opciones() -> dict:
+    """Devuelve la sección 'almacenamiento' de la configuración."""
+    return conf.get("almacenamiento", {}) or {}
+
+
+def ruta_artefacto(path_str: str | Path, formato: Optional[str] = None) -> Path:
+    """
+    Obtiene la ruta física de un artefacto según el formato de almacenamiento.
+
+    Las rutas de 'data.*' en params.yaml se declaran con extensión .csv; el formato
+    configurado únicamente sustituye la extensión.
+
+    :param path_str: Ruta declarada en la configuración.
+    :param formato: 'parquet' o 'csv'. Si no se indica se usa el configurado.
+    :return: Ruta con la extensión correspondiente al formato.
+    """
+    formato = (formato or _opciones().get("formato", "parquet")).lower()
+
+    if formato not in EXTENSIONES:
+        raise ValueError(f"Formato de almacenamiento no soportado: '{formato}'")
+
+    return Path(path_str).with_suffix(EXTENSIONES[formato])
+
+
+def localizar_dataset(path_str: str | Path) -> Optional[Path]:
+    """
+    Localiza un artefacto en disco dando prioridad al formato configurado.
+
+    Si el artefacto también existe en el otro formato y es más reciente (p. ej. quedó de
+    una ejecución con otro 'formato'), se usa el configurado y se advierte. La copia CSV
+    de 'exporta_csv' siempre es posterior al Parquet y no genera advertencia.
+
+    :param path_str: Ruta declarada en la configuración.
+    :return: Ruta existente (parquet o csv) o None si no existe en ningún formato.
+    """
+    configurado = _opciones().get("formato", "parquet").lower()
+    formatos = [configurado, *(f for f in EXTENSIONES if f != configurado)]
+    rutas = [ruta_artefacto(path_str, f) for f in formatos]
+    existentes = [r for r in rutas if directory_manager.existe_archivo(r)]
+
+    if not existentes:
+        return None
+
+    ruta = existentes[0]
+    copia_csv = configurado == "parquet" and _opciones().get("exporta_csv", False)
+    for otra in existentes[1:]:
+        if otra.stat().st_mtime > ruta.stat().st_mtime and not (copia_csv and otra.suffix == EXTENSIONES["csv"]):
+            logger.warning(f"Existe una versión más reciente en otro formato ({otra.name}); "
+                           f"se lee {ruta.name} según almacenamiento.formato = '{configurado}'.")
+    return ruta
+
+
+def existe_dataset(path_str: str | Path) -> bool:
+    """Verifica si el artefacto existe en cualquiera de los formatos soportados."""
+    return localizar_dataset(path_str) is not None
+
+
+def leer_dataframe(path_str: str | Path,
+                   columnas: Optional[List[str]] = None,
+                   esquema: bool = True) -> pd.DataFrame:
+    """
+    Lee un artefacto en el formato disponible.
+
+    :param path_str: Ruta declarada en la configuración.
+    :param columnas: Proyección de columnas; solo se leen las indicadas.
+    :param esquema: Aplica los tipos compactos declarados en esquema.yaml.
+    :return: DataFrame con los datos leídos.
+    """
+    ruta = localizar_dataset(path_str)
+
+    if ruta is None:
+        raise FileNotFoundError(f"No se localizó el archivo en ningún formato: {path_str}")
+
+    logger.debug(f"Leyendo dataset: {ruta} | columnas = {columnas if columnas else 'todas'}")
+
+    if ruta.suffix == EXTENSIONES["parquet"]:
+        df = pd.read_parquet(ruta, columns=columnas, engine="pyarrow")
+    else:
+        # Las categóricas se construyen durante el parseo, sin materializar las cadenas
+        df = pd.read_csv(ruta, usecols=columnas, dtype=tipos_lectura() if esquema else None)
+
+    return aplicar_esquema(df, etapa=ruta.name) if esquema else df
+
+
+def guardar_dataframe(df: pd.DataFrame,
+                      path_str: str | Path,
+                      formato: Optional[str] = None,
+                      exporta_csv: Optional[bool] = None) -> Path:
+    """
+    Persiste un DataFrame en el formato configurado.
+
+    :param df: DataFrame a guardar.
+    :param path_str: Ruta declarada en la configuración.
+    :param formato: 'parquet' o 'csv'. Si no se indica se usa el configurado.
+    :param exporta_csv: Escribe además una copia CSV cuando el formato es columnar.
+    :return: Ruta del archivo principal generado.
+    """
+    opciones = _opciones()
+    ruta = ruta_artefacto(path_str, formato)
+    exporta_csv = opciones.get("exporta_csv", False) if exporta_csv is None else exporta_csv
+
+    directory_manager.asegurar_ruta(ruta.parent)
+
+    if ruta.suffix == EXTENSIONES["parquet"]:
+        df.to_parquet(
+            ruta,
+            engine="pyarrow",
+            compression=opciones.get("compresion", "zstd"),
+            index=False,
+        )
+
+        if exporta_csv:
+            ruta_csv = ruta_artefacto(path_str, "csv")
+            logger.debug(f"Exportando copia CSV en: {ruta_csv}")
+            df.to_csv(ruta_csv, index=False)
+    else:
+        df.to_csv(ruta, index=False)
+
+    logger.debug(f"Dataset guardado en: {ruta} | registros = {len(df):,} | columnas = {df.shape[1]}")
+    return ruta
+
+
+def leer_por_bloques(path_str: str | Path,
+                     tamano_bloque: int,
+                     columnas: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Lee un artefacto por bloques de a lo más 'tamano_bloque' registros.
+
+    Solo un bloque se mantiene en memoria a la vez, lo que permite procesar archivos
+    de mayor tamaño que la memoria disponible.
+    """
+    ruta = localizar_dataset(path_str)
+
+    if ruta is None:
+        raise FileNotFoundError(f"No se localizó el archivo en ningún formato: {path_str}")
+
+    logger.debug(f"Leyendo dataset por bloques: {ruta} | tamaño de bloque = {tamano_bloque:,}")
+
+    if ruta.suffix == EXTENSIONES["parquet"]:
+        archivo = pq.ParquetFile(ruta)
+        for lote in archivo.iter_batches(batch_size=tamano_bloque, columns=columnas):
+            yield lote.to_pandas()
+        return
+
+    with pd.read_csv(ruta, usecols=columnas, chunksize=tamano_bloque) as lector:
+        yield from lector
+
+
+def _tipo_comun(actual: pa.DataType, nuevo: pa.DataType) -> pa.DataType:
+    """
+    Tipo Arrow que contiene los valores de ambos tipos.
+
+    Los bloques de un CSV se leen por separado y cada uno infiere sus tipos: una columna
+    vacía en un bloque es nula, los enteros con nulos son flotantes y una columna con texto
+    en un solo bloque es cadena. Se amplía null -> T, entero -> flotante y, si no hay un
+    tipo numérico común, cualquier tipo -> cadena.
+    """
+    if actual.equals(nuevo):
+        return actual
+    if pa.types.is_null(actual):
+        return nuevo
+    if pa.types.is_null(nuevo):
+        return actual
+
+    if pa.types.is_dictionary(actual) or pa.types.is_dictionary(nuevo):
+        valores_actual = actual.value_type if pa.types.is_dictionary(actual) else actual
+        valores_nuevo = nuevo.value_type if pa.types.is_dictionary(nuevo) else nuevo
+        valores = _tipo_comun(valores_actual, valores_nuevo)
+        # Las categorías de cada bloque son distintas: se conservan como diccionario si ambos lo son
+        if pa.types.is_dictionary(actual) and pa.types.is_dictionary(nuevo):
+            return pa.dictionary(pa.int32(), valores)
+        return valores
+
+    numericos = (pa.types.is_integer, pa.types.is_floating, pa.types.is_boolean)
+    if any(f(actual) for f in numericos) and any(f(nuevo) for f in numericos):
+        if pa.types.is_floating(actual) or pa.types.is_floating(nuevo):
+            return pa.float64()
+        return pa.int64()
+
+    if pa.types.is_timestamp(actual) and pa.types.is_timestamp(nuevo) and actual.tz == nuevo.tz:
+        return pa.timestamp("ns", actual.tz)
+
+    return pa.string()
+
+
+def _ajusta_tabla(tabla: pa.Table, esquema: pa.Schema) -> pa.Table:
+    """Ordena, completa (con nulos) y convierte las columnas de 'tabla' al esquema."""
+    columnas = []
+    for campo in esquema:
+        if campo.name in tabla.column_names:
+            columna = tabla.column(campo.name)
+            columnas.append(columna if columna.type.equals(campo.type) else columna.cast(campo.type))
+        else:
+            columnas.append(pa.nulls(len(tabla), campo.type))
+    return pa.Table.from_arrays(columnas, schema=esquema)
+
+
+class EscritorIncremental:
+    """
+    Escribe un artefacto bloque por bloque en el formato configurado.
+
+    El archivo se construye en una ruta temporal y se publica al cerrar el escritor;
+    si no se escribió ningún registro no se genera archivo y se elimina el que hubiera
+    de una ejecución anterior (en cualquier formato).
+
+    En Parquet el esquema se toma del primer bloque y se amplía (_tipo_comun) cuando un
+    bloque posterior no cabe en él, p. ej. una columna vacía en el primer bloque y con
+    texto después. Ampliar el esquema reescribe por lotes lo ya escrito, lo que solo ocurre
+    cuando cambian los tipos.
+    """
+
+    def __init__(self, path_str: str | Path, formato: Optional[str] = None):
+        self.ruta = ruta_artefacto(path_str, formato)
+        self.temporal = self.ruta.with_name(self.ruta.name + ".tmp")
+        self.esquema: Optional[pa.Schema] = None
+        self.escritor: Optional[pq.ParquetWriter] = None
+        self.registros = 0
+
+        self.copia_csv: Optional[EscritorIncremental] = None
+        if self.ruta.suffix == EXTENSIONES["parquet"] and _opciones().get("exporta_csv", False):
+            self.copia_csv = EscritorIncremental(path_str, "csv")
+
+    def __enter__(self) -> "EscritorIncremental":
+        return self
+
+    def __exit__(self, tipo_error, error, traza) -> None:
+        self.cerrar(publicar=tipo_error is None)
+
+    def _abre(self, esquema: pa.Schema) -> None:
+        self.esquema = esquema
+        self.escritor = pq.ParquetWriter(self.temporal, esquema, compression=_opciones().get("compresion", "zstd"))
+
+    def _amplia_esquema(self, tabla: pa.Table) -> None:
+        """Amplía el esquema para admitir 'tabla' y reescribe lo ya escrito con el nuevo esquema."""
+
+        campos = []
+        for campo in self.esquema:
+            if campo.name in tabla.column_names:
+                campos.append(pa.field(campo.name, _tipo_comun(campo.type, tabla.schema.field(campo.name).type)))
+            else:
+                campos.append(campo)
+        campos += [campo for campo in tabla.schema if campo.name not in self.esquema.names]
+        # Los metadatos de pandas describen los tipos del primer bloque; ya no aplican
+        esquema = pa.schema(campos)
+
+        cambios = [f"{c.name}: {self.esquema.field(c.name).type} -> {c.type}"
+                   for c in esquema if c.name in self.esquema.names and not c.type.equals(self.esquema.field(c.name).type)]
+        cambios += [f"{c.name}: nueva ({c.type})" for c in esquema if c.name not in self.esquema.names]
+        logger.warning(f"Se amplía el esquema de {self.ruta} tras {self.registros:,} registros | {', '.join(cambios)}")
+
+        self.escritor.close()
+        previo = self.temporal.with_name(self.temporal.name + ".previo")
+        self.temporal.replace(previo)
+        try:
+            self._abre(esquema)
+            for lote in pq.ParquetFile(previo).iter_batches():
+                self.escritor.write_table(_ajusta_tabla(pa.Table.from_batches([lote]), esquema))
+        finally:
+            previo.unlink()
+
+    def escribe(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+
+        if self.ruta.suffix == EXTENSIONES["parquet"]:
+            tabla = pa.Table.from_pandas(df, preserve_index=False)
+
+            if self.escritor is None:
+                directory_manager.asegurar_ruta(self.ruta.parent)
+                self._abre(tabla.schema)
+            elif not tabla.schema.equals(self.esquema, check_metadata=False):
+                try:
+                    try:
+                        if set(tabla.column_names) - set(self.esquema.names):
+                            raise ValueError("columnas nuevas")
+                        tabla = _ajusta_tabla(tabla, self.esquema)
+                    except (pa.ArrowException, ValueError):
+                        self._amplia_esquema(tabla)
+                        tabla = _ajusta_tabla(tabla, self.esquema)
+                except (pa.ArrowException, ValueError) as e:
+                    raise ValueError(
+                        f"El bloque no es compatible con el esquema de {self.ruta}: {e}"
+                    ) from e
+
+            self.escritor.write_table(tabla)
+
+            if self.copia_csv is not None:
+                self.copia_csv.escribe(df)
+        else:
+            if self.registros == 0:
+                directory_manager.asegurar_ruta(self.ruta.parent)
+            df.to_csv(self.temporal, mode="a" if self.registros else "w", header=self.registros == 0, index=False)
+
+        self.registros += len(df)
+
+    def _elimina_previos(self) -> None:
+        """Sin registros no se publica archivo: se elimina el de una ejecución anterior para no leerlo como vigente."""
+        for formato in EXTENSIONES:
+            previo = self.ruta.with_suffix(EXTENSIONES[formato])
+            if previo.is_file():
+                logger.warning(f"No se escribieron registros; se elimina el archivo de una ejecución anterior: {previo}")
+                previo.unlink()
+
+    def cerrar(self, publicar: bool = True) -> Optional[Path]:
+        if self.escritor is not None:
+            self.escritor.close()
+            self.escritor = None
+
+        if self.copia_csv is not None:
+            self.copia_csv.cerrar(publicar)
+
+        if not self.temporal.exists():
+            if publicar:
+                self._elimina_previos()
+            return None
+
+        if not publicar:
+            self.temporal.unlink()
+            return None
+
+        self.temporal.replace(self.ruta)
+        logger.debug(f"Dataset guardado por bloques en: {self.ruta} | registros = {self.registros:,}")
+        return self.ruta
@@ -0,0 +1,218 @@
+# src/utils/bocetos.py
+# Resúmenes (bocetos) combinables para estadísticas aproximadas. Todos se actualizan por
+# bloques y dos instancias con los mismos parámetros pueden combinarse, por lo que pueden
+# calcularse sobre un archivo leído por partes o en procesos distintos.
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _hash_valores(serie: pd.Series) -> np.ndarray:
+    """Hash de 64 bits de los valores no nulos; para categóricas solo se calculan por categoría."""
+    serie = serie.dropna()
+
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        por_categoria = pd.util.hash_array(serie.cat.categories.to_numpy())
+        return por_categoria[serie.cat.codes.to_numpy()]
+
+    return pd.util.hash_array(serie.to_numpy())
+
+
+class Momentos:
+    """Conteo, media, varianza, mínimo y máximo exactos combinables (Welford / Chan)."""
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def _combina(self, n: int, media: float, m2: float, minimo: float, maximo: float) -> None:
+        if n == 0:
+            return
+
+        total = self.n + n
+        delta = media - self.media
+        self.media += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.n = total
+        self.minimo = min(self.minimo, minimo)
+        self.maximo = max(self.maximo, maximo)
+
+    def actualiza(self, valores: np.ndarray) -> None:
+        """'valores' sin nulos."""
+        if valores.size == 0:
+            return
+        media = float(valores.mean())
+        self._combina(valores.size, media, float(((valores - media) ** 2).sum()),
+                      float(valores.min()), float(valores.max()))
+
+    def combina(self, otro: "Momentos") -> None:
+        self._combina(otro.n, otro.media, otro.m2, otro.minimo, otro.maximo)
+
+    @property
+    def desviacion(self) -> float:
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else np.nan
+
+
+class BocetoCuantiles:
+    """
+    Boceto de cuantiles tipo KLL (Karnin, Lang y Liberty).
+
+    Los valores se acumulan en niveles; cuando un nivel excede su capacidad se ordena y
+    la mitad de sus elementos (pares o impares, al azar) sube al siguiente nivel con el
+    doble de peso. La capacidad decrece geométricamente (factor 2/3) hacia los niveles
+    inferiores, de modo que la memoria es O(k) independientemente del número de valores.
+    """
+
+    def __init__(self, k: int = 200, semilla: int = 0):
+        self.k = int(k)
+        self.n = 0
+        self.niveles: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(semilla)
+
+    @staticmethod
+    def error_rango(k: int) -> float:
+        """Error normalizado de rango (≈99% de confianza) de referencia para KLL con parámetro k."""
+        return 2.296 / k ** 0.9723
+
+    def _capacidad(self, nivel: int) -> int:
+        altura = len(self.niveles) - nivel - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** altura)))
+
+    def _compacta(self) -> None:
+        nivel = 0
+        while nivel < len(self.niveles):
+            if self.niveles[nivel].size > self._capacidad(nivel):
+                if nivel + 1 == len(self.niveles):
+                    self.niveles.append(np.empty(0))
+
+                valores = np.sort(self.niveles[nivel])
+                # Con un número impar de elementos, el último permanece en el nivel
+                resto = valores[valores.size - valores.size % 2:]
+                valores = valores[:valores.size - valores.size % 2]
+                elegidos = valores[int(self._rng.integers(2))::2]
+
+                self.niveles[nivel + 1] = np.concatenate([self.niveles[nivel + 1], elegidos])
+                self.niveles[nivel] = resto
+            nivel += 1
+
+    def actualiza(self, valores: np.ndarray) -> None:
+        """'valores' sin nulos."""
+        if valores.size == 0:
+            return
+        self.n += valores.size
+        self.niveles[0] = np.concatenate([self.niveles[0], valores.astype("float64")])
+        self._compacta()
+
+    def combina(self, otro: "BocetoCuantiles") -> None:
+        while len(self.niveles) < len(otro.niveles):
+            self.niveles.append(np.empty(0))
+        for nivel, valores in enumerate(otro.niveles):
+            self.niveles[nivel] = np.concatenate([self.niveles[nivel], valores])
+        self.n += otro.n
+        self._compacta()
+
+    def cuantiles(self, probabilidades) -> np.ndarray:
+        if self.n == 0:
+            return np.full(len(probabilidades), np.nan)
+
+        valores = np.concatenate(self.niveles)
+        pesos = np.concatenate([np.full(v.size, 2.0 ** nivel) for nivel, v in enumerate(self.niveles)])
+        orden = np.argsort(valores, kind="stable")
+        valores, acumulado = valores[orden], np.cumsum(pesos[orden])
+
+        posiciones = np.searchsorted(acumulado, np.asarray(probabilidades) * acumulado[-1], side="left")
+        return valores[np.clip(posiciones, 0, valores.size - 1)]
+
+
+class HyperLogLog:
+    """Estimación de valores distintos con 2^precision registros (error estándar 1.04 / √m)."""
+
+    def __init__(self, precision: int = 14):
+        self.precision = int(precision)
+        self.registros = np.zeros(1 << self.precision, dtype=np.uint8)
+
+    @staticmethod
+    def error_estandar(precision: int) -> float:
+        return 1.04 / np.sqrt(1 << int(precision))
+
+    def actualiza(self, serie: pd.Series) -> None:
+        hashes = _hash_valores(serie)
+        if hashes.size == 0:
+            return
+
+        bits_restantes = 64 - self.precision
+        indices = (hashes >> np.uint64(bits_restantes)).astype(np.int64)
+        restantes = hashes & np.uint64((1 << bits_restantes) - 1)
+
+        # Posición del primer bit en 1 (restantes < 2^53, representable sin pérdida en float64)
+        longitud = np.frexp(restantes.astype("float64"))[1]
+        rango = (bits_restantes - longitud + 1).astype(np.uint8)
+
+        np.maximum.at(self.registros, indices, rango)
+
+    def combina(self, otro: "HyperLogLog") -> None:
+        np.maximum(self.registros, otro.registros, out=self.registros)
+
+    def estimacion(self) -> int:
+        m = self.registros.size
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimado = alfa * m * m / np.sum(np.ldexp(1.0, -self.registros.astype(int)))
+
+        # Corrección para cardinalidades pequeñas (conteo lineal)
+        vacios = int(np.count_nonzero(self.registros == 0))
+        if estimado <= 2.5 * m and vacios:
+            estimado = m * np.log(m / vacios)
+
+        return int(round(estimado))
+
+
+class FrecuentesMisraGries:
+    """
+    Valores más frecuentes con a lo más k contadores (Misra-Gries combinable).
+
+    Cada frecuencia estimada subestima la real en a lo más 'error_maximo', que a su
+    vez no excede n / (k + 1).
+    """
+
+    def __init__(self, k: int = 100):
+        self.k = int(k)
+        self.n = 0
+        self.contadores = pd.Series(dtype="int64")
+        self.error_maximo = 0
+
+    def _reduce(self) -> None:
+        if len(self.contadores) <= self.k:
+            return
+
+        umbral = int(self.contadores.nlargest(self.k + 1).iloc[-1])
+        self.contadores = self.contadores - umbral
+        self.contadores = self.contadores[self.contadores > 0]
+        self.error_maximo += umbral
+
+    def _agrega(self, conteos: pd.Series) -> None:
+        conteos = conteos[conteos > 0]
+        conteos.index = conteos.index.astype(object)
+        self.contadores = self.contadores.add(conteos, fill_value=0).astype("int64")
+        self._reduce()
+
+    def agrega_conteos(self, conteos: pd.Series) -> None:
+        """Integra un conteo por valor ya calculado (sin nulos)."""
+        self.n += int(conteos.sum())
+        self._agrega(conteos)
+
+    def actualiza(self, serie: pd.Series) -> None:
+        self.agrega_conteos(serie.value_counts(dropna=True))
+
+    def combina(self, otro: "FrecuentesMisraGries") -> None:
+        self.n += otro.n
+        self.error_maximo += otro.error_maximo
+        self._agrega(otro.contadores.copy())
+
+    def frecuencias(self, top: Optional[int] = None) -> pd.Series:
+        """Frecuencias estimadas de mayor a menor."""
+        frecuencias = self.contadores.sort_values(ascending=False, kind="stable")
+        return frecuencias.head(top) if top else frecuencias
@@ -0,0 +1,177 @@
+# src/utils/cache_etapas.py
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+from loguru import logger
+
+from src.utils import almacenamiento, directory_manager
+
+
+def _serializa(valor: Any) -> str:
+    """Serialización estable (llaves ordenadas) para calcular huellas."""
+    return json.dumps(valor, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class CacheEtapas:
+    """
+    Caché de resultados por etapa basada en huellas de contenido.
+
+    Cada etapa registra la huella de sus entradas y de la sección de configuración que
+    la afecta. Si la huella no cambia, la etapa se omite y su resultado se lee de la caché;
+    cuando cambia, el resultado anterior se considera obsoleto y se elimina.
+    """
+
+    def __init__(self, carpeta: str | Path):
+        self.carpeta = directory_manager.asegurar_ruta(carpeta)
+        self.ruta_manifest = self.carpeta / "manifest.json"
+        self.manifest = self._cargar_manifest()
+
+    # ------------------ Manifest ------------------
+    def _cargar_manifest(self) -> Dict[str, Dict]:
+        if not self.ruta_manifest.is_file():
+            return {"etapas": {}, "archivos": {}}
+
+        try:
+            with open(self.ruta_manifest, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"No se pudo leer el manifest de la caché ({e}); se inicia vacío.")
+            return {"etapas": {}, "archivos": {}}
+
+        manifest.setdefault("etapas", {})
+        manifest.setdefault("archivos", {})
+        return manifest
+
+    def _guardar_manifest(self) -> None:
+        temporal = self.ruta_manifest.with_suffix(".tmp")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        temporal.replace(self.ruta_manifest)
+
+    # ------------------ Huellas ------------------
+    def huella_archivo(self, path_str: str | Path) -> Optional[str]:
+        """
+        Calcula la huella SHA-256 del contenido de un archivo.
+
+        El resultado se reutiliza mientras el tamaño y la fecha de modificación no cambien,
+        por lo que el archivo solo se vuelve a leer cuando fue modificado.
+        """
+        ruta = almacenamiento.localizar_dataset(path_str)
+        if ruta is None:
+            return None
+
+        stat = ruta.stat()
+        previo = self.manifest["archivos"].get(str(ruta))
+        if previo and previo["tamano"] == stat.st_size and previo["mtime"] == stat.st_mtime_ns:
+            return previo["sha256"]
+
+        logger.debug(f"Calculando huella de contenido: {ruta}")
+        sha256 = directory_manager.sha256_archivo(ruta)
+
+        self.manifest["archivos"][str(ruta)] = {
+            "tamano": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "sha256": sha256,
+        }
+        self._guardar_manifest()
+        return sha256
+
+    @staticmethod
+    def huella(etapa: str, entradas: Iterable[Optional[str]], config: Any) -> str:
+        """Combina el nombre de la etapa, las huellas de sus entradas y su configuración."""
+        sha = hashlib.sha256()
+        sha.update(etapa.encode("utf-8"))
+        for entrada in entradas:
+            sha.update(str(entrada).encode("utf-8"))
+        sha.update(_serializa(config).encode("utf-8"))
+        return sha.hexdigest()
+
+    # ------------------ Resultados ------------------
+    def _ruta_resultado(self, etapa: str, huella: str) -> Path:
+        return self.carpeta / f"{etapa}-{huella[:16]}.parquet"
+
+    def vigente(self, etapa: str, huella: str, artefactos: Iterable[str] = ()) -> bool:
+        """Indica si la etapa tiene un resultado válido para la huella indicada."""
+        registro = self.manifest["etapas"].get(etapa)
+
+        if not registro or registro["huella"] != huella:
+            return False
+
+        if registro.get("resultado") and not Path(registro["resultado"]).is_file():
+            return False
+
+        return all(Path(artefacto).is_file() for artefacto in artefactos)
+
+    def cargar(self, etapa: str) -> Optional[pd.DataFrame]:
+        registro = self.manifest["etapas"].get(etapa, {})
+        if not registro.get("resultado"):
+            return None
+
+        logger.debug(f"Leyendo resultado en caché de la etapa '{etapa}': {registro['resultado']}")
+        return almacenamiento.leer_dataframe(registro["resultado"])
+
+    def guardar(self, etapa: str, huella: str, df: Optional[pd.DataFrame]) -> None:
+        """Registra la huella de la etapa y, si existe, su resultado; elimina el resultado obsoleto."""
+        self._expulsar(etapa, conservar=huella)
+
+        ruta = None
+        if isinstance(df, pd.DataFrame):
+            ruta = almacenamiento.guardar_dataframe(
+                df, self._ruta_resultado(etapa, huella), formato="parquet", exporta_csv=False
+            )
+
+        self.manifest["etapas"][etapa] = {
+            "huella": huella,
+            "resultado": str(ruta) if ruta else None,
+            "fecha": f"{datetime.now():%Y-%m-%d %H:%M:%S}",
+        }
+        self._guardar_manifest()
+
+    def persistido_vigente(self, etapa: str, path_str: str | Path) -> bool:
+        """Indica si la copia persistida de la etapa corresponde a su resultado en caché."""
+        ruta = almacenamiento.localizar_dataset(path_str)
+        persistido = self.manifest["etapas"].get(etapa, {}).get("persistido")
+
+        if ruta is None or not persistido:
+            return False
+
+        return persistido["ruta"] == str(ruta) and persistido["mtime"] == ruta.stat().st_mtime_ns
+
+    def registra_persistido(self, etapa: str, ruta: Path) -> None:
+        if etapa not in self.manifest["etapas"]:
+            return
+
+        self.manifest["etapas"][etapa]["persistido"] = {"ruta": str(ruta), "mtime": ruta.stat().st_mtime_ns}
+        self._guardar_manifest()
+
+    def _expulsar(self, etapa: str, conservar: Optional[str] = None) -> None:
+        registro = self.manifest["etapas"].get(etapa)
+
+        if not registro or registro["huella"] == conservar:
+            return
+
+        if registro.get("resultado") and Path(registro["resultado"]).is_file():
+            logger.info(f"Eliminando resultado obsoleto de la etapa '{etapa}': {registro['resultado']}")
+            Path(registro["resultado"]).unlink()
+
+        del self.manifest["etapas"][etapa]
+
+    def depura(self, etapas_vigentes: Iterable[str]) -> None:
+        """Elimina las entradas de etapas que ya no forman parte del pipeline y archivos huérfanos."""
+        vigentes = set(etapas_vigentes)
+
+        for etapa in list(self.manifest["etapas"]):
+            if etapa not in vigentes:
+                self._expulsar(etapa)
+
+        referenciados = {r["resultado"] for r in self.manifest["etapas"].values() if r.get("resultado")}
+        for archivo in self.carpeta.glob("*.parquet"):
+            if str(archivo) not in referenciados:
+                logger.debug(f"Eliminando archivo huérfano de la caché: {archivo}")
+                archivo.unlink()
+
+        self._guardar_manifest()
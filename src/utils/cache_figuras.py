@@ -0,0 +1,116 @@
+# src/utils/cache_figuras.py
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.utils import directory_manager
+
+# Cambia cuando cambia el estilo o el código de las gráficas; invalida todas las figuras previas
+VERSION_ESTILO = "1"
+
+# Longitud de la clave que se agrega al nombre de cada figura
+LONGITUD_CLAVE = 16
+
+
+def _actualiza_huella(sha, valor: Any) -> None:
+    """Agrega un argumento de la gráfica a la huella; las series y tablas se identifican por su contenido."""
+
+    if isinstance(valor, (pd.Series, pd.DataFrame)):
+        columnas = [valor.name] if isinstance(valor, pd.Series) else list(valor.columns)
+        tipos = [valor.dtype] if isinstance(valor, pd.Series) else list(valor.dtypes)
+        sha.update(repr((type(valor).__name__, columnas, [str(t) for t in tipos])).encode())
+
+        # Un índice de etiquetas (p. ej. frecuencias por categoría) es parte de los datos;
+        # un índice entero solo indica la posición del registro y no afecta la figura
+        incluye_indice = not pd.api.types.is_integer_dtype(valor.index)
+        sha.update(pd.util.hash_pandas_object(valor, index=incluye_indice).to_numpy().tobytes())
+    elif isinstance(valor, np.ndarray):
+        # repr() abrevia los arreglos grandes; se usa el contenido completo
+        sha.update(repr((valor.dtype.str, valor.shape)).encode())
+        sha.update(np.ascontiguousarray(valor).tobytes())
+    else:
+        sha.update(repr(valor).encode())
+
+
+class CacheFiguras:
+    """
+    Caché de figuras direccionada por contenido.
+
+    La clave de una figura combina el tipo de gráfica, los datos de las columnas que usa,
+    las opciones de dibujo ('max_cols', histograma) y la versión de estilo. Las figuras se
+    guardan como '<nombre>-<clave>.png'; si la clave ya existe la figura se reutiliza. El tamaño de la carpeta se limita
+    eliminando primero las figuras usadas hace más tiempo.
+    """
+
+    def __init__(self, carpeta: str | Path, tamano_max_mb: float):
+        self.carpeta = directory_manager.asegurar_ruta(carpeta)
+        self.tamano_max = float(tamano_max_mb) * 1024**2
+        self.indice = self._indexar()
+
+    def _indexar(self) -> Dict[str, Path]:
+        """Clave -> figura existente en la carpeta."""
+        indice = {}
+        for ruta in self.carpeta.glob("*.png"):
+            _, separador, clave = ruta.stem.rpartition("-")
+            if separador and len(clave) == LONGITUD_CLAVE:
+                indice[clave] = ruta
+        return indice
+
+    @staticmethod
+    def clave(metodo: str, argumentos: Iterable[Any], opciones: Any) -> str:
+        """'opciones': parámetros de dibujo que afectan la figura (max_cols, histograma, ...)."""
+        sha = hashlib.sha256()
+        sha.update(repr((VERSION_ESTILO, metodo)).encode())
+        _actualiza_huella(sha, opciones)
+        for argumento in argumentos:
+            _actualiza_huella(sha, argumento)
+        return sha.hexdigest()[:LONGITUD_CLAVE]
+
+    @staticmethod
+    def ruta_destino(ruta_generada: str | Path, clave: str) -> Path:
+        ruta = Path(ruta_generada)
+        return ruta.with_name(f"{ruta.stem}-{clave}{ruta.suffix}")
+
+    def buscar(self, clave: str) -> Optional[Path]:
+        """Devuelve la figura de la clave si existe y marca su uso para la expulsión por antigüedad."""
+        ruta = self.indice.get(clave)
+
+        if ruta is None or not ruta.is_file():
+            return None
+
+        os.utime(ruta)
+        return ruta
+
+    def registra(self, clave: str, ruta: str | Path) -> None:
+        self.indice[clave] = Path(ruta)
+
+    def depura(self, en_uso: Iterable[str | Path]) -> None:
+        """Elimina las figuras usadas hace más tiempo hasta respetar el tamaño máximo."""
+
+        protegidas = {Path(ruta).resolve() for ruta in en_uso}
+        figuras = sorted(
+            (ruta for ruta in self.carpeta.glob("*.png") if ruta.is_file()),
+            key=lambda ruta: ruta.stat().st_mtime,
+        )
+        total = sum(ruta.stat().st_size for ruta in figuras)
+        eliminadas = 0
+
+        for ruta in figuras:
+            if total <= self.tamano_max:
+                break
+            if ruta.resolve() in protegidas:
+                continue
+
+            total -= ruta.stat().st_size
+            ruta.unlink()
+            eliminadas += 1
+
+        self.indice = self._indexar()
+
+        if eliminadas:
+            logger.debug(f"Caché de figuras: {eliminadas} figura(s) eliminada(s) | tamaño = {total / 1024**2:,.2f} MB")
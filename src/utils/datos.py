@@ -7,6 +7,19 @@ import pandas as pd
 
 class OperacionesDatos:
 
+    @staticmethod
+    def copia_trabajo(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Copia de trabajo de un DataFrame recibido por una etapa.
+
+        Con copy-on-write habilitado se devuelve una copia superficial: comparte los datos
+        con el original y solo se copian las columnas que la etapa modifica. Sin él, se
+        mantiene la copia completa para no alterar el DataFrame de entrada.
+        """
+        if pd.get_option("mode.copy_on_write"):
+            return df.copy(deep=False)
+        return df.copy()
+
     @staticmethod
     def _validar_columna(df: pd.DataFrame, col: str) -> None:
         if col not in df.columns:
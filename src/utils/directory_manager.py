@@ -1,4 +1,5 @@
 # src/utils/directory_manager.py
+import hashlib
 from pathlib import Path
 
 from loguru import logger
@@ -38,6 +39,20 @@ def existe_archivo(path_str: str | Path) -> bool:
     path = Path(path_str)  # Convertimos a Path para manejar ambos tipos
     return path.is_file()  # is_file() asegura que sea un archivo, no un directorio
 
+def sha256_archivo(path_str: str | Path, tamano_bloque: int = 1 << 20) -> str:
+    """
+    Calcula la huella SHA-256 del contenido de un archivo, leyéndolo por bloques.
+
+    :param path_str: Ruta del archivo como str o Path.
+    :param tamano_bloque: Bytes por lectura (1 MiB por omisión).
+    :return: Huella en hexadecimal.
+    """
+    sha = hashlib.sha256()
+    with open(path_str, "rb") as f:
+        for bloque in iter(lambda: f.read(tamano_bloque), b""):
+            sha.update(bloque)
+    return sha.hexdigest()
+
 def limpia_carpeta(path_str: str | Path) -> None:
     """
     Elimina todos los archivos dentro de una carpeta especificada.
@@ -0,0 +1,107 @@
+# src/utils/esquema.py
+from fnmatch import fnmatch
+from typing import Dict, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+from src.configuraciones.config_params import conf
+
+
+def _coincide(columna: str, patrones: Optional[List[str]]) -> bool:
+    return any(fnmatch(str(columna), patron) for patron in patrones or [])
+
+
+def _columnas(df: pd.DataFrame, patrones: Optional[List[str]]) -> List[str]:
+    """Columnas del DataFrame que coinciden con alguno de los patrones (admite comodines)."""
+    return [col for col in df.columns if _coincide(col, patrones)]
+
+
+def memoria_mb(df: pd.DataFrame) -> float:
+    """Memoria ocupada por el DataFrame en MB (incluye el contenido de columnas de texto)."""
+    return df.memory_usage(deep=True).sum() / 1024**2
+
+
+def tipos_lectura() -> Dict[str, str]:
+    """
+    Tipos que pueden indicarse directamente al lector CSV.
+
+    Solo se incluyen las categóricas declaradas sin comodines; los enteros dependen de
+    los valores leídos y se reducen después con aplicar_esquema.
+    """
+    esquema = conf.get("esquema", {}) or {}
+
+    if not esquema.get("aplicar", False):
+        return {}
+
+    return {col: "category" for col in esquema.get("categoricas") or [] if not any(c in col for c in "*?[")}
+
+
+def tipos_columnas(columnas: List[str]) -> Dict[str, str]:
+    """
+    Tipos declarados en esquema.yaml para leer varios archivos con un mismo esquema.
+
+    A diferencia de tipos_lectura, admite comodines y no depende de 'aplicar': al unir
+    archivos que se leen por separado, las columnas declaradas deben tener el mismo tipo
+    en todos ellos. Las categóricas se leen como 'category' y los enteros como flotantes
+    (pueden tener nulos); aplicar_esquema los reduce después al leer el resultado.
+    """
+    esquema = conf.get("esquema", {}) or {}
+
+    tipos = {}
+    for col in columnas:
+        if _coincide(col, esquema.get("categoricas")):
+            tipos[col] = "category"
+        elif _coincide(col, esquema.get("enteros")):
+            tipos[col] = "float64"
+    return tipos
+
+
+def aplicar_esquema(df: pd.DataFrame, etapa: str = "dataset") -> pd.DataFrame:
+    """
+    Aplica los tipos declarados en esquema.yaml.
+
+    - categoricas: se convierten a 'category' (y se descartan categorías sin uso).
+    - enteros: se reducen al tipo entero más pequeño que contenga sus valores.
+
+    :param df: DataFrame a convertir (se modifica en sitio).
+    :param etapa: Nombre usado en el reporte de memoria.
+    :return: El mismo DataFrame con los tipos compactos.
+    """
+    esquema = conf.get("esquema", {}) or {}
+
+    if not esquema.get("aplicar", False):
+        return df
+
+    reporta = esquema.get("reporte_memoria", False)
+    antes = memoria_mb(df) if reporta else None
+
+    for col in _columnas(df, esquema.get("categoricas")):
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.remove_unused_categories()
+        else:
+            df[col] = df[col].astype("category")
+
+    for col in _columnas(df, esquema.get("enteros")):
+        serie = df[col]
+
+        if not pd.api.types.is_numeric_dtype(serie):
+            logger.warning(f"Esquema: la columna '{col}' no es numérica ({serie.dtype}); se conserva su tipo.")
+            continue
+
+        if serie.isna().any():
+            logger.debug(f"Esquema: la columna '{col}' contiene nulos; se conserva como {serie.dtype}.")
+            continue
+
+        if pd.api.types.is_float_dtype(serie) and not (serie % 1 == 0).all():
+            logger.warning(f"Esquema: la columna '{col}' contiene decimales; se conserva como {serie.dtype}.")
+            continue
+
+        df[col] = pd.to_numeric(serie.astype("int64"), downcast="integer")
+
+    if reporta:
+        despues = memoria_mb(df)
+        ahorro = (1 - despues / antes) * 100 if antes else 0.0
+        logger.info(f"Esquema aplicado en '{etapa}': {antes:,.2f} MB -> {despues:,.2f} MB (ahorro {ahorro:.1f}%)")
+
+    return df
@@ -0,0 +1,55 @@
+# src/utils/generador_reportes.py
+from pathlib import Path
+from typing import List
+
+from loguru import logger
+
+from src.configuraciones.config_params import conf
+from src.datos.EDA import ReportData
+from src.utils.paquete_reporte import guarda_paquete
+from src.utils.reporte_HTML import HTMLReportGenerator
+from src.utils.reporte_PDF import PDFReportGenerator
+
+FORMATOS = ("pdf", "html", "ambos")
+
+# Secciones de reportes.yaml que generan un reporte EDA (y su paquete)
+SECCIONES_REPORTE = ("reporte_EDA", "reporte_clean_dataset")
+
+
+def ruta_paquete(opciones: dict) -> Path:
+    """Carpeta del paquete (ReportData persistido) de una sección de reporte."""
+    return Path(conf["paquete_reporte"]["carpeta"]) / opciones["nombre_reporte"]
+
+
+def genera_reporte(datos_reporte: ReportData,
+                   opciones: dict,
+                   ancho_figura_cm: float = 16,
+                   guarda: bool = True) -> List[Path]:
+    """
+    Escribe el reporte en el formato de su sección de reportes.yaml ('formato': pdf | html | ambos).
+
+    El HTML se guarda junto al PDF, con el mismo nombre y extensión .html. Con
+    paquete_reporte.habilitado (y 'guarda') el ReportData se persiste antes de generar el
+    reporte, de modo que pueda reconstruirse sin recalcular el EDA.
+    """
+    formato = str(opciones.get("formato", "pdf")).lower()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de reporte no soportado: '{formato}'. Opciones: {FORMATOS}")
+
+    opciones_paquete = conf.get("paquete_reporte", {}) or {}
+    if guarda and opciones_paquete.get("habilitado"):
+        guarda_paquete(datos_reporte, ruta_paquete(opciones), opciones_paquete.get("conserva_anterior", True))
+
+    ruta_pdf = Path(opciones.get("ruta"))
+    generados: List[Path] = []
+
+    if formato in ("pdf", "ambos"):
+        PDFReportGenerator(datos_reporte, archivo_salida=str(ruta_pdf), ancho_figura_cm=ancho_figura_cm).build()
+        generados.append(ruta_pdf)
+
+    if formato in ("html", "ambos"):
+        generados.append(HTMLReportGenerator(datos_reporte, archivo_salida=ruta_pdf.with_suffix(".html")).build())
+
+    for ruta in generados:
+        logger.info(f"Reporte generado en: {ruta}")
+    return generados
@@ -1,31 +1,200 @@
 # src/utils/graficos.py
 import os
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
+from loguru import logger
+from matplotlib.artist import setp
+from matplotlib.figure import Figure
+from scipy.signal import fftconvolve
 from scipy.stats import gaussian_kde
 
+from src.utils.cache_figuras import CacheFiguras
+
+# Tarea de renderizado: (nombre del método de GraficosHelper, argumentos posicionales)
+Tarea = Tuple[str, tuple]
+
+
+# Opciones por omisión del histograma (sección graficos.histograma de reportes.yaml)
+OPCIONES_HISTOGRAMA = {
+    "modo": "auto",
+    "umbral_registros": 100_000,
+    "subdivisiones": 50,
+}
+
+
+def _renderiza_tarea(opciones: Dict[str, Any],
+                     tarea: Tarea,
+                     clave: Optional[str] = None) -> Optional[str]:
+    """
+    Punto de entrada de los procesos de trabajo: dibuja una figura y devuelve su ruta.
+
+    'opciones' son los argumentos con los que se construye GraficosHelper en el proceso.
+    Con 'clave' la figura se publica con el nombre que la identifica en la caché.
+    """
+    metodo, argumentos = tarea
+    ruta = getattr(GraficosHelper(**opciones), metodo)(*argumentos)
+
+    if ruta is None or clave is None:
+        return ruta
+
+    destino = CacheFiguras.ruta_destino(ruta, clave)
+    os.replace(ruta, destino)
+    return str(destino)
+
 
 class GraficosHelper:
-    def __init__(self, carpeta_salida: str, numero_top_columnas: int):
+    """
+    Genera las figuras del reporte con la API orientada a objetos de matplotlib.
+
+    Cada figura es un objeto Figure independiente (sin estado global de pyplot ni backend
+    interactivo), por lo que pueden dibujarse en paralelo en procesos distintos.
+    """
+
+    def __init__(self,
+                 carpeta_salida: str,
+                 numero_top_columnas: int,
+                 cache: Optional[CacheFiguras] = None,
+                 histograma: Optional[Dict[str, Any]] = None):
         self.carpeta_salida = carpeta_salida
         self.numero_top_columnas = numero_top_columnas
-
-    def _guardar_figura(self, nombre: str) -> str:
+        self.cache = cache
+        self.histograma = {**OPCIONES_HISTOGRAMA, **(histograma or {})}
+
+    def _opciones_trabajo(self) -> Dict[str, Any]:
+        """Argumentos para reconstruir el helper en un proceso de trabajo (sin la caché)."""
+        return {
+            "carpeta_salida": self.carpeta_salida,
+            "numero_top_columnas": self.numero_top_columnas,
+            "histograma": self.histograma,
+        }
+
+    def _guardar_figura(self, fig: Figure, nombre: str) -> str:
         ruta = os.path.join(self.carpeta_salida, nombre)
-        plt.tight_layout()
-        plt.savefig(ruta, dpi=150)
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(ruta, dpi=150)
         return ruta
 
+    def renderiza(self, tareas: List[Tarea], procesos: int = 1) -> List[Optional[str]]:
+        """
+        Ejecuta las tareas de renderizado y devuelve las rutas en el mismo orden de 'tareas'.
+
+        Con procesos > 1 las figuras se dibujan en un pool de procesos; cada tarea envía
+        únicamente las columnas que necesita su gráfica. Con caché, las figuras cuyos datos
+        y opciones no cambiaron se reutilizan sin dibujarse.
+        """
+        rutas: List[Optional[str]] = [None] * len(tareas)
+        claves: List[Optional[str]] = [None] * len(tareas)
+        pendientes = list(range(len(tareas)))
+
+        if self.cache is not None:
+            pendientes = []
+            for i, (metodo, argumentos) in enumerate(tareas):
+                claves[i] = CacheFiguras.clave(metodo, argumentos, self._opciones_trabajo())
+                existente = self.cache.buscar(claves[i])
+                if existente is not None:
+                    rutas[i] = str(existente)
+                else:
+                    pendientes.append(i)
+
+            logger.info(f"Caché de figuras: {len(tareas) - len(pendientes)} reutilizada(s) | {len(pendientes)} por generar")
+
+        trabajo = partial(_renderiza_tarea, self._opciones_trabajo())
+        procesos = max(1, min(int(procesos or 1), len(pendientes), os.cpu_count() or 1))
+
+        if procesos == 1:
+            generadas = [trabajo(tareas[i], claves[i]) for i in pendientes]
+        else:
+            with ProcessPoolExecutor(max_workers=procesos) as executor:
+                generadas = list(executor.map(trabajo, [tareas[i] for i in pendientes], [claves[i] for i in pendientes]))
+
+        for i, ruta in zip(pendientes, generadas):
+            rutas[i] = ruta
+            if self.cache is not None and ruta is not None:
+                self.cache.registra(claves[i], ruta)
+
+        if self.cache is not None:
+            self.cache.depura([ruta for ruta in rutas if ruta])
+
+        return rutas
+
+    @staticmethod
+    def densidad_agrupada(valores: np.ndarray,
+                          bins: int,
+                          subdivisiones: int,
+                          puntos: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Histograma y KDE gaussiana a partir de un único conteo por bins.
+
+        Los datos se cuentan una vez en bins * subdivisiones bins finos. Las barras del
+        histograma suman grupos de 'subdivisiones' bins finos y la densidad se obtiene al
+        convolucionar (FFT) los conteos finos con el kernel gaussiano, usando el mismo ancho
+        de banda que gaussian_kde (regla de Scott). El costo es O(n + bins finos) en lugar
+        de O(n · puntos).
+
+        :return: (bordes del histograma, conteos por barra, densidad en 'puntos' o None si
+                 los datos no tienen dispersión).
+        """
+        minimo, maximo = float(valores.min()), float(valores.max())
+
+        if minimo == maximo:
+            conteos, bordes = np.histogram(valores, bins=bins)
+            return bordes, conteos, None
+
+        finos = bins * subdivisiones
+        conteos_finos, bordes_finos = np.histogram(valores, bins=finos, range=(minimo, maximo))
+        conteos = conteos_finos.reshape(bins, subdivisiones).sum(axis=1)
+        bordes = bordes_finos[::subdivisiones]
+
+        desviacion = valores.std(ddof=1)
+        if not desviacion > 0:
+            return bordes, conteos, None
+
+        return bordes, conteos, GraficosHelper.densidad_desde_conteos(bordes_finos, conteos_finos, desviacion, puntos)
+
+    @staticmethod
+    def densidad_desde_conteos(bordes_finos: np.ndarray,
+                               conteos_finos: np.ndarray,
+                               desviacion: float,
+                               puntos: np.ndarray) -> np.ndarray:
+        """KDE gaussiana (regla de Scott) evaluada en 'puntos' a partir de conteos en bins finos de igual ancho."""
+        n = conteos_finos.sum()
+        finos = conteos_finos.size
+        ancho_banda = desviacion * n ** (-1 / 5)
+        paso = bordes_finos[1] - bordes_finos[0]
+
+        # Kernel truncado a 4 desviaciones; los bins vacíos en los extremos evitan recortes
+        radio = int(np.ceil(4 * ancho_banda / paso))
+        desplazamientos = np.arange(-radio, radio + 1) * paso
+        kernel = np.exp(-0.5 * (desplazamientos / ancho_banda) ** 2)
+
+        conteos_ext = np.pad(conteos_finos.astype(float), radio)
+        densidad_ext = fftconvolve(conteos_ext, kernel, mode="same") / (n * ancho_banda * np.sqrt(2 * np.pi))
+        densidad = np.clip(densidad_ext[radio:radio + finos], 0, None)
+
+        centros = (bordes_finos[:-1] + bordes_finos[1:]) / 2
+        return np.interp(puntos, centros, densidad)
+
     def plot_histograma(self, serie, col: str) -> Optional[str]:
+        modo = str(self.histograma["modo"]).lower()
+        agrupado = modo == "agrupado" or (
+            modo == "auto" and serie.size >= int(self.histograma["umbral_registros"] or 0)
+        )
+
+        if agrupado:
+            return self._plot_histograma_agrupado(serie, col)
+
         serie = serie.dropna()
         if serie.empty:
             return None
 
-        plt.hist(
+        fig = Figure()
+        ax = fig.subplots()
+
+        ax.hist(
             serie,
             bins=20,
             color="#2a9d8f",
@@ -36,19 +205,84 @@ class GraficosHelper:
 
         kde = gaussian_kde(serie)
         x_vals = np.linspace(serie.min(), serie.max(), 200)
-        plt.plot(x_vals, kde(x_vals), color="red", linewidth=2)
-        plt.title(f"Histograma de {col}")
-        plt.ylabel("Densidad")
+        ax.plot(x_vals, kde(x_vals), color="red", linewidth=2)
+        ax.set_title(f"Histograma de {col}")
+        ax.set_ylabel("Densidad")
 
-        return self._guardar_figura(f"hist_{col}.png")
+        return self._guardar_figura(fig, f"hist_{col}.png")
 
-    def plot_categorica_barras(self, serie, col: str) -> Optional[str]:
-        serie = serie.dropna()
-        if serie.empty:
+    def _plot_histograma_agrupado(self, serie, col: str) -> Optional[str]:
+        """Variante de plot_histograma para columnas grandes: barras y densidad salen de los mismos bins."""
+        valores = serie.to_numpy(dtype="float64", na_value=np.nan)
+        valores = valores[~np.isnan(valores)]
+        if valores.size == 0:
+            return None
+
+        x_vals = np.linspace(valores.min(), valores.max(), 200)
+        bordes, conteos, densidad = self.densidad_agrupada(
+            valores, bins=20, subdivisiones=int(self.histograma["subdivisiones"]), puntos=x_vals
+        )
+        return self._dibuja_histograma(bordes, conteos, x_vals, densidad, col)
+
+    def plot_histograma_bins(self, bordes_finos: np.ndarray, conteos_finos: np.ndarray,
+                             desviacion: float, col: str) -> Optional[str]:
+        """
+        Histograma a partir de conteos ya acumulados en bins finos (reporte por bloques).
+
+        Los bins finos se agrupan en 20 barras (o menos si hay pocos bins) y la densidad se
+        obtiene de los mismos conteos, como en el cálculo agrupado.
+        """
+        if conteos_finos.size == 0 or conteos_finos.sum() == 0:
             return None
 
-        conteos = serie.value_counts().head(self.numero_top_columnas)
-        top_real = min(self.numero_top_columnas, len(serie.value_counts()))
+        # Se completan con bins vacíos hasta un múltiplo del tamaño de grupo
+        grupo = int(np.ceil(conteos_finos.size / 20))
+        faltantes = -conteos_finos.size % grupo
+        paso = bordes_finos[1] - bordes_finos[0]
+        conteos_ext = np.pad(conteos_finos, (0, faltantes))
+        bordes_ext = np.concatenate([bordes_finos, bordes_finos[-1] + paso * np.arange(1, faltantes + 1)])
+
+        conteos = conteos_ext.reshape(-1, grupo).sum(axis=1)
+        bordes = bordes_ext[::grupo]
+
+        x_vals = np.linspace(bordes_finos[0], bordes_finos[-1], 200)
+        densidad = None
+        if desviacion > 0:
+            densidad = self.densidad_desde_conteos(bordes_finos, conteos_finos, desviacion, x_vals)
+
+        return self._dibuja_histograma(bordes, conteos, x_vals, densidad, col)
+
+    def _dibuja_histograma(self, bordes, conteos, x_vals, densidad, col: str) -> str:
+        fig = Figure()
+        ax = fig.subplots()
+
+        ax.hist(
+            bordes[:-1],
+            bins=bordes,
+            weights=conteos,
+            color="#2a9d8f",
+            edgecolor="white",
+            alpha=0.6,
+            density=True
+        )
+
+        if densidad is not None:
+            ax.plot(x_vals, densidad, color="red", linewidth=2)
+        ax.set_title(f"Histograma de {col}")
+        ax.set_ylabel("Densidad")
+
+        return self._guardar_figura(fig, f"hist_{col}.png")
+
+    def plot_categorica_barras(self, serie, col: str, frecuencias=None) -> Optional[str]:
+        # 'frecuencias': conteo de valores no nulos ya calculado (de mayor a menor)
+        if frecuencias is None:
+            frecuencias = serie.dropna().value_counts()
+
+        if frecuencias.empty:
+            return None
+
+        conteos = frecuencias.head(self.numero_top_columnas)
+        top_real = min(self.numero_top_columnas, len(frecuencias))
 
         porcentajes = (conteos / conteos.sum() * 100).round(1)
 
@@ -58,13 +292,17 @@ class GraficosHelper:
             for lbl in porcentajes_recortados.index
         ]
 
-        ax = sns.barplot(
+        fig = Figure()
+        ax = fig.subplots()
+
+        sns.barplot(
             x=porcentajes_recortados.values,
             y=porcentajes_recortados.index,
             hue=porcentajes_recortados.index,
             dodge=False,
             palette="muted",
-            legend=False
+            legend=False,
+            ax=ax
         )
 
         titulo = f"Distribución porcentual de {col} - Top {top_real}"
@@ -72,12 +310,12 @@ class GraficosHelper:
         ax.set_xlabel(None)
         ax.set_ylabel(None)
 
-        plt.xticks(rotation=45, ha='right')
+        setp(ax.get_xticklabels(), rotation=45, ha='right')
 
         for i, v in enumerate(porcentajes_recortados.values):
             ax.text(v + 0.5, i, f"{v}%", va="center")
 
-        return self._guardar_figura(f"barras_{col}.png")
+        return self._guardar_figura(fig, f"barras_{col}.png")
 
     def plot_violin(self, serie, col: str) -> Optional[str]:
 
@@ -103,30 +341,43 @@ class GraficosHelper:
             ancho = 10
 
 
-        plt.figure(figsize=(ancho, alto))
+        fig = Figure(figsize=(ancho, alto))
+        ax = fig.subplots()
         sns.violinplot(
             y=serie,
             inner=None,
             color="#2a9d8f",
-            linewidth=1.2
+            linewidth=1.2,
+            ax=ax
         )
-        plt.title(f"Gráfico de violín de {col}")
-        plt.ylabel(None)
+        ax.set_title(f"Gráfico de violín de {col}")
+        ax.set_ylabel(None)
 
-        return self._guardar_figura(f"violin_{col}.png")
+        return self._guardar_figura(fig, f"violin_{col}.png")
 
     def plot_correlacion(self, serie) -> Optional[str]:
         num = serie.select_dtypes(include='number').dropna(axis=1, how="all")
         if num.shape[1] < 2: return None
-        sns.heatmap(num.corr(numeric_only=True), cmap="viridis", annot=True)
-        plt.title("Matriz de correlación")
-        return self._guardar_figura("correlacion.png")
-    
+
+        return self.plot_matriz_correlacion(num.corr(numeric_only=True))
+
+    def plot_matriz_correlacion(self, matriz) -> Optional[str]:
+        """Mapa de calor de una matriz de correlación ya calculada."""
+        if matriz.shape[1] < 2: return None
+
+        fig = Figure()
+        ax = fig.subplots()
+        sns.heatmap(matriz, cmap="viridis", annot=True, ax=ax)
+        ax.set_title("Matriz de correlación")
+        return self._guardar_figura(fig, "correlacion.png")
+
     def plot_box(self, serie, col: str, col_comparativa: str) -> Optional[str]:
 
         if col == col_comparativa:
             return None
 
+        fig = Figure()
+        ax = fig.subplots()
         sns.boxplot(x=col, y=col_comparativa,
                     data=serie,
                     palette="Set2",
@@ -134,11 +385,12 @@ class GraficosHelper:
                     legend=False,
                     notch=True,
                     fliersize=1,
-                    boxprops=dict(alpha=0.7))
-        plt.title(f"Distribución de Valor por {col}")
-        plt.xlabel("")
-        plt.xticks(rotation=90)
+                    boxprops=dict(alpha=0.7),
+                    ax=ax)
+        ax.set_title(f"Distribución de Valor por {col}")
+        ax.set_xlabel("")
+        setp(ax.get_xticklabels(), rotation=90)
 
 
 
-        return self._guardar_figura(f"box_{col}.png")
\ No newline at end of file
+        return self._guardar_figura(fig, f"box_{col}.png")
@@ -0,0 +1,213 @@
+# src/utils/paquete_reporte.py
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+from src.datos.EDA import ReportData
+from src.utils.directory_manager import sha256_archivo
+
+# Cambia si cambia la estructura del paquete
+VERSION_PAQUETE = 1
+
+# Campos de ReportData que se guardan como tablas
+CAMPOS_TABLA = ("resumen_datos", "resumen_datos_nulos", "estadisticas_numericas", "estadisticas_categoricas")
+
+# Estadísticos numéricos que se comparan entre paquetes
+ESTADISTICOS_COMPARADOS = ("conteo", "media", "desv_est", "mín", "p50", "máx")
+
+
+def _columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Prepara una tabla del reporte para Parquet.
+
+    Las columnas de texto con valores mixtos (p. ej. frecuencias con el separador '...')
+    se guardan como texto; el reporte las muestra con str(), por lo que no cambian.
+    """
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True) not in ("string", "empty"):
+            df[col] = df[col].astype(str)
+    if df.index.dtype == object and pd.api.types.infer_dtype(df.index, skipna=True) not in ("string", "empty"):
+        df.index = df.index.astype(str)
+    return df
+
+
+def _guarda_tabla(df: pd.DataFrame, carpeta: Path, nombre: str) -> str:
+    archivo = f"{nombre}.parquet"
+    _columnar(df).to_parquet(carpeta / archivo, engine="pyarrow", compression="zstd", index=True)
+    return archivo
+
+
+def guarda_paquete(datos: ReportData, carpeta: str | Path, conserva_anterior: bool = True) -> Path:
+    """
+    Persiste un ReportData como paquete: manifest.json, tablas en Parquet y figuras como ruta + SHA-256.
+
+    El paquete se escribe en una carpeta temporal y se publica al terminar; con
+    'conserva_anterior' el paquete previo se mueve a '<carpeta>.anterior' para compararlo.
+    """
+    carpeta = Path(carpeta)
+    temporal = carpeta.with_name(carpeta.name + ".tmp")
+    shutil.rmtree(temporal, ignore_errors=True)
+    (temporal / "tablas").mkdir(parents=True)
+
+    manifest = {
+        "version": VERSION_PAQUETE,
+        "creado": datetime.now().isoformat(timespec="seconds"),
+        "titulo": datos.titulo,
+        "subtitulo": datos.subtitulo,
+        "fuente_datos": datos.fuente_datos,
+        "resumen_general": datos.resumen_general,
+        "notas": datos.notas,
+        "tablas": {},
+        "tablas_categoricas": [],
+        "figuras": [],
+    }
+
+    for campo in CAMPOS_TABLA:
+        df = getattr(datos, campo)
+        if isinstance(df, pd.DataFrame):
+            manifest["tablas"][campo] = "tablas/" + _guarda_tabla(df, temporal / "tablas", campo)
+
+    for i, (columna, df) in enumerate(datos.tablas_categoricas.items()):
+        archivo = _guarda_tabla(df, temporal / "tablas", f"frecuencias_{i:04d}")
+        manifest["tablas_categoricas"].append({"columna": columna, "archivo": f"tablas/{archivo}"})
+
+    for ruta in datos.figuras:
+        ruta = Path(ruta)
+        sha = sha256_archivo(ruta) if ruta.is_file() else None
+        manifest["figuras"].append({"ruta": str(ruta.resolve()), "sha256": sha})
+
+    with open(temporal / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, default=str)
+
+    if carpeta.exists():
+        anterior = carpeta.with_name(carpeta.name + ".anterior")
+        shutil.rmtree(anterior, ignore_errors=True)
+        if conserva_anterior:
+            carpeta.rename(anterior)
+        else:
+            shutil.rmtree(carpeta)
+    temporal.rename(carpeta)
+
+    logger.debug(f"Paquete del reporte guardado en: {carpeta} | tablas = {len(manifest['tablas']) + len(manifest['tablas_categoricas'])}"
+                 f" | figuras = {len(manifest['figuras'])}")
+    return carpeta
+
+
+def _lee_manifest(carpeta: Path) -> Dict:
+    with open(carpeta / "manifest.json", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("version") != VERSION_PAQUETE:
+        raise ValueError(f"Versión de paquete no soportada en {carpeta}: {manifest.get('version')} (se esperaba {VERSION_PAQUETE})")
+    return manifest
+
+
+def carga_paquete(carpeta: str | Path, verifica_figuras: bool = True) -> ReportData:
+    """
+    Reconstruye el ReportData de un paquete sin recalcular estadísticas ni figuras.
+
+    Con 'verifica_figuras' se omiten las figuras que ya no existen o cuyo contenido cambió
+    desde que se guardó el paquete.
+    """
+    carpeta = Path(carpeta)
+    manifest = _lee_manifest(carpeta)
+
+    tablas = {campo: pd.read_parquet(carpeta / archivo, engine="pyarrow") for campo, archivo in manifest["tablas"].items()}
+    tablas_categoricas = {
+        entrada["columna"]: pd.read_parquet(carpeta / entrada["archivo"], engine="pyarrow")
+        for entrada in manifest["tablas_categoricas"]
+    }
+
+    figuras: List[str] = []
+    for figura in manifest["figuras"]:
+        ruta = Path(figura["ruta"])
+        if verifica_figuras and (not ruta.is_file() or sha256_archivo(ruta) != figura["sha256"]):
+            logger.warning(f"Figura ausente o modificada desde que se guardó el paquete; se omite: {ruta}")
+            continue
+        figuras.append(str(ruta))
+
+    datos = ReportData(
+        titulo=manifest["titulo"],
+        subtitulo=manifest["subtitulo"],
+        fuente_datos=manifest["fuente_datos"],
+        resumen_general=manifest["resumen_general"],
+        resumen_datos=tablas.get("resumen_datos"),
+        resumen_datos_nulos=tablas.get("resumen_datos_nulos"),
+        estadisticas_numericas=tablas.get("estadisticas_numericas"),
+        estadisticas_categoricas=tablas.get("estadisticas_categoricas"),
+        tablas_categoricas=tablas_categoricas,
+        figuras=figuras,
+        notas=manifest["notas"],
+    )
+
+    logger.debug(f"Paquete cargado: {carpeta} | creado = {manifest['creado']} | figuras = {len(figuras)} de {len(manifest['figuras'])}")
+    return datos
+
+
+def _columna_tabla(datos: ReportData, campo: str, columna: str) -> pd.Series:
+    df = getattr(datos, campo)
+    if not isinstance(df, pd.DataFrame) or columna not in df:
+        return pd.Series(dtype="float64")
+    return df[columna]
+
+
+def _compara_series(anterior: pd.Series, actual: pd.Series, relleno: Optional[float] = None) -> pd.DataFrame:
+    comparacion = pd.concat({"anterior": anterior, "actual": actual}, axis=1)
+    if relleno is not None:
+        comparacion = comparacion.fillna(relleno)
+    comparacion["diferencia"] = comparacion["actual"] - comparacion["anterior"]
+    return comparacion
+
+
+def compara_paquetes(anterior: str | Path | ReportData, actual: str | Path | ReportData) -> Dict[str, pd.DataFrame]:
+    """
+    Cambios de calidad de datos entre dos reportes (paquetes o ReportData).
+
+    - general: campos del resumen general que cambiaron (sin la fecha del EDA).
+    - columnas: columnas agregadas, eliminadas o con otro tipo.
+    - nulos / unicos: conteo por columna en cada reporte y su diferencia (solo cambios).
+    - numericas: estadísticos de las columnas numéricas que cambiaron.
+    """
+    if not isinstance(anterior, ReportData):
+        anterior = carga_paquete(anterior, verifica_figuras=False)
+    if not isinstance(actual, ReportData):
+        actual = carga_paquete(actual, verifica_figuras=False)
+
+    general = pd.DataFrame({"anterior": pd.Series(anterior.resumen_general), "actual": pd.Series(actual.resumen_general)})
+    general = general.drop(index="Fecha de EDA", errors="ignore")
+    general = general[general["anterior"].astype(str) != general["actual"].astype(str)]
+
+    tipos = pd.concat({"anterior": _columna_tabla(anterior, "resumen_datos", "Tipo"),
+                       "actual": _columna_tabla(actual, "resumen_datos", "Tipo")}, axis=1)
+    tipos = tipos[tipos["anterior"].astype(str) != tipos["actual"].astype(str)]
+    tipos["cambio"] = tipos.apply(
+        lambda fila: "agregada" if pd.isna(fila["anterior"]) else ("eliminada" if pd.isna(fila["actual"]) else "tipo"), axis=1
+    ) if not tipos.empty else pd.Series(dtype=object)
+
+    nulos = _compara_series(_columna_tabla(anterior, "resumen_datos_nulos", "Nulos"),
+                            _columna_tabla(actual, "resumen_datos_nulos", "Nulos"), relleno=0)
+    unicos = _compara_series(_columna_tabla(anterior, "resumen_datos", "Valores únicos"),
+                             _columna_tabla(actual, "resumen_datos", "Valores únicos"))
+
+    numericas = []
+    for estadistico in ESTADISTICOS_COMPARADOS:
+        comparacion = _compara_series(_columna_tabla(anterior, "estadisticas_numericas", estadistico),
+                                      _columna_tabla(actual, "estadisticas_numericas", estadistico))
+        comparacion.insert(0, "estadístico", estadistico)
+        numericas.append(comparacion)
+    numericas = pd.concat(numericas).rename_axis("columna").reset_index().set_index(["columna", "estadístico"]).sort_index()
+
+    return {
+        "general": general,
+        "columnas": tipos,
+        "nulos": nulos[nulos["diferencia"] != 0],
+        "unicos": unicos[unicos["diferencia"].fillna(1) != 0],
+        "numericas": numericas[numericas["diferencia"].fillna(1) != 0],
+    }
+
@@ -0,0 +1,148 @@
+# src/utils/reporte_HTML.py
+import base64
+import html
+import io
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+from src.configuraciones.config_params import conf
+from src.datos.EDA import ReportData
+from src.utils.reporte_PDF import reduce_figura
+
+# Opciones por omisión (sección reporte_html de reportes.yaml)
+OPCIONES_HTML = {
+    "incrustar_figuras": True,
+    "ancho_figuras_px": 0,
+    "max_filas_tabla": 60,
+    "max_tablas_categoricas": 200,
+}
+
+ESTILOS = """
+body { font-family: Helvetica, Arial, sans-serif; font-size: 14px; color: #222; max-width: 1000px; margin: 0 auto; padding: 24px; }
+h1 { text-align: center; margin-bottom: 4px; }
+h2 { text-align: center; border-bottom: 1px solid #A3BFD9; padding-bottom: 4px; margin-top: 32px; }
+.subtitulo { text-align: center; color: grey; margin-top: 0; }
+table { border-collapse: collapse; margin: 12px auto; }
+th { background: lightgrey; text-align: center; }
+th, td { border: 1px solid grey; padding: 4px 6px; }
+td { text-align: right; }
+td:first-child { text-align: left; }
+tbody tr:nth-child(odd) { background: whitesmoke; }
+.figura { text-align: center; margin: 16px 0; }
+.figura img { max-width: 100%; }
+.omitidas { text-align: center; font-style: italic; color: grey; }
+"""
+
+
+class HTMLReportGenerator:
+    """
+    Genera el reporte EDA como un único archivo HTML a partir del mismo ReportData que el PDF.
+
+    Cada tabla se convierte de una vez con DataFrame.to_html. Las figuras se incrustan como
+    PNG codificados en base64 (el archivo no depende de la carpeta de figuras), opcionalmente
+    reducidos a 'ancho_figuras_px', o se referencian por ruta relativa con
+    incrustar_figuras = False.
+    """
+
+    def __init__(self, datos_reporte: ReportData,
+                 archivo_salida,
+                 opciones: Optional[Dict[str, Any]] = None):
+        self.datos = datos_reporte
+        self.archivo_salida = Path(archivo_salida)
+        self.opciones = {**OPCIONES_HTML, **(conf.get("reporte_html", {}) or {}), **(opciones or {})}
+
+    @staticmethod
+    def _tabla(df: Optional[pd.DataFrame], max_filas: int = 0) -> str:
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            return "<p>No se encontraron datos.</p>"
+
+        omitidas = len(df) - max_filas if max_filas and len(df) > max_filas else 0
+        # Mismo encabezado que la tabla del PDF: el índice es la primera columna
+        visibles = df.iloc[:len(df) - omitidas]
+        visibles = visibles.rename_axis(df.index.name or "columna").reset_index()
+        tabla = visibles.to_html(border=0, index=False, na_rep="nan")
+        if omitidas:
+            tabla += f'<p class="omitidas">... {omitidas:,} fila(s) omitida(s)</p>'
+        return tabla
+
+    def _seccion_tabla(self, titulo: str, df: Optional[pd.DataFrame]) -> str:
+        return f"<h2>{html.escape(titulo)}</h2>{self._tabla(df)}"
+
+    def _portada(self) -> List[str]:
+        partes = [f"<h1>{html.escape(self.datos.titulo)}</h1>"]
+        if self.datos.subtitulo:
+            partes.append(f'<p class="subtitulo">{html.escape(self.datos.subtitulo)}</p>')
+
+        resumen = pd.DataFrame({"Valor": list(self.datos.resumen_general.values())},
+                               index=pd.Index(list(self.datos.resumen_general), name="Campo"))
+        partes.append(self._tabla(resumen))
+        return partes
+
+    def _tablas_campos(self) -> List[str]:
+        partes = [
+            self._seccion_tabla("Características de los campos", self.datos.resumen_datos),
+            self._seccion_tabla("Estadísticas descriptivas de variables numéricas", self.datos.estadisticas_numericas),
+            self._seccion_tabla("Estadísticas descriptivas de variables categóricas", self.datos.estadisticas_categoricas),
+            self._seccion_tabla("Campos con valores nulos", self.datos.resumen_datos_nulos),
+            "<h2>Distribuciones de variables categóricas</h2>",
+        ]
+
+        if not self.datos.tablas_categoricas:
+            partes.append("<p>No se identificaron columnas categóricas.</p>")
+            return partes
+
+        max_tablas = int(self.opciones.get("max_tablas_categoricas") or 0)
+        max_filas = int(self.opciones.get("max_filas_tabla") or 0)
+        tablas = list(self.datos.tablas_categoricas.values())
+
+        partes.extend(self._tabla(df, max_filas) for df in tablas[:max_tablas or None])
+        if max_tablas and len(tablas) > max_tablas:
+            partes.append(f'<p class="omitidas">Se omitieron {len(tablas) - max_tablas:,} tabla(s) de frecuencias '
+                          f'(límite: {max_tablas:,}).</p>')
+        return partes
+
+    def _fuente_figura(self, ruta: str) -> str:
+        """Atributo src de una figura: PNG en base64 o ruta relativa al reporte."""
+        if not self.opciones.get("incrustar_figuras", True):
+            return Path(os.path.relpath(ruta, self.archivo_salida.parent)).as_posix()
+
+        reducida = reduce_figura(ruta, int(self.opciones.get("ancho_figuras_px") or 0))
+        if reducida is None:
+            contenido = Path(ruta).read_bytes()
+        else:
+            buffer = io.BytesIO()
+            reducida.save(buffer, format="PNG")
+            contenido = buffer.getvalue()
+
+        return "data:image/png;base64," + base64.b64encode(contenido).decode("ascii")
+
+    def _figuras(self) -> List[str]:
+        partes = ["<h2>Histogramas generados</h2>"]
+        for ruta in self.datos.figuras:
+            if os.path.exists(ruta):
+                partes.append(f'<div class="figura"><img src="{self._fuente_figura(ruta)}" '
+                              f'alt="{html.escape(Path(ruta).stem)}"/></div>')
+        return partes
+
+    def _notas(self) -> List[str]:
+        # Las notas ya contienen marcado (<br/>) generado por el reporte
+        return ["<h2>Notas</h2>", f"<p>{self.datos.notas}</p>"] if self.datos.notas else []
+
+    def build(self) -> Path:
+        logger.info(f"Generando reporte HTML en: {self.archivo_salida}")
+
+        cuerpo = [*self._portada(), *self._tablas_campos(), *self._figuras(), *self._notas()]
+        documento = (
+            '<!DOCTYPE html>\n<html lang="es">\n<head>\n<meta charset="utf-8"/>\n'
+            f"<title>{html.escape(self.datos.titulo)}</title>\n<style>{ESTILOS}</style>\n</head>\n<body>\n"
+            + "\n".join(cuerpo)
+            + "\n</body>\n</html>\n"
+        )
+
+        self.archivo_salida.parent.mkdir(parents=True, exist_ok=True)
+        self.archivo_salida.write_text(documento, encoding="utf-8")
+        return self.archivo_salida
@@ -1,9 +1,13 @@
 # src/utils/reporte_PDF.py
 import os
-from typing import Any, Dict, List, Optional
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from loguru import logger
+from PIL import Image as ImagenPIL
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -20,12 +24,33 @@ from reportlab.platypus import (
     TableStyle,
 )
 
+from src.configuraciones.config_params import conf
 from src.datos.EDA import ReportData
 
+# Opciones por omisión (sección reporte_pdf de reportes.yaml)
+OPCIONES_PDF = {
+    "dpi_figuras": 110,
+    "max_filas_tabla": 60,
+    "max_tablas_categoricas": 200,
+}
 
 
 # ---------- Helpers ---------- #
 
+def reduce_figura(ruta: str | Path, ancho_px: int) -> Optional[ImagenPIL.Image]:
+    """
+    Figura reducida a 'ancho_px' (misma proporción) y con paleta de 256 colores.
+
+    Devuelve None si la figura ya tiene ese ancho o menos; el archivo original no se modifica.
+    """
+    with ImagenPIL.open(ruta) as imagen:
+        if ancho_px <= 0 or ancho_px >= imagen.width:
+            return None
+        alto_px = max(1, round(imagen.height * ancho_px / imagen.width))
+        reducida = imagen.convert("RGB").resize((ancho_px, alto_px), ImagenPIL.Resampling.LANCZOS)
+    return reducida.quantize(colors=256, method=ImagenPIL.Quantize.FASTOCTREE)
+
+
 def crear_tabla(data: List[List[Any]],
                 colWidths: Optional[List[float]] = None,
                 hAlign: str = "CENTER") -> LongTable:
@@ -45,13 +70,28 @@ def crear_tabla(data: List[List[Any]],
     return table
 
 
-def tabla_desde_dataframe(df: pd.DataFrame) -> LongTable:
-    """Convierte un DataFrame en tabla PDF."""
+def celdas_texto(df: pd.DataFrame) -> List[List[str]]:
+    """Filas de texto (índice + columnas) convirtiendo cada columna completa de una vez."""
+    columnas = [df.index.astype(str).to_numpy(dtype=object)]
+    columnas += [df.iloc[:, i].astype(str).to_numpy(dtype=object) for i in range(df.shape[1])]
+    return np.column_stack(columnas).tolist()
+
+
+def tabla_desde_dataframe(df: pd.DataFrame, max_filas: Optional[int] = None) -> LongTable:
+    """
+    Convierte un DataFrame en tabla PDF.
+
+    Con 'max_filas' solo se incluyen las primeras filas y las restantes se indican en una
+    fila final.
+    """
     if df is None or df.empty:
         return crear_tabla([["Sin datos"], ["—"]], colWidths=[16 * cm])
 
     header = [df.index.name or "columna"] + df.columns.tolist()
-    rows = [[str(idx)] + [str(v) for v in row] for idx, row in df.iterrows()]
+    omitidas = len(df) - max_filas if max_filas and len(df) > max_filas else 0
+    rows = celdas_texto(df.iloc[:len(df) - omitidas])
+    if omitidas:
+        rows.append([f"... {omitidas:,} fila(s) omitida(s)"] + [""] * df.shape[1])
     data = [header] + rows
 
     if len(header) <= 4:
@@ -93,11 +133,14 @@ class PDFReportGenerator:
 
     def __init__(self, datos_reporte: ReportData,
                  archivo_salida,
-                 ancho_figura_cm: float = 16.0):
+                 ancho_figura_cm: float = 16.0,
+                 opciones: Optional[Dict[str, Any]] = None):
         self.datos = datos_reporte
         self.archivo_salida = archivo_salida
         self.ancho_figura_cm = ancho_figura_cm
+        self.opciones = {**OPCIONES_PDF, **(conf.get("reporte_pdf", {}) or {}), **(opciones or {})}
         self.styles = self._crear_estilos()
+        self._carpeta_figuras: Optional[str] = None
 
     def _crear_estilos(self):
         styles = getSampleStyleSheet()
@@ -147,9 +190,18 @@ class PDFReportGenerator:
 
         story.append(Paragraph("Distribuciones de variables categóricas", self.styles['Seccion']))
         if self.datos.tablas_categoricas:
-            for df in self.datos.tablas_categoricas.values():
-                story.append(tabla_desde_dataframe(df))
+            max_tablas = int(self.opciones.get("max_tablas_categoricas") or 0)
+            max_filas = int(self.opciones.get("max_filas_tabla") or 0)
+            tablas = list(self.datos.tablas_categoricas.values())
+
+            for df in tablas[:max_tablas or None]:
+                story.append(tabla_desde_dataframe(df, max_filas=max_filas))
                 story.append(Spacer(1, 8))
+
+            if max_tablas and len(tablas) > max_tablas:
+                story.append(Paragraph(
+                    f"Se omitieron {len(tablas) - max_tablas:,} tabla(s) de frecuencias (límite: {max_tablas:,}).",
+                    self.styles['NormalJust']))
         else:
             story.append(Paragraph("No se identificaron columnas categóricas.", self.styles['NormalJust']))
         story.append(PageBreak())
@@ -161,8 +213,9 @@ class PDFReportGenerator:
 
         for ruta in self.datos.figuras:
             if os.path.exists(ruta):
-                img = Image(ruta)
-                img._restrictSize(max_w, max_h)
+                ruta_pdf, ancho, alto = self._figura_para_pdf(ruta, max_w, max_h)
+                # lazy=2: el archivo se abre solo al dibujar la figura
+                img = Image(ruta_pdf, width=ancho, height=alto, lazy=2)
                 story.append(KeepInFrame(max_w, max_h, [img], mode='shrink'))
                 story.append(Spacer(1, 8))
                 contador += 1
@@ -172,6 +225,28 @@ class PDFReportGenerator:
         if contador % 2 != 0:
             story.append(PageBreak())
 
+    def _figura_para_pdf(self, ruta: str, max_w: float, max_h: float) -> Tuple[str, float, float]:
+        """
+        Ruta y tamaño (puntos) con que se inserta una figura.
+
+        El tamaño es el de la figura limitada a max_w x max_h. Si su resolución a ese tamaño
+        excede 'dpi_figuras', se reduce y se guarda con paleta de colores en una carpeta
+        temporal; la figura original no se modifica.
+        """
+        with ImagenPIL.open(ruta) as imagen:
+            ancho_px, alto_px = imagen.size
+        escala = min(max_w / ancho_px, max_h / alto_px, 1.0)
+        ancho, alto = ancho_px * escala, alto_px * escala
+
+        dpi = int(self.opciones.get("dpi_figuras") or 0)
+        reducida = reduce_figura(ruta, round(ancho / 72 * dpi)) if dpi and self._carpeta_figuras else None
+        if reducida is None:
+            return ruta, ancho, alto
+
+        destino = Path(self._carpeta_figuras) / Path(ruta).name
+        reducida.save(destino)
+        return str(destino), ancho, alto
+
     def build(self):
         doc = SimpleDocTemplate(self.archivo_salida, pagesize=A4,
                                 leftMargin=2 * cm, rightMargin=2 * cm,
@@ -193,8 +268,12 @@ class PDFReportGenerator:
         self._agregar_portada(story)
         logger.debug("Agregando tablas de campos al reporte PDF.")
         self._agregar_tablas_campos(story)
-        logger.debug("Agregando figuras al reporte PDF.")
-        self._agregar_figuras(story)
-        self._agregar_notas(story)
-
-        doc.build(story, onFirstPage=cabecera_pie, onLaterPages=cabecera_pie)
\ No newline at end of file
+        # Las figuras reducidas solo existen mientras se construye el documento
+        with tempfile.TemporaryDirectory(prefix="figuras_pdf_") as carpeta:
+            self._carpeta_figuras = carpeta
+            logger.debug(f"Agregando figuras al reporte PDF | dpi = {self.opciones.get('dpi_figuras')}")
+            self._agregar_figuras(story)
+            self._agregar_notas(story)
+
+            doc.build(story, onFirstPage=cabecera_pie, onLaterPages=cabecera_pie)
+            self._carpeta_figuras = None
@@ -0,0 +1,46 @@
+# tests/test_almacenamiento.py
+import pandas as pd
+
+from src.utils import almacenamiento
+
+
+def test_escritor_incremental_amplia_esquema(tmp_path):
+    # Bloques con tipos inferidos por separado, como los de leer_por_bloques sobre un CSV
+    bloques = [
+        pd.DataFrame({"A": [1, 2], "B": [None, None], "C": [1, 2]}),
+        pd.DataFrame({"A": [3], "B": ["texto"], "C": [2.5]}),
+        pd.DataFrame({"A": [4], "B": [None], "C": ["x"], "D": [1.0]}),
+    ]
+    with almacenamiento.EscritorIncremental(tmp_path / "salida.csv", "parquet") as escritor:
+        for bloque in bloques:
+            escritor.escribe(bloque)
+
+    resultado = pd.read_parquet(tmp_path / "salida.parquet")
+    assert resultado["A"].tolist() == [1, 2, 3, 4]
+    assert resultado["B"].tolist() == [None, None, "texto", None]
+    assert resultado["C"].tolist() == ["1", "2", "2.5", "x"]
+    assert resultado["D"].isna().tolist() == [True, True, True, False]
+    assert not list(tmp_path.glob("*.tmp*"))
+
+
+def test_escritor_incremental_sin_registros_elimina_previo(tmp_path):
+    almacenamiento.guardar_dataframe(pd.DataFrame({"A": [1]}), tmp_path / "salida.csv", "parquet")
+    almacenamiento.guardar_dataframe(pd.DataFrame({"A": [1]}), tmp_path / "salida.csv", "csv")
+
+    with almacenamiento.EscritorIncremental(tmp_path / "salida.csv", "parquet") as escritor:
+        escritor.escribe(pd.DataFrame({"A": []}))
+
+    assert not almacenamiento.existe_dataset(tmp_path / "salida.csv")
+
+
+def test_localizar_dataset_prioriza_formato_configurado(tmp_path, monkeypatch):
+    ruta = tmp_path / "datos.csv"
+    almacenamiento.guardar_dataframe(pd.DataFrame({"A": [1]}), ruta, "parquet")
+    almacenamiento.guardar_dataframe(pd.DataFrame({"A": [2]}), ruta, "csv")
+
+    monkeypatch.setattr(almacenamiento, "_opciones", lambda: {"formato": "csv"})
+    assert almacenamiento.localizar_dataset(ruta).suffix == ".csv"
+    assert almacenamiento.leer_dataframe(ruta, esquema=False)["A"].tolist() == [2]
+
+    monkeypatch.setattr(almacenamiento, "_opciones", lambda: {"formato": "parquet"})
+    assert almacenamiento.localizar_dataset(ruta).suffix == ".parquet"
@@ -0,0 +1,100 @@
+# tests/test_caracteristicas.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.datos.caracteristicas import GeneraCaracteristicas
+
+OPCIONES = {
+    "fecha": "Fecha",
+    "llaves": ["Entidad"],
+    "objetivos": ["incrementos_hombres", "incrementos_mujeres"],
+    "lags": [1, 2, 3],
+    "ventanas": [4],
+    "calendario": ["anio", "semana", "mes"],
+    "one_hot": ["Entidad"],
+    "elimina_incompletos": True,
+}
+
+
+def _series(semanas: int = 30, semilla: int = 0) -> pd.DataFrame:
+    generador = np.random.default_rng(semilla)
+    fechas = pd.date_range("2020-01-06", periods=semanas, freq="7D")
+    partes = [
+        pd.DataFrame({
+            "Entidad": entidad,
+            "Fecha": fechas,
+            "incrementos_hombres": generador.integers(0, 50, semanas).astype("float64"),
+            "incrementos_mujeres": generador.integers(0, 50, semanas).astype("float64"),
+        })
+        for entidad in ("Jalisco", "Yucatán", "Sonora")
+    ]
+    df = pd.concat(partes, ignore_index=True)
+    df["Entidad"] = df["Entidad"].astype("category")
+    return df
+
+
+def _semana(df: pd.DataFrame, posicion: int) -> pd.Timestamp:
+    return df["Fecha"].drop_duplicates().sort_values().iloc[posicion]
+
+
+def _previo(df: pd.DataFrame):
+    generador = GeneraCaracteristicas(df, OPCIONES)
+    previo = generador.calcula()
+    huellas = {"opciones": generador._huella_opciones(),
+               "series": generador.huellas(generador._ordena(generador.df))}
+    return previo, huellas
+
+
+def _compara(actualizado: pd.DataFrame, completo: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(
+        actualizado.reset_index(drop=True), completo.reset_index(drop=True)[actualizado.columns],
+        check_dtype=False, check_categorical=False,
+    )
+
+
+def test_actualiza_semanas_nuevas_igual_a_calcula(monkeypatch):
+    df = _series()
+    previo, huellas = _previo(df[df["Fecha"] <= _semana(df, -4)])
+    completo = GeneraCaracteristicas(df, OPCIONES).calcula()
+
+    generador = GeneraCaracteristicas(df, OPCIONES)
+    # Debe tomar la ruta incremental, no recalcular completo
+    monkeypatch.setattr(generador, "calcula", lambda: pytest.fail("se recalculó completo"))
+    _compara(generador.actualiza(previo, huellas), completo)
+
+
+@pytest.mark.parametrize("cambio", ["contexto", "relleno", "eliminada", "sin_huellas"])
+def test_actualiza_recalcula_si_cambian_semanas_previas(cambio):
+    df = _series()
+    base = df[df["Fecha"] <= _semana(df, -4)]
+    previo, huellas = _previo(base)
+
+    if cambio == "contexto":
+        # Primera semana de cada serie: no se guarda (incompleta) pero alimenta lags y ventanas
+        actual = df.copy()
+        actual.loc[actual["Fecha"] == actual["Fecha"].min(), "incrementos_hombres"] += 1000
+    elif cambio == "relleno":
+        # Semana anterior a la última calculada que no existía en el resultado previo
+        hueco = _semana(df, 10)
+        previo, huellas = _previo(base[base["Fecha"] != hueco])
+        actual = df
+    elif cambio == "eliminada":
+        actual = df[df["Fecha"] != _semana(df, 12)]
+    else:
+        actual, huellas = df, None
+
+    _compara(GeneraCaracteristicas(actual, OPCIONES).actualiza(previo, huellas),
+             GeneraCaracteristicas(actual, OPCIONES).calcula())
+
+
+def test_actualiza_resultado_guardado_sin_huellas_no_duplica():
+    df = _series()
+    # 'make caracteristicas' guarda resultado y huellas; después el pipeline guarda un resultado
+    # con más semanas sin actualizar las huellas
+    _, huellas = _previo(df[df["Fecha"] <= _semana(df, -8)])
+    previo = GeneraCaracteristicas(df[df["Fecha"] <= _semana(df, -4)], OPCIONES).calcula()
+
+    actualizado = GeneraCaracteristicas(df, OPCIONES).actualiza(previo, huellas)
+    assert not actualizado.duplicated(["Entidad", "Fecha"]).any()
+    _compara(actualizado, GeneraCaracteristicas(df, OPCIONES).calcula())
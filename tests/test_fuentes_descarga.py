@@ -0,0 +1,180 @@
+# tests/test_fuentes_descarga.py
+import hashlib
+import threading
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("gdown")
+
+from src.datos.descarga_dataset import DatasetDownloader  # noqa: E402
+from src.datos.fuentes_descarga import FuenteHTTP, ruta_parcial  # noqa: E402
+
+
+class _Servidor(ThreadingHTTPServer):
+    """Servidor local que publica 'archivos' y puede cortar o ignorar rangos."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Manejador)
+        self.archivos = {}  # nombre -> (contenido, etag)
+        self.corta_en = None  # bytes enviados antes de cerrar la conexión (una vez)
+        self.ignora_rango = False
+        self.rangos = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def publica(self, nombre: str, contenido: bytes) -> None:
+        self.archivos[nombre] = (contenido, f'"{hashlib.sha1(contenido).hexdigest()}"')
+
+
+class _Manejador(BaseHTTPRequestHandler):
+
+    def _archivo(self):
+        nombre = self.path.lstrip("/")
+        if nombre not in self.server.archivos:
+            self.send_error(404)
+            return None
+        return self.server.archivos[nombre]
+
+    def do_HEAD(self):
+        archivo = self._archivo()
+        if archivo is None:
+            return
+        contenido, etag = archivo
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(contenido)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+
+    def do_GET(self):
+        archivo = self._archivo()
+        if archivo is None:
+            return
+        contenido, etag = archivo
+
+        rango = self.headers.get("Range")
+        self.server.rangos.append(rango)
+        inicio = int(rango.split("=")[1].rstrip("-")) if rango and not self.server.ignora_rango else 0
+        if inicio >= len(contenido) and rango:
+            self.send_response(416)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        cuerpo = contenido[inicio:]
+        self.send_response(206 if inicio else 200)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.send_header("ETag", etag)
+        if inicio:
+            self.send_header("Content-Range", f"bytes {inicio}-{len(contenido) - 1}/{len(contenido)}")
+        self.end_headers()
+
+        if self.server.corta_en is not None:
+            # Simula una conexión interrumpida: se envía una parte y se cierra
+            self.wfile.write(cuerpo[:self.server.corta_en])
+            self.wfile.flush()
+            self.server.corta_en = None
+            self.close_connection = True
+            return
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    servidor = _Servidor()
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _contenido(n: int = 200_000) -> bytes:
+    return bytes(i % 251 for i in range(n))
+
+
+def test_descarga_interrumpida_se_reanuda_con_range(servidor, tmp_path):
+    contenido = _contenido()
+    servidor.publica("2020.csv", contenido)
+    fuente = FuenteHTTP(servidor.url, ["2020.csv"], timeout=5)
+    (archivo,) = fuente.listar()
+    assert archivo.tamano == len(contenido) and archivo.version
+
+    destino = tmp_path / "2020.csv"
+    servidor.corta_en = 70_000
+    # La conexión se cierra antes de Content-Length: no se publica y el parcial se conserva
+    with pytest.raises(RuntimeError, match="Descarga incompleta"):
+        fuente.descargar(archivo, destino)
+    assert not destino.exists()
+    assert ruta_parcial(destino).stat().st_size == 70_000
+
+    fuente.descargar(archivo, destino)
+    assert servidor.rangos[-1] == "bytes=70000-"
+    assert destino.read_bytes() == contenido
+    assert not ruta_parcial(destino).exists()
+
+
+def test_servidor_sin_range_reescribe_desde_el_inicio(servidor, tmp_path):
+    contenido = _contenido()
+    servidor.publica("2021.csv", contenido)
+    servidor.ignora_rango = True
+    fuente = FuenteHTTP(servidor.url, ["2021.csv"], timeout=5)
+    (archivo,) = fuente.listar()
+
+    destino = tmp_path / "2021.csv"
+    ruta_parcial(destino).write_bytes(contenido[:1000])
+    fuente.descargar(archivo, destino)
+    assert destino.read_bytes() == contenido
+
+
+def test_parcial_completo_responde_416(servidor, tmp_path):
+    contenido = _contenido(5_000)
+    servidor.publica("2022.csv", contenido)
+    fuente = FuenteHTTP(servidor.url, ["2022.csv"], timeout=5)
+    (archivo,) = fuente.listar()
+
+    destino = tmp_path / "2022.csv"
+    ruta_parcial(destino).write_bytes(contenido)
+    fuente.descargar(archivo, destino)
+    assert destino.read_bytes() == contenido
+
+
+def _descargador(servidor, carpeta, archivos):
+    configuracion = {"dataset_id": "", "cookies": False, "force": True, "hilos": 2, "fuente": "http",
+                     "http": {"url_base": servidor.url, "archivos": archivos, "timeout": 5}}
+    return DatasetDownloader(configuracion, str(carpeta), str(carpeta / "data_raw.csv"))
+
+
+def test_manifest_solo_descarga_archivos_nuevos_o_modificados(servidor, tmp_path):
+    servidor.publica("2020.csv", b"a,b\n1,2\n")
+    servidor.publica("2021.csv", b"a,b\n3,4\n")
+    descargador = _descargador(servidor, tmp_path, ["2020.csv", "2021.csv"])
+
+    assert sorted(p.name for p in descargador.descarga()) == ["2020.csv", "2021.csv"]
+    assert descargador.descarga() == []
+
+    servidor.publica("2021.csv", b"a,b\n3,4\n5,6\n")
+    assert [p.name for p in descargador.descarga()] == ["2021.csv"]
+    assert (tmp_path / "2021.csv").read_bytes() == b"a,b\n3,4\n5,6\n"
+
+    manifest = descargador._cargar_manifest()
+    assert manifest["2021.csv"]["sha256"] == hashlib.sha256(b"a,b\n3,4\n5,6\n").hexdigest()
+
+
+def test_checksum_invalido_descarta_el_archivo(servidor, tmp_path):
+    servidor.publica("2020.csv", b"a,b\n1,2\n")
+    descargador = _descargador(servidor, tmp_path, ["2020.csv"])
+    (archivo,) = descargador.fuente.listar()
+
+    with pytest.raises(RuntimeError, match="Checksum inválido"):
+        descargador._descarga_archivo(replace(archivo, sha256="0" * 64))
+    assert not (tmp_path / "2020.csv").exists()
+
+    valido = replace(archivo, sha256=hashlib.sha256(b"a,b\n1,2\n").hexdigest())
+    assert descargador._descarga_archivo(valido)["sha256"] == valido.sha256
@@ -0,0 +1,41 @@
+# tests/test_perfilado.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.datos.perfilado import PerfiladorIncremental
+from src.utils.acumuladores import HistogramaAdaptativo
+
+
+def test_histograma_excluye_infinitos():
+    histograma = HistogramaAdaptativo(bins=10)
+    histograma.actualiza(np.array([1.0, 2.0, 3.0]))
+    histograma.actualiza(np.array([np.inf, 4.0, -np.inf]))
+
+    assert histograma.no_finitos == 2
+    assert histograma.conteos.sum() == 4
+    assert np.isfinite(histograma.fin)
+
+
+# La media de una columna con infinitos es infinita, como en describe()
+@pytest.mark.filterwarnings("ignore:invalid value encountered:RuntimeWarning")
+def test_perfilador_incremental_con_infinitos():
+    perfilador = PerfiladorIncremental(bins_histograma=10)
+    perfilador.actualiza(pd.DataFrame({"x": [1.0, 2.0]}))
+    perfilador.actualiza(pd.read_csv(pd.io.common.StringIO("x\ninf\n3\n")))
+
+    bordes, conteos = perfilador.histograma("x")
+    assert conteos.sum() == 3 and np.isfinite(bordes).all()
+    assert "x (1)" in perfilador.notas()
+
+
+def test_perfilador_incremental_cuenta_texto_en_columna_numerica():
+    perfilador = PerfiladorIncremental()
+    perfilador.actualiza(pd.DataFrame({"x": [1.0, 2.0]}))
+    perfilador.actualiza(pd.DataFrame({"x": ["3", "sin dato", None]}))
+
+    columna = perfilador.resultado().columnas["x"]
+    assert columna.registros == 5
+    assert columna.nulos == 2
+    assert columna.estadisticas["count"] == 3
+    assert "x (1)" in perfilador.notas()
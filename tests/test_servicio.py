@@ -0,0 +1,99 @@
+# tests/test_servicio.py
+import json
+
+import pandas as pd
+import pytest
+
+from src.modelos import servicio
+from src.modelos.pronostico import VERSION_MODELO, identificador_serie
+
+SERIES = [
+    ({"Padecimiento": "Depresión", "Nivel": "nacional", "Region": "Total", "Entidad": "Total"}, "total"),
+    ({"Padecimiento": "Depresión", "Nivel": "region", "Region": "Occidente", "Entidad": "Total"}, "total"),
+    ({"Padecimiento": "Depresión", "Nivel": "entidad", "Region": "Occidente", "Entidad": "Jalisco"}, "mujeres"),
+]
+
+
+class _Modelo:
+    def __init__(self, base: float):
+        self.base = base
+
+    def pronostica(self, semanas: int) -> pd.DataFrame:
+        return pd.DataFrame({"Fecha": pd.date_range("2024-01-01", periods=semanas, freq="7D"),
+                             "prediccion": [self.base + i for i in range(semanas)]})
+
+
+def _guarda_manifest(carpeta, series):
+    modelos = {}
+    for i, (llave, sexo) in enumerate(series):
+        identificador = identificador_serie(llave, sexo)
+        modelos[identificador] = {"identificador": identificador, "archivo": str(i), "llave": llave,
+                                  "sexo": sexo, "ultima_fecha": "2023-12-25"}
+    (carpeta / "manifest.json").write_text(json.dumps({"version": VERSION_MODELO, "modelos": modelos}))
+
+
+@pytest.fixture
+def servicio_prueba(tmp_path, monkeypatch):
+    monkeypatch.setattr(servicio, "carga_modelo", lambda carpeta, archivo: _Modelo(100 * int(archivo)))
+    _guarda_manifest(tmp_path, SERIES)
+    opciones = {"cache_modelos": 2, "precarga": False, "semanas": 4, "semanas_max": 10}
+    return servicio.ServicioPredicciones(opciones, carpeta=tmp_path)
+
+
+def test_resuelve_nivel_por_consulta(servicio_prueba):
+    registro = servicio_prueba.registro
+    assert registro.resuelve({"padecimiento": "depresion"}).endswith("|total")
+    assert "|region|Occidente|" in registro.resuelve({"padecimiento": "Depresión", "region": "occidente"})
+    assert registro.resuelve({"padecimiento": "Depresión", "entidad": "JALISCO", "sexo": "Mujeres"}) == \
+        identificador_serie(*SERIES[2])
+
+    with pytest.raises(KeyError):
+        registro.resuelve({"padecimiento": "Depresión", "entidad": "Sonora"})
+    with pytest.raises(ValueError):
+        registro.resuelve({"padecimiento": "Depresión", "entidad": "Jalisco", "region": "Sureste"})
+
+
+@pytest.mark.parametrize("semanas, esperado", [(None, 4), ("3", 3), (4.0, 4), (10, 10)])
+def test_semanas_validas(servicio_prueba, semanas, esperado):
+    consulta = {"padecimiento": "Depresión"} if semanas is None else {"padecimiento": "Depresión", "semanas": semanas}
+    (respuesta,) = servicio_prueba.predice([consulta])
+    assert len(respuesta["pronostico"]) == esperado
+
+
+@pytest.mark.parametrize("semanas", [0, 2.7, True, "dos", 11, -1])
+def test_semanas_invalidas(servicio_prueba, semanas):
+    (respuesta,) = servicio_prueba.predice([{"padecimiento": "Depresión", "semanas": semanas}])
+    assert "semanas" in respuesta["error"]
+
+
+def test_cache_lru_expulsa_el_menos_reciente(servicio_prueba):
+    registro = servicio_prueba.registro
+    primera, segunda, tercera = (identificador_serie(*serie) for serie in SERIES)
+
+    registro.pronostico(primera)
+    registro.pronostico(segunda)
+    registro.pronostico(primera)
+    registro.pronostico(tercera)
+
+    assert list(registro._cache) == [primera, tercera]
+    assert (registro.aciertos, registro.fallos) == (1, 3)
+
+
+def test_recarga_durante_la_consulta_usa_la_entrada_del_pronostico(servicio_prueba, tmp_path, monkeypatch):
+    registro = servicio_prueba.registro
+    pronostico = registro.pronostico
+
+    def pronostico_y_recarga(identificador):
+        # Otro hilo recarga un manifest sin la serie entre el pronóstico y la respuesta
+        resultado = pronostico(identificador)
+        _guarda_manifest(tmp_path, SERIES[:2])
+        registro.recarga()
+        return resultado
+
+    monkeypatch.setattr(registro, "pronostico", pronostico_y_recarga)
+    (respuesta,) = servicio_prueba.predice([{"padecimiento": "Depresión", "entidad": "Jalisco", "sexo": "mujeres"}])
+    assert respuesta["Entidad"] == "Jalisco" and len(respuesta["pronostico"]) == 4
+
+    # Con el registro ya recargado, la serie eliminada responde un error
+    (respuesta,) = servicio_prueba.predice([{"padecimiento": "Depresión", "entidad": "Jalisco", "sexo": "mujeres"}])
+    assert "error" in respuesta